@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Benchmark for the list_foods search index in pantry_mcp_server.
+
+Builds synthetic food databases of increasing size from the words in
+food.json, then times indexed searches against the linear scan list_foods
+used to do, for short, prefix, substring and missing queries.
+
+Usage:
+    uv run bench_food_search.py --sizes=1000,10000,100000,1000000 --limit=20
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import time
+
+import fire
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import pantry_mcp_server
+
+QUERIES = ["ch", "chicken", "rice", "pepper", "oil", "zzz"]
+FOOD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "food.json")
+
+
+def synthetic_foods(size: int, seed: int = 7) -> dict:
+    """Combine real food-name words into `size` distinct names."""
+    rng = random.Random(seed)
+    with open(FOOD_FILE) as f:
+        words = sorted({word for food in json.load(f)["foods"].values() for word in food["name"].split()})
+    foods = {}
+    for food_id in range(1, size + 1):
+        name = " ".join(rng.sample(words, rng.randint(1, 3))) + f" {food_id:x}"
+        foods[str(food_id)] = {"id": food_id, "name": name}
+    return foods
+
+
+def linear_search(foods: dict, search: str, limit: int) -> list:
+    """The pre-index list_foods algorithm: scan every name, then sort by ID."""
+    matches = sorted((food["id"] for food in foods.values() if search in food["name"].lower()))
+    return matches[:limit]
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(sizes: str = "1000,10000,100000,1000000", limit: int = 20):
+    print("⏱️  Benchmarking list_foods search...\n")
+    # fire parses "1000,10000" as a tuple
+    sizes = [int(size) for size in (sizes if isinstance(sizes, (list, tuple)) else str(sizes).split(","))]
+    print(f"   {'foods':>9}  {'build s':>8}  " + "  ".join(f"{q!r:>16}" for q in QUERIES))
+    for size in sizes:
+        foods = synthetic_foods(size)
+        start = time.perf_counter()
+        pantry_mcp_server.build_food_index(foods)
+        build = time.perf_counter() - start
+
+        repeat = max(1, 100_000 // size)
+        cells = []
+        for query in QUERIES:
+            indexed = time_per_call(lambda: pantry_mcp_server.search_food_index(query, limit), repeat)
+            scan = time_per_call(lambda: linear_search(foods, query, limit), repeat)
+            cells.append(f"{indexed:6.2f}/{scan:7.2f}ms")
+        print(f"   {size:>9,}  {build:>8.2f}  " + "  ".join(f"{cell:>16}" for cell in cells))
+    print("\n   (each cell: indexed / linear scan, milliseconds per query)")
+    print("\n✅ Benchmark complete!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
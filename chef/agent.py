@@ -45,6 +45,8 @@ except ImportError:
     print("Error: Could not import MCP tools", file=sys.stderr)
     McpToolset = None
 
+from pantry_connection import connect_pantry
+
 tools = []
 
 # Determine MCP server paths (works from both root and chef/ directory)
@@ -87,42 +89,11 @@ if McpToolset:
         except Exception as e:
             print(f"[CHEF] ⚠️  Could not connect to recipes MCP: {e}")
 
-# Add pantry MCP tools
+# Add pantry MCP tools (the shared service if it is running, otherwise a stdio server)
 if McpToolset:
-    # Try to find pantry_mcp_server.py in multiple locations
-    pantry_possible_paths = [
-        "pantry_mcp_server.py",           # When running from root (webapp)
-        "../pantry_mcp_server.py",        # When running from chef/ (a2a_server)
-    ]
-
-    pantry_path = None
-    for path in pantry_possible_paths:
-        if os.path.exists(path):
-            # Convert to absolute path so it works regardless of current directory
-
-            pantry_path = os.path.abspath(path)
-            break
-
-    if pantry_path is None:
-        print(f"[CHEF] ⚠️  Could not find pantry_mcp_server.py in any of: {pantry_possible_paths}")
-    else:
-        try:
-            pantry_connection = StdioConnectionParams(
-                    server_params=StdioServerParameters(
-                        command="uv",
-                        args=["run", pantry_path]
-                )
-            )
-
-            pantry_toolset = McpToolset(
-                    connection_params=pantry_connection
-            )
-
-            tools.append(pantry_toolset)
-            print(f"[CHEF] ✅ Connected to pantry MCP server (using {pantry_path})")
-
-        except Exception as e:
-            print(f"[CHEF] ⚠️  Could not connect to pantry MCP: {e}")
+    pantry_toolset = connect_pantry("CHEF")
+    if pantry_toolset:
+        tools.append(pantry_toolset)
 
 # Add order_up MCP tools
 if McpToolset:
@@ -187,30 +158,33 @@ Your job is to:
 1. Receive dish orders from the waiter (e.g., "Greek Salad", "Grilled Salmon")
 2. Look up the recipe using list_recipes and get_recipe tools
 3. Check if you have ingredients in the pantry using check_pantry
-4. If ingredients are available, take them using take_ingredients
+4. If ingredients are available, reserve them with reserve_ingredients and take them with commit_reservation
 5. If ingredients are missing, order from supplier using the supplier_agent tool
 6. Calculate total time needed (prep + cook time from recipe + any supplier wait time)
-7. Use accept_order to mark the order as ready with timing details (it returns an auto-generated order ID)
-8. Respond with the order ID, time estimate and status
+7. Use accept_order to send the order to the kitchen queue with timing details (it returns an auto-generated order ID and an ETA that includes the orders ahead of it)
+8. Respond with the order ID, ETA and status
 
 IMPORTANT WORKFLOW:
 1. ALWAYS use list_recipes first to find the recipe ID
 2. Use get_recipe with the ID to get full recipe details including ingredients
+   - To see at a glance which dishes the current stock can make (and how many), use can_make
 3. Parse ingredients to extract quantities (e.g., "2 cups broccoli" -> {"broccoli": 2})
-4. Try take_ingredients directly (it reloads pantry from disk automatically):
-   - If it succeeds: Great! Move to step 6
+4. Reserve the ingredients with reserve_ingredients (holds them so no other order can use them):
+   - If it succeeds: keep the reservation_id and move to step 6
    - If it fails with missing items: Go to step 5
-5. If take_ingredients fails due to missing items:
+5. If reserve_ingredients fails due to missing items (nothing is held):
    - Extract the missing ingredients from the error response (food IDs and quantities)
    - Call supplier_agent to order them: "Order: X units of [food name] (ID Y), Z units of [food name] (ID W)."
-   - CRITICAL: After supplier responds, you MUST ALWAYS retry take_ingredients with the SAME ingredient list
-     * If supplier says "Delivered..." → The pantry was restocked, retry take_ingredients now
-     * If supplier says "Pantry already stocked" → The items are ALREADY there, retry take_ingredients now
-     * The take_ingredients tool auto-reloads from disk, so it will see the current pantry state
-   - If take_ingredients STILL fails after retrying, then report the actual error with details
-6. Add up all times (prep + cook + supplier delivery)
-7. Call accept_order with recipe name, prep_time, and cook_time (order ID is auto-generated)
-8. Respond with clear status including the order ID returned from accept_order
+   - CRITICAL: After supplier responds, you MUST ALWAYS retry reserve_ingredients with the SAME ingredient list
+     * If supplier says "Delivered..." → The pantry was restocked, retry reserve_ingredients now
+     * If supplier says "Pantry already stocked" → The items are ALREADY there, retry reserve_ingredients now
+   - If reserve_ingredients STILL fails after retrying, then report the actual error with details
+6. Call commit_reservation(reservation_id) to take the reserved ingredients out of the pantry
+   - If you cannot cook the dish after reserving, call release_reservation(reservation_id) instead
+7. Add up all times (prep + cook + supplier delivery)
+8. Call accept_order with recipe name, prep_time, and cook_time (order ID is auto-generated)
+   - Pass station="oven" for baked dishes (cookies, casseroles); everything else cooks on the grill
+9. Respond with clear status including the order ID and eta_minutes returned from accept_order
 
 DELIVERY NOTIFICATIONS:
 When the waiter notifies you that an order has been served/delivered to the customer:
@@ -223,13 +197,13 @@ Log all actions with [CHEF] prefix.
 
 Example response format:
 "Order #3 received for Greek Salad. Checked pantry - all ingredients available.
-Prep time: 15 min, Cook time: 0 min. Total time: 15 minutes. Order ready!"
+Prep time: 15 min, Cook time: 0 min. Queued in the kitchen, ready in about 15 minutes."
 
 Or if ingredients needed:
 "Order #4 received for Grilled Salmon. Missing 2 units of salmon. Ordering from supplier...
 [wait for supplier delivery]
 Ingredients restocked. Prep time: 10 min, Cook time: 20 min, Supplier wait: 3 min.
-Total time: 33 minutes. Order ready!"
+Two orders ahead on the grill, ready in about 53 minutes."
 """,
     tools=tools
 )
@@ -4,27 +4,83 @@
 # dependencies = [
 #     "fastmcp",
 #     "fire",
+#     "numpy",
 # ]
 # ///
 """Menu MCP Server - Provides artisanal menu descriptions for the waiter.
 
 This server manages the restaurant's menu with curated descriptions.
 The waiter agent uses this to answer customer questions about menu items.
+
+search_menu answers from an index built once per menu: an inverted index of
+name and description words, and facets for category, dietary tags and price
+bands. Each posting is a bitset (a Python int with one bit per menu item), so
+combined constraints are a few ANDs.
+
+A background thread watches menu.json and, when it changes, builds the new
+menu and its index off to the side and swaps them in with one assignment.
+Tools read MENU_INDEX once per call, so they see the old menu or the new
+one, never a mix.
+
+list_menu and get_menu_item say how many servings of each dish the pantry
+can make, from recipe_bom.json and pantry.json. The annotated responses are
+cached and rebuilt only when either file, or the menu, changes.
+
+recommend_pairings ranks dishes by how often customers order them together.
+A co-occurrence matrix is built once from the order history, then kept up to
+date from the orders server's change feed. Both are read through the same
+storage backend as the orders server (--orders_storage), so JSON and SQLite
+deployments get the same pairings.
 """
 
 from fastmcp import FastMCP
+import bisect
 import fire
 import json
+import math
+import numpy as np
 import os
-from typing import Dict, List, Optional
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import orders_mcp_server
 
 mcp = FastMCP()
 
 # File paths
 MENU_FILE = "menu.json"
+PANTRY_FILE = "pantry.json"
+RECIPE_BOM_FILE = "recipe_bom.json"
+ORDERS_FILE = "orders.json"
+ORDERS_DB = "orders.db"
+ORDERS_ARCHIVE_DIR = "orders_archive"
+
+# Width of the price bands indexed for search_menu, in dollars
+PRICE_BAND = 5
+
+# Joining words inside dish names; they extend a match but never start one
+NAME_JOINERS = {"and", "with", "of", "the", "in", "on"}
+
+# list_menu detail levels: every field, or just what a customer scans a menu for
+MENU_DETAILS = {
+    "full": ["name", "category", "description", "price", "dietary", "prep_time", "cook_time"],
+    "summary": ["name", "price", "dietary"],
+}
+
+# Seconds between checks of menu.json for changes (0 = never reload)
+MENU_RELOAD_INTERVAL = 2.0
 
 # Global data
 MENU_DATA: Dict = {}
+MENU_INDEX: Dict = {}  # the menu and everything derived from it; replaced whole on reload
+_MENU_SIGNATURE = None  # (mtime_ns, size, inode) of menu.json when last read
+RECIPE_BOM: Dict = {}  # {"signature": ..., "recipes": {lowercase recipe name: {food_id: quantity}}}
+STOCK_VIEW: Dict = {}  # servings per dish and the annotated list_menu responses, for one menu and pantry
+PAIRINGS: Dict = {}  # co-occurrence matrix of dishes ordered together, for one menu
+ORDERS_STORE = orders_mcp_server.create_store("json", ORDERS_DB, ORDERS_FILE, ORDERS_ARCHIVE_DIR)  # replaced by main()
+_PAIRINGS_LOCK = threading.Lock()
 
 def load_menu() -> Dict:
     """Load menu from JSON file."""
@@ -41,44 +97,385 @@ def load_menu() -> Dict:
         print(f"[MENU] ⚠️  No {MENU_FILE} found!")
         return {"menu": {}}
 
+def _file_signature(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def reload_menu() -> bool:
+    """Reload menu.json if it changed on disk, swapping in the new menu and index at once.
+
+    A file that is missing or does not parse (e.g. half-saved) keeps the
+    current menu until menu.json changes again.
+
+    Returns:
+        True if a new menu was swapped in
+    """
+    global MENU_DATA, MENU_INDEX, _MENU_SIGNATURE
+    signature = _file_signature(MENU_FILE)
+    if signature == _MENU_SIGNATURE:
+        return False
+    _MENU_SIGNATURE = signature
+    if signature is None:
+        print(f"[MENU] ⚠️  {MENU_FILE} disappeared, keeping the current menu")
+        return False
+    try:
+        with open(MENU_FILE, 'r') as f:
+            data = json.load(f)
+        index = build_menu_index(data.get("menu", {}))
+    except Exception as e:
+        print(f"[MENU] ⚠️  Error reloading {MENU_FILE}: {e}, keeping the current menu")
+        return False
+    # The single assignment in-flight calls may race with; MENU_DATA is informational
+    MENU_INDEX = index
+    MENU_DATA = data
+    print(f"[MENU] 🔄 Reloaded {len(index['items'])} menu items from {MENU_FILE}")
+    return True
+
+def _watch_menu(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            reload_menu()
+            # New orders (and a new menu's matrix) are picked up off the request path
+            refresh_pairings()
+        except Exception as e:
+            print(f"[MENU] ⚠️  Menu watcher error: {e}")
+
+def start_menu_watcher(interval: float = MENU_RELOAD_INTERVAL) -> None:
+    """Check menu.json and the orders change log every `interval` seconds in a daemon thread."""
+    if interval > 0:
+        threading.Thread(target=_watch_menu, args=(interval,), name="menu-watcher", daemon=True).start()
+        print(f"[MENU] Watching {MENU_FILE} for changes every {interval}s")
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+def _price(item: Dict) -> Optional[float]:
+    """An item's price as a number ("$16.99" -> 16.99), or None if it has none."""
+    try:
+        return float(str(item.get("price", "")).replace("$", "").replace(",", ""))
+    except ValueError:
+        return None
+
+def _positions(bits: int) -> Iterator[int]:
+    """Positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+def build_menu_index(menu: Dict[str, Dict]) -> Dict:
+    """Index the menu for search_menu; bit i of every bitset stands for the i-th item in menu.json."""
+    items = list(menu.values())
+    postings: Dict[str, int] = {}
+    name_postings: Dict[str, int] = {}
+    categories: Dict[str, int] = {}
+    dietary: Dict[str, int] = {}
+    price_bands: Dict[int, int] = {}
+    prices = []
+    for position, item in enumerate(items):
+        bit = 1 << position
+        for token in set(_tokens(item.get("name", "")) + _tokens(item.get("description", ""))):
+            postings[token] = postings.get(token, 0) | bit
+        for token in _tokens(item.get("name", "")):
+            name_postings[token] = name_postings.get(token, 0) | bit
+        category = (item.get("category") or "").lower()
+        categories[category] = categories.get(category, 0) | bit
+        for tag in item.get("dietary", []):
+            dietary[tag.lower()] = dietary.get(tag.lower(), 0) | bit
+        price = _price(item)
+        prices.append(price)
+        if price is not None:
+            band = int(price // PRICE_BAND)
+            price_bands[band] = price_bands.get(band, 0) | bit
+    return {
+        "menu": dict(menu),
+        "categories_list": sorted({item["category"] for item in items if item.get("category")}),
+        "listings": build_menu_listings(items),
+        "items": items,
+        "all": (1 << len(items)) - 1,
+        "tokens": sorted(postings),
+        "postings": postings,
+        "name_tokens": sorted(name_postings),
+        "name_postings": name_postings,
+        "name_lengths": [len(_tokens(item.get("name", ""))) for item in items],
+        "categories": categories,
+        "dietary": dietary,
+        "price_bands": price_bands,
+        "prices": prices,
+    }
+
+def build_menu_listings(items: List[Dict]) -> Dict[str, Dict[Optional[str], Dict]]:
+    """Precompute every list_menu response: per detail level, the whole menu (None) and each category."""
+    ordered = sorted(items, key=lambda item: (item.get("category") or "", item.get("name") or ""))
+    listings = {}
+    for detail, fields in MENU_DETAILS.items():
+        by_category: Dict[Optional[str], List[Dict]] = {None: []}
+        for item in ordered:
+            entry = {field: item.get(field, [] if field == "dietary" else None) for field in fields}
+            by_category[None].append(entry)
+            by_category.setdefault(item.get("category"), []).append(entry)
+        listings[detail] = {category: {"items": entries, "count": len(entries)}
+                            for category, entries in by_category.items()}
+    return listings
+
+def _match_words(index: Dict, query: str) -> int:
+    """Items containing every query word, each as a word or the start of one ("bowl" matches "bowls")."""
+    bits = index["all"]
+    for word in _tokens(query):
+        start = bisect.bisect_left(index["tokens"], word)
+        end = bisect.bisect_left(index["tokens"], word + "\U0010ffff", start)
+        word_bits = 0
+        for token in index["tokens"][start:end]:
+            word_bits |= index["postings"][token]
+        bits &= word_bits
+        if not bits:
+            break
+    return bits
+
+def _match_price(index: Dict, min_price: Optional[float], max_price: Optional[float]) -> int:
+    """Items priced within [min_price, max_price]: whole bands inside, exact checks in the edge bands."""
+    low = int(min_price // PRICE_BAND) if min_price is not None else min(index["price_bands"], default=0)
+    high = int(max_price // PRICE_BAND) if max_price is not None else max(index["price_bands"], default=0)
+    bits = 0
+    for band in range(low, high + 1):
+        band_bits = index["price_bands"].get(band, 0)
+        if band in (low, high):
+            band_bits = sum(1 << position for position in _positions(band_bits)
+                            if (min_price is None or index["prices"][position] >= min_price)
+                            and (max_price is None or index["prices"][position] <= max_price))
+        bits |= band_bits
+    return bits
+
+def _recipe_bom() -> Dict[str, Dict[str, float]]:
+    """Ingredients per recipe name from recipe_bom.json, re-read only when the file changes."""
+    global RECIPE_BOM
+    signature = _file_signature(RECIPE_BOM_FILE)
+    if RECIPE_BOM and RECIPE_BOM["signature"] == signature:
+        return RECIPE_BOM["recipes"]
+    recipes = {}
+    if signature is not None:
+        try:
+            with open(RECIPE_BOM_FILE, 'r') as f:
+                for recipe in json.load(f).get("recipes", {}).values():
+                    recipes[recipe.get("name", "").lower()] = recipe.get("ingredients", {})
+            print(f"[MENU] Loaded bill of materials for {len(recipes)} recipes from {RECIPE_BOM_FILE}")
+        except Exception as e:
+            print(f"[MENU] ⚠️  Error loading {RECIPE_BOM_FILE}: {e}, stock is unknown")
+    RECIPE_BOM = {"signature": signature, "recipes": recipes}
+    return recipes
+
+def _servings(ingredients: Dict[str, float], pantry: Dict[str, float]) -> int:
+    """Whole servings the pantry can make: the scarcest ingredient relative to what one serving needs."""
+    return max(0, math.floor(min((pantry.get(food_id, 0) / quantity
+                                  for food_id, quantity in ingredients.items() if quantity > 0),
+                                 default=0)))
+
+def _stock_view() -> Dict:
+    """Servings per dish and the stock-annotated list_menu responses, rebuilt when the
+    menu, pantry.json or recipe_bom.json changes and shared by every call until then."""
+    global STOCK_VIEW
+    index = MENU_INDEX
+    recipes = _recipe_bom()
+    signature = (_file_signature(PANTRY_FILE), RECIPE_BOM["signature"])
+    view = STOCK_VIEW
+    if view and view["index"] is index and view["signature"] == signature:
+        return view
+
+    pantry = None
+    if signature[0] is not None:
+        try:
+            with open(PANTRY_FILE, 'r') as f:
+                pantry = json.load(f)
+        except Exception as e:
+            print(f"[MENU] ⚠️  Error loading {PANTRY_FILE}: {e}, stock is unknown")
+            signature = None  # try again on the next call
+    # Dishes without a recipe (or without a pantry) have unknown stock: None
+    servings = {}
+    for name, item in index["menu"].items():
+        ingredients = recipes.get((item.get("name") or name).lower())
+        servings[name] = _servings(ingredients, pantry) if ingredients and pantry is not None else None
+
+    def annotate(entry: Dict) -> Dict:
+        available = servings.get(entry["name"])
+        return {**entry, "in_stock": None if available is None else available > 0, "servings_available": available}
+
+    listings = {}
+    for detail, responses in index["listings"].items():
+        listings[detail] = {}
+        for category, response in responses.items():
+            listings[detail][category] = {"items": [annotate(entry) for entry in response["items"]],
+                                          "count": response["count"]}
+    STOCK_VIEW = {"index": index, "signature": signature, "servings": servings, "listings": listings}
+    return STOCK_VIEW
+
+def _name_word_bits(index: Dict, word: str) -> int:
+    """Items with a name word equal to word, or starting with it (singular too: "salads" -> "salad")."""
+    if len(word) < 3:
+        return index["name_postings"].get(word, 0)
+    if len(word) > 3 and word.endswith("s"):
+        word = word[:-1]
+    start = bisect.bisect_left(index["name_tokens"], word)
+    end = bisect.bisect_left(index["name_tokens"], word + "\U0010ffff", start)
+    bits = 0
+    for token in index["name_tokens"][start:end]:
+        bits |= index["name_postings"][token]
+    return bits
+
+def _order_items(order: Dict, index: Dict) -> set:
+    """Positions of the dishes named in an order's free-text order_details.
+
+    Runs of consecutive words are matched against the menu's name words, so
+    "2 grilled salmon" finds "Grilled Salmon with Vegetables" and "pancakes"
+    finds "Pancakes". A run naming several dishes ("salad") counts only the
+    dish whose whole name it spells, if any.
+    Joining words ("with") only count inside a run.
+    """
+    words = _tokens(str(order.get("order_details", "")))
+    items = set()
+    i = 0
+    while i < len(words):
+        if words[i] in NAME_JOINERS:
+            i += 1
+            continue
+        bits, end = index["all"], i
+        while end < len(words):
+            narrowed = bits & _name_word_bits(index, words[end])
+            if not narrowed:
+                break
+            bits, end = narrowed, end + 1
+        if end == i:
+            i += 1
+            continue
+        matches = list(_positions(bits))
+        if len(matches) > 1:
+            matches = [position for position in matches if index["name_lengths"][position] == end - i]
+        if len(matches) == 1:
+            items.add(matches[0])
+            i = end
+        else:
+            i += 1
+    return items
+
+def _add_order(pairings: Dict, order: Dict) -> None:
+    """Count an order's dishes against the rest of its basket: one customer's orders on one day.
+
+    Each pair is counted once per basket; the diagonal counts baskets with the dish.
+    """
+    if order["order_id"] <= pairings["last_order_id"]:
+        return
+    pairings["last_order_id"] = order["order_id"]
+    items = _order_items(order, pairings["index"])
+    day = str(order.get("created_at", ""))[:10]
+    if day > pairings["day"]:
+        # Orders are created "now", so earlier days' baskets are complete
+        pairings["day"], pairings["baskets"] = day, {}
+    basket = pairings["baskets"].setdefault((str(order.get("name", "")).lower(), day), set())
+    new, old = sorted(items - basket), sorted(basket)
+    if not new:
+        return
+    matrix = pairings["matrix"]
+    matrix[np.ix_(new, new)] += 1
+    if old:
+        matrix[np.ix_(new, old)] += 1
+        matrix[np.ix_(old, new)] += 1
+    basket.update(new)
+    for row in new + old:
+        pairings["rankings"][row] = _rank(matrix, row)
+
+def _rank(matrix: np.ndarray, row: int) -> List[int]:
+    """Other dishes ordered with this one, most often first (ties in menu order)."""
+    partners = np.flatnonzero(matrix[row])
+    partners = partners[partners != row]
+    return partners[np.argsort(-matrix[row, partners], kind="stable")].tolist()
+
+def _read_order_changes(pairings: Dict) -> int:
+    """Count orders created since the last read of the orders change feed (by any process).
+
+    If the feed no longer reaches back that far, the missed orders are read from
+    the order history instead.
+
+    Returns:
+        Number of changes read
+    """
+    changes, truncated = ORDERS_STORE.changes_since(pairings["seq"])
+    if truncated:
+        print(f"[MENU] Order change feed truncated after #{pairings['seq']}, catching up from the order history")
+        for order in ORDERS_STORE.all_orders():
+            _add_order(pairings, order)
+    for change in changes:
+        if change.get("old_status") is None and change.get("order"):
+            _add_order(pairings, change["order"])
+    if changes:
+        pairings["seq"] = changes[-1]["seq"]
+    return len(changes)
+
+def build_pairings(index: Dict) -> Dict:
+    """Build the co-occurrence matrix for a menu from every order on file: archived and outstanding."""
+    names = list(index["menu"])
+    pairings = {
+        "index": index,
+        "names": names,
+        "column": {name: position for position, name in enumerate(names)},
+        "matrix": np.zeros((len(names), len(names)), dtype=np.int64),
+        "rankings": {},
+        "baskets": {},
+        "day": "",
+        "last_order_id": 0,
+        "seq": ORDERS_STORE.current_seq(),
+    }
+    for order in ORDERS_STORE.all_orders():
+        _add_order(pairings, order)
+    # Orders created while the history was read are in the change feed
+    _read_order_changes(pairings)
+    print(f"[MENU] Built dish pairings from {pairings['last_order_id']} orders")
+    return pairings
+
+def refresh_pairings() -> Dict:
+    """Bring the pairings up to date: rebuilt for a new menu, otherwise only new orders are read."""
+    global PAIRINGS
+    with _PAIRINGS_LOCK:
+        if not PAIRINGS or PAIRINGS["index"] is not MENU_INDEX:
+            PAIRINGS = build_pairings(MENU_INDEX)
+        else:
+            _read_order_changes(PAIRINGS)
+        return PAIRINGS
+
 # Load menu at startup
+_MENU_SIGNATURE = _file_signature(MENU_FILE)
 MENU_DATA = load_menu()
+MENU_INDEX = build_menu_index(MENU_DATA.get("menu", {}))
 
 @mcp.tool
-def list_menu(category: Optional[str] = None) -> dict:
+def list_menu(category: Optional[str] = None, detail: str = "full") -> dict:
     """List all menu items with descriptions, optionally filtered by category.
 
     Args:
         category: Optional category filter (e.g., "Salads", "Breakfast & Brunch", "Seafood")
+        detail: "full" for descriptions, prep and cook times (default), or "summary"
+            for just name, price and dietary tags
 
     Returns:
-        List of menu items with their descriptions and details
+        List of menu items with their descriptions and details, each with in_stock and
+        servings_available from the pantry (None when the dish has no recipe on file)
     """
-    print(f"[MENU] Listing menu items" + (f" in category '{category}'" if category else ""))
-
-    menu = MENU_DATA.get("menu", {})
-    items = []
-
-    for item_name, item_data in menu.items():
-        if category is None or item_data.get("category") == category:
-            items.append({
-                "name": item_data.get("name"),
-                "category": item_data.get("category"),
-                "description": item_data.get("description"),
-                "price": item_data.get("price"),
-                "dietary": item_data.get("dietary", []),
-                "prep_time": item_data.get("prep_time"),
-                "cook_time": item_data.get("cook_time")
-            })
-
-    # Sort by category then name
-    items.sort(key=lambda x: (x["category"], x["name"]))
-
-    print(f"[MENU] Found {len(items)} menu items")
-    return {
-        "items": items,
-        "count": len(items)
-    }
+    print(f"[MENU] Listing menu items" + (f" in category '{category}'" if category else "")
+          + (f" ({detail})" if detail != "full" else ""))
+
+    if detail not in MENU_DETAILS:
+        return {
+            "success": False,
+            "message": f"Invalid detail '{detail}'. Must be one of {list(MENU_DETAILS)}."
+        }
+
+    # Responses are built with the menu and pantry; treat them as read-only
+    result = _stock_view()["listings"][detail].get(category, {"items": [], "count": 0})
+
+    print(f"[MENU] Found {result['count']} menu items")
+    return result
 
 @mcp.tool
 def get_menu_item(item_name: str) -> dict:
@@ -88,14 +485,17 @@ def get_menu_item(item_name: str) -> dict:
         item_name: Name of the menu item (e.g., "Greek Salad")
 
     Returns:
-        Full details about the menu item including description, price, dietary info
+        Full details about the menu item including description, price, dietary info,
+        in_stock and servings_available
     """
     print(f"[MENU] Looking up menu item: {item_name}")
 
-    menu = MENU_DATA.get("menu", {})
+    view = _stock_view()
+    menu = view["index"]["menu"]
 
     if item_name in menu:
         item = menu[item_name]
+        available = view["servings"][item_name]
         print(f"[MENU] ✅ Found {item_name}")
         return {
             "success": True,
@@ -106,7 +506,9 @@ def get_menu_item(item_name: str) -> dict:
                 "price": item.get("price"),
                 "dietary": item.get("dietary", []),
                 "prep_time": item.get("prep_time"),
-                "cook_time": item.get("cook_time")
+                "cook_time": item.get("cook_time"),
+                "in_stock": None if available is None else available > 0,
+                "servings_available": available
             }
         }
     else:
@@ -125,15 +527,7 @@ def list_categories() -> dict:
     """
     print(f"[MENU] Listing menu categories")
 
-    menu = MENU_DATA.get("menu", {})
-    categories = set()
-
-    for item_data in menu.values():
-        category = item_data.get("category")
-        if category:
-            categories.add(category)
-
-    categories_list = sorted(list(categories))
+    categories_list = list(MENU_INDEX["categories_list"])
 
     print(f"[MENU] Found {len(categories_list)} categories")
     return {
@@ -142,43 +536,126 @@ def list_categories() -> dict:
     }
 
 @mcp.tool
-def search_menu(query: str) -> dict:
-    """Search menu items by keyword in name or description.
+def search_menu(query: Optional[str] = None, category: Optional[str] = None,
+                dietary: Optional[List[str]] = None, max_price: Optional[float] = None,
+                min_price: Optional[float] = None) -> dict:
+    """Search menu items by keyword, category, dietary tags and price, all in one call.
+
+    Every given constraint must hold, e.g. "vegan, gluten-free, under $15,
+    matching 'bowl'" is query="bowl", dietary=["vegan", "gluten-free"], max_price=15.
 
     Args:
-        query: Search term (searches in name and description)
+        query: Words to find in the name or description; each must match a word
+            or the start of one (optional)
+        category: Only items in this category, e.g. "Salads" (optional)
+        dietary: Only items with all of these tags, e.g. ["vegan", "gluten-free"] (optional)
+        max_price: Only items costing at most this many dollars (optional)
+        min_price: Only items costing at least this many dollars (optional)
 
     Returns:
         List of matching menu items
     """
-    print(f"[MENU] Searching menu for: '{query}'")
+    print(f"[MENU] Searching menu for: '{query or ''}'"
+          + (f" category={category}" if category else "") + (f" dietary={dietary}" if dietary else "")
+          + (f" price {min_price or 0}-{max_price if max_price is not None else 'any'}"
+             if min_price is not None or max_price is not None else ""))
+
+    index = MENU_INDEX
+    bits = index["all"]
+    if query:
+        bits &= _match_words(index, query)
+    if category:
+        bits &= index["categories"].get(category.lower(), 0)
+    if isinstance(dietary, str):
+        dietary = dietary.split(",")
+    for tag in dietary or []:
+        bits &= index["dietary"].get(tag.strip().lower(), 0)
+    if min_price is not None or max_price is not None:
+        bits &= _match_price(index, min_price, max_price)
 
-    menu = MENU_DATA.get("menu", {})
-    query_lower = query.lower()
     matches = []
-
-    for item_name, item_data in menu.items():
-        name_match = query_lower in item_data.get("name", "").lower()
-        desc_match = query_lower in item_data.get("description", "").lower()
-
-        if name_match or desc_match:
-            matches.append({
-                "name": item_data.get("name"),
-                "category": item_data.get("category"),
-                "description": item_data.get("description"),
-                "price": item_data.get("price"),
-                "dietary": item_data.get("dietary", [])
-            })
-
-    print(f"[MENU] Found {len(matches)} matches for '{query}'")
+    for position in _positions(bits):
+        item_data = index["items"][position]
+        matches.append({
+            "name": item_data.get("name"),
+            "category": item_data.get("category"),
+            "description": item_data.get("description"),
+            "price": item_data.get("price"),
+            "dietary": item_data.get("dietary", [])
+        })
+
+    print(f"[MENU] Found {len(matches)} matches for '{query or ''}'")
     return {
         "matches": matches,
         "count": len(matches),
         "query": query
     }
 
-def main(transport="stdio", host="0.0.0.0", port=8727):
-    """Run the menu MCP server."""
+@mcp.tool
+def recommend_pairings(item_name: str, k: int = 3) -> dict:
+    """Suggest dishes customers most often order together with a menu item.
+
+    Args:
+        item_name: Name of the menu item (e.g., "Greek Salad")
+        k: Number of suggestions (default: 3)
+
+    Returns:
+        Up to k dishes, most often ordered with the item first, with how many
+        customers ordered both and their share of those who ordered the item
+    """
+    print(f"[MENU] Recommending pairings for: {item_name}")
+
+    if k < 1:
+        return {"success": False, "message": "k must be at least 1."}
+    pairings = refresh_pairings()
+    if item_name not in pairings["column"]:
+        print(f"[MENU] ❌ Menu item '{item_name}' not found")
+        return {
+            "success": False,
+            "message": f"Menu item '{item_name}' not found"
+        }
+
+    # Another call may be adding orders to the matrix; read this row under the lock
+    with _PAIRINGS_LOCK:
+        row = pairings["column"][item_name]
+        counts = pairings["matrix"][row].copy()
+        partners = list(pairings["rankings"].get(row, [])[:k])
+        names = pairings["names"]
+    ordered = int(counts[row])
+    suggestions = []
+    for partner in partners:
+        together = int(counts[partner])
+        suggestions.append({
+            "name": names[partner],
+            "ordered_together": together,
+            "share": round(together / ordered, 3)
+        })
+
+    print(f"[MENU] Found {len(suggestions)} pairings for {item_name}")
+    return {
+        "success": True,
+        "item": item_name,
+        "times_ordered": ordered,
+        "pairings": suggestions,
+        "count": len(suggestions)
+    }
+
+def main(transport="stdio", host="0.0.0.0", port=8727, reload_interval=MENU_RELOAD_INTERVAL,
+         orders_storage="json", orders_db=ORDERS_DB):
+    """Run the menu MCP server.
+
+    Args:
+        transport: "stdio", "sse" or "streamable-http"
+        host: Host to bind for HTTP transports
+        port: Port to bind for HTTP transports
+        reload_interval: Seconds between checks of menu.json for changes (0 = never reload)
+        orders_storage: The orders server's storage backend, "json" or "sqlite", read for pairings
+        orders_db: The orders server's SQLite database path when orders_storage="sqlite"
+    """
+    global ORDERS_STORE
+    ORDERS_STORE = orders_mcp_server.create_store(orders_storage, orders_db, ORDERS_FILE, ORDERS_ARCHIVE_DIR)
+    refresh_pairings()
+    start_menu_watcher(float(reload_interval))
     if transport in ["sse", "streamable-http"]:
         mcp.run(transport=transport, host=host, port=port)
     elif transport == "stdio":
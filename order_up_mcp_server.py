@@ -9,62 +9,569 @@
 """Order Up MCP Server - Tracks Chef's order completion.
 
 This server manages the chef's order queue and completion tracking.
+Accepted orders move through the kitchen's stations (prep, then a cooking
+station) in a discrete-event simulation: queued -> cooking -> ready.
+
+chef_orders.json is a snapshot of the orders still in play. Each change is
+appended to chef_orders.log.jsonl and folded into a new snapshot every
+COMPACT_EVERY entries. Delivered orders move into one JSON Lines archive
+segment per day in chef_orders_archive/.
 """
 
 from fastmcp import FastMCP
+import base64
+import bisect
+import copy
 import fire
+import heapq
 import json
+import math
 import os
-from typing import Dict, List
+import tempfile
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 mcp = FastMCP()
 
 # Orders JSON file path
 ORDERS_FILE = "chef_orders.json"
+ORDERS_LOG = "chef_orders.log.jsonl"
+ARCHIVE_DIR = "chef_orders_archive"
+
+# Log entries between snapshots of chef_orders.json
+COMPACT_EVERY = 500
+
+# Recently delivered orders kept in memory for kitchen_status
+RECENT_DELIVERED_SIZE = 500
+RECENT_DELIVERED = deque(maxlen=RECENT_DELIVERED_SIZE)
+
+# Changes made since chef_orders.json was last written (logged, or found on load)
+LOG_ENTRIES = 0
+
+# Statuses of orders still in the live file; delivered orders are archived
+LIVE_STATUSES = ["queued", "cooking", "ready"]
+VALID_STATUSES = LIVE_STATUSES + ["delivered"]
+
+# Status index: ascending order IDs per live status, kept current on every status change
+STATUS_INDEX: Dict[str, List[int]] = {status: [] for status in LIVE_STATUSES}
+
+# Kitchen stations and how many orders each can work on at once
+STATIONS: Dict[str, int] = {"prep": 2, "grill": 1, "oven": 1}
+PREP_STATION = "prep"
+DEFAULT_COOK_STATION = "grill"
+
+# Wall-clock seconds per simulated kitchen minute (60 = real time, 0 = orders are ready instantly)
+SECONDS_PER_MINUTE = 60.0
+
+# Window for throughput and utilization reporting, in kitchen minutes
+THROUGHPUT_WINDOW_MINUTES = 60
+
+# Relative error of the latency quantiles reported by kitchen_stats
+SKETCH_ACCURACY = 0.01
+# Slices per window; the rolling window moves forward one slice at a time
+STATS_SLICES = 12
+
+
+class KitchenScheduler:
+    """Discrete-event model of the kitchen's stations.
+
+    Each order has a route of (station, seconds) stages. A station works on up
+    to its capacity of orders at once and queues the rest first-come first-served.
+    Completion events sit in a heap ordered by time; advance() pops them and
+    starts queued work on the freed stations at the event's time, not the caller's.
+    """
+
+    def __init__(self, capacities: Dict[str, int]):
+        self.capacities = dict(capacities)
+        self.busy = {station: 0 for station in capacities}
+        self.queues = {station: deque() for station in capacities}
+        self.events: List[Tuple[float, int, int]] = []  # heap of (finishes_at, seq, order_id)
+        self.routes: Dict[int, List[Tuple[str, float]]] = {}
+        self.stage: Dict[int, int] = {}  # order_id -> index of its current stage
+        self._seq = 0
+
+    def submit(self, order_id: int, route: List[Tuple[str, float]], at: float) -> List[Tuple]:
+        """Queue a new order at its first station.
+
+        Returns:
+            Transitions (time, order_id, "queued"/"started"/"ready", station, stage), in time order
+        """
+        self.routes[order_id] = route
+        self.stage[order_id] = 0
+        transitions = []
+        self._enqueue(order_id, at, transitions)
+        return transitions
+
+    def resume(self, order_id: int, route: List[Tuple[str, float]], stage: int,
+               started_at: Optional[float]) -> None:
+        """Restore an in-flight order (e.g. after a restart): on its station if started_at is set, else queued.
+
+        Orders must be resumed in the order they were queued.
+        """
+        self.routes[order_id] = route
+        self.stage[order_id] = stage
+        station, seconds = route[stage]
+        if started_at is None:
+            self.queues[station].append(order_id)
+        else:
+            self.busy[station] += 1
+            self._push(started_at + seconds, order_id)
+
+    def advance(self, until: float) -> List[Tuple]:
+        """Process every completion up to `until` and return the resulting transitions."""
+        transitions = []
+        while self.events and self.events[0][0] <= until:
+            at, _, order_id = heapq.heappop(self.events)
+            station = self.routes[order_id][self.stage[order_id]][0]
+            self.busy[station] -= 1
+            self.stage[order_id] += 1
+            self._enqueue(order_id, at, transitions)
+            self._start_queued(station, at, transitions)
+        return transitions
+
+    def estimate_ready(self) -> Dict[int, float]:
+        """When each unfinished order will be ready if no more orders arrive."""
+        forecast = copy.deepcopy(self)
+        return {order_id: at for at, order_id, event, _, _ in forecast.advance(float("inf")) if event == "ready"}
+
+    def _push(self, at: float, order_id: int) -> None:
+        heapq.heappush(self.events, (at, self._seq, order_id))
+        self._seq += 1
+
+    def _enqueue(self, order_id: int, at: float, transitions: List[Tuple]) -> None:
+        route, stage = self.routes[order_id], self.stage[order_id]
+        if stage >= len(route):
+            del self.routes[order_id], self.stage[order_id]
+            transitions.append((at, order_id, "ready", None, stage))
+            return
+        station = route[stage][0]
+        self.queues[station].append(order_id)
+        transitions.append((at, order_id, "queued", station, stage))
+        self._start_queued(station, at, transitions)
+
+    def _start_queued(self, station: str, at: float, transitions: List[Tuple]) -> None:
+        while self.queues[station] and self.busy[station] < self.capacities[station]:
+            order_id = self.queues[station].popleft()
+            stage = self.stage[order_id]
+            self.busy[station] += 1
+            self._push(at + self.routes[order_id][stage][1], order_id)
+            transitions.append((at, order_id, "started", station, stage))
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets, each SKETCH_ACCURACY wide
+    relative to its value, so any quantile is within that relative error of
+    the true one. Memory grows with the range of values, not their number,
+    and two sketches merge by adding bucket counts.
+    """
+
+    def __init__(self, accuracy: float = SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        if value <= 1e-9:
+            self.zeros += 1
+        else:
+            bucket = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The value at quantile q (0..1), or None if the sketch is empty.
+
+        Uses the nearest rank: the ceil(q * count)-th smallest sample (at least the first).
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RollingSketches:
+    """Per-key quantile sketches over a rolling time window.
+
+    The window is split into STATS_SLICES slices with one sketch per key each.
+    Samples go into the slice of their timestamp, slices older than the window
+    are dropped, and queries merge the slices still inside it.
+    """
+
+    def __init__(self, window: float, slices: int = STATS_SLICES):
+        self.window = window
+        self.slice_seconds = window / slices
+        self.slices: deque = deque()  # (slice index, {key: QuantileSketch}), oldest first
+
+    def add(self, key: str, value: float, at: float) -> None:
+        index = math.floor(at / self.slice_seconds)
+        # Samples nearly always land in the newest slice; late ones walk back to theirs
+        position = len(self.slices)
+        while position and self.slices[position - 1][0] > index:
+            position -= 1
+        if position and self.slices[position - 1][0] == index:
+            sketches = self.slices[position - 1][1]
+        else:
+            sketches = {}
+            self.slices.insert(position, (index, sketches))
+        sketches.setdefault(key, QuantileSketch()).add(value)
+
+    def snapshot(self, now: float) -> Dict[str, QuantileSketch]:
+        """Merged sketch per key for the window ending at `now`."""
+        oldest = math.floor((now - self.window) / self.slice_seconds) + 1
+        while self.slices and self.slices[0][0] < oldest:
+            self.slices.popleft()
+        merged: Dict[str, QuantileSketch] = {}
+        for _, sketches in self.slices:
+            for key, sketch in sketches.items():
+                merged.setdefault(key, QuantileSketch()).merge(sketch)
+        return merged
+
+def _empty_orders() -> Dict:
+    return {"orders": {}, "next_order_id": 1, "archive_segments": []}
 
 def load_orders() -> Dict:
-    """Load orders from JSON file."""
+    """Load the orders snapshot from JSON file and replay the operation log on top of it."""
+    global LOG_ENTRIES
     if os.path.exists(ORDERS_FILE):
         try:
             with open(ORDERS_FILE, 'r') as f:
                 data = json.load(f)
-                # Ensure next_order_id exists
-                if "next_order_id" not in data:
-                    data["next_order_id"] = 1
                 print(f"[ORDER_UP] Loaded {len(data.get('orders', {}))} orders from {ORDERS_FILE}")
-                return data
         except Exception as e:
             print(f"[ORDER_UP] ⚠️  Error loading {ORDERS_FILE}: {e}, using empty orders")
-            return {"orders": {}, "next_order_id": 1}
+            data = _empty_orders()
     else:
         print(f"[ORDER_UP] No {ORDERS_FILE} found, starting fresh")
-        return {"orders": {}, "next_order_id": 1}
+        data = _empty_orders()
+    # Ensure next_order_id and the archive index exist
+    data.setdefault("orders", {})
+    data.setdefault("next_order_id", 1)
+    data.setdefault("archive_segments", [])
+
+    LOG_ENTRIES = 0
+    if os.path.exists(ORDERS_LOG):
+        with open(ORDERS_LOG, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn final write; everything before it was fsynced
+                _replay(data, entry)
+                LOG_ENTRIES += 1
+        if LOG_ENTRIES:
+            print(f"[ORDER_UP] Replayed {LOG_ENTRIES} entries from {ORDERS_LOG}")
+
+    # Files from before the archive existed still hold their delivered orders
+    delivered = [order for order in data["orders"].values() if order.get("status") == "delivered"]
+    for order in delivered:
+        _archive_order(data, order)
+    LOG_ENTRIES += len(delivered)
+    if delivered:
+        print(f"[ORDER_UP] Archived {len(delivered)} delivered orders to {ARCHIVE_DIR}/")
+    return data
+
+def _replay(data: Dict, entry: Dict) -> None:
+    """Apply one operation log entry to the orders data."""
+    if entry["op"] == "put":
+        order = entry["order"]
+        data["orders"][str(order["order_id"])] = order
+        data["next_order_id"] = max(data["next_order_id"], order["order_id"] + 1)
+    elif entry["op"] == "archive":
+        data["orders"].pop(str(entry["order_id"]), None)
+        _index_segment(data, entry["date"], entry["order_id"])
+
+def save_orders(data: Dict) -> bool:
+    """Atomically replace the orders snapshot (temp file + fsync + rename).
 
-def save_orders(data: Dict) -> None:
-    """Save orders to JSON file."""
+    Returns:
+        True if the new snapshot is on disk, False if it could not be written
+    """
     try:
-        with open(ORDERS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(ORDERS_FILE)), prefix=".chef_orders-", suffix=".tmp")
+        try:
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, ORDERS_FILE)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         print(f"[ORDER_UP] 💾 Saved {len(data.get('orders', {}))} orders to {ORDERS_FILE}")
+        return True
     except Exception as e:
         print(f"[ORDER_UP] ⚠️  Error saving to {ORDERS_FILE}: {e}")
+        return False
+
+def compact_orders() -> None:
+    """Fold the operation log into a fresh snapshot and start an empty log."""
+    global LOG_ENTRIES
+    # Only drop the log once the snapshot that contains it is safely on disk
+    if not save_orders(ORDERS_DATA):
+        print(f"[ORDER_UP] ⚠️  Keeping {LOG_ENTRIES} log entries in {ORDERS_LOG} until a snapshot succeeds")
+        return
+    if os.path.exists(ORDERS_LOG):
+        os.truncate(ORDERS_LOG, 0)
+    print(f"[ORDER_UP] 🗜️  Compacted {LOG_ENTRIES} log entries into {ORDERS_FILE}")
+    LOG_ENTRIES = 0
+
+def append_log(entries: List[Dict]) -> None:
+    """Append operations to the log (one fsynced write), compacting every COMPACT_EVERY entries."""
+    global LOG_ENTRIES
+    if not entries:
+        return
+    try:
+        with open(ORDERS_LOG, 'a') as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        print(f"[ORDER_UP] ⚠️  Error appending to {ORDERS_LOG}: {e}")
+        return
+    LOG_ENTRIES += len(entries)
+    if LOG_ENTRIES >= COMPACT_EVERY:
+        compact_orders()
+
+def log_orders(order_ids) -> None:
+    """Record the current state of the given orders in the operation log."""
+    append_log([{"op": "put", "order": ORDERS_DATA["orders"][str(order_id)]} for order_id in order_ids])
+
+def _segment_path(day: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"chef_orders-{day}.jsonl")
+
+def _index_segment(data: Dict, day: str, order_id: int) -> None:
+    for segment in data["archive_segments"]:
+        if segment["date"] == day:
+            segment["min_id"] = min(segment["min_id"], order_id)
+            segment["max_id"] = max(segment["max_id"], order_id)
+            segment["count"] = segment.get("count", 0) + 1
+            return
+    data["archive_segments"].append({"date": day, "min_id": order_id, "max_id": order_id, "count": 1})
+
+def _archive_order(data: Dict, order: Dict) -> Dict:
+    """Move a delivered order out of the live orders into its day's archive segment.
+
+    Returns:
+        The log entry recording the move
+    """
+    order_id = order["order_id"]
+    day = (order.get("delivered_at") or order.get("completed_at") or order["accepted_at"])[:10]
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(_segment_path(day), 'a') as f:
+        f.write(json.dumps(order) + "\n")
+    del data["orders"][str(order_id)]
+    _index_segment(data, day, order_id)
+    RECENT_DELIVERED.append(order)
+    return {"op": "archive", "order_id": order_id, "date": day}
+
+def find_archived(order_id: int) -> Optional[Dict]:
+    """Look up a delivered order in the archive segments that can contain its ID."""
+    for segment in reversed(ORDERS_DATA["archive_segments"]):
+        if not segment["min_id"] <= order_id <= segment["max_id"]:
+            continue
+        path = _segment_path(segment["date"])
+        if not os.path.exists(path):
+            continue
+        found = None
+        with open(path, 'r') as f:
+            for line in f:
+                order = json.loads(line)
+                if order["order_id"] == order_id:
+                    found = order
+        if found:
+            return found
+    return None
+
+def _load_recent_delivered() -> None:
+    """Seed the recently delivered orders from the newest archive segment."""
+    if not ORDERS_DATA["archive_segments"]:
+        return
+    path = _segment_path(max(segment["date"] for segment in ORDERS_DATA["archive_segments"]))
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            RECENT_DELIVERED.extend(json.loads(line) for line in f)
+
+def build_status_index(data: Dict) -> None:
+    """Rebuild the per-status lists of live order IDs."""
+    global STATUS_INDEX
+    index = {status: [] for status in LIVE_STATUSES}
+    for order in data["orders"].values():
+        if order.get("status") in index:
+            index[order["status"]].append(order["order_id"])
+    STATUS_INDEX = {status: sorted(order_ids) for status, order_ids in index.items()}
+
+def _set_status(order: Dict, status: str) -> None:
+    """Change an order's status and move its ID within the status index."""
+    old = order.get("status")
+    if old == status:
+        return
+    if old in STATUS_INDEX:
+        order_ids = STATUS_INDEX[old]
+        position = bisect.bisect_left(order_ids, order["order_id"])
+        if position < len(order_ids) and order_ids[position] == order["order_id"]:
+            del order_ids[position]
+    if status in STATUS_INDEX:
+        bisect.insort(STATUS_INDEX[status], order["order_id"])
+    order["status"] = status
+
+def _timestamp(at: float) -> str:
+    return datetime.fromtimestamp(at).isoformat()
+
+def _epoch(timestamp: str) -> float:
+    return datetime.fromisoformat(timestamp).timestamp()
+
+def _route(order: Dict) -> List[Tuple[str, float]]:
+    """An order's stages as (station, wall-clock seconds) for the scheduler."""
+    return [(stage["station"], stage["minutes"] * SECONDS_PER_MINUTE) for stage in order["stages"]]
+
+def build_kitchen(data: Dict) -> KitchenScheduler:
+    """Rebuild the kitchen simulation from the queued and cooking orders in the orders data."""
+    in_flight = []
+    capacities = dict(STATIONS)
+    for order in data.get("orders", {}).values():
+        if order.get("status") not in ("queued", "cooking"):
+            continue
+        stage = next(i for i, step in enumerate(order["stages"]) if step.get("finished_at") is None)
+        step = order["stages"][stage]
+        if step["station"] not in capacities:
+            print(f"[ORDER_UP] ⚠️  Station '{step['station']}' is no longer configured, giving it capacity 1")
+            capacities[step["station"]] = 1
+        started_at = _epoch(step["started_at"]) if step.get("started_at") else None
+        # Orders already on a station first, then the queue in arrival order
+        in_flight.append((started_at is None, _epoch(step["queued_at"]), order["order_id"], stage, started_at, order))
+
+    kitchen = KitchenScheduler(capacities)
+    for _, _, order_id, stage, started_at, order in sorted(in_flight, key=lambda entry: entry[:3]):
+        kitchen.resume(order_id, _route(order), stage, started_at)
+    if in_flight:
+        print(f"[ORDER_UP] Resumed {len(in_flight)} orders in the kitchen")
+    return kitchen
+
+def _apply_transitions(transitions: List[Tuple]) -> None:
+    """Record scheduler transitions on the orders: stage timestamps, status and station."""
+    for at, order_id, event, station, stage in transitions:
+        order = ORDERS_DATA["orders"][str(order_id)]
+        stages = order["stages"]
+        when = _timestamp(at)
+        if event in ("queued", "ready") and stage > 0:
+            stages[stage - 1]["finished_at"] = when
+        if event == "queued":
+            stages[stage]["queued_at"] = when
+            _set_status(order, "queued")
+        elif event == "started":
+            stages[stage]["started_at"] = when
+            _set_status(order, "cooking")
+        else:
+            _set_status(order, "ready")
+            order["completed_at"] = when
+            _record_ready(order, at)
+            print(f"[ORDER_UP] ✅ Order #{order_id} ready! ({order['recipe']})")
+        order["station"] = station
+
+def _sync_kitchen() -> None:
+    """Advance the kitchen to the current time and log any transitions."""
+    transitions = KITCHEN.advance(time.time())
+    if transitions:
+        _apply_transitions(transitions)
+        log_orders(dict.fromkeys(order_id for _, order_id, _, _, _ in transitions))
+
+def _kitchen_minutes(seconds: float) -> int:
+    return round(seconds / SECONDS_PER_MINUTE) if SECONDS_PER_MINUTE > 0 else 0
+
+def _minute_seconds() -> float:
+    """Wall-clock seconds per kitchen minute for reporting windows (real time when orders are instant)."""
+    return SECONDS_PER_MINUTE if SECONDS_PER_MINUTE > 0 else 60
+
+def _record_ready(order: Dict, at: float) -> None:
+    READY_LATENCY.add(order["recipe"], at - _epoch(order["accepted_at"]), at)
+
+def _record_delivered(order: Dict, at: float) -> None:
+    if order.get("completed_at"):
+        DELIVERY_LATENCY.add(order["recipe"], at - _epoch(order["completed_at"]), at)
+
+def build_kitchen_stats(data: Dict) -> None:
+    """Start the rolling latency sketches, seeded from ready and recently delivered orders."""
+    global READY_LATENCY, DELIVERY_LATENCY
+    window = THROUGHPUT_WINDOW_MINUTES * _minute_seconds()
+    READY_LATENCY = RollingSketches(window)
+    DELIVERY_LATENCY = RollingSketches(window)
+    # Orders from before the scheduler may lack the timestamps
+    orders = [order for order in list(data["orders"].values()) + list(RECENT_DELIVERED)
+              if order.get("accepted_at") and order.get("completed_at")]
+    since = time.time() - window
+    for order in sorted(orders, key=lambda order: order["completed_at"]):
+        if _epoch(order["completed_at"]) >= since:
+            _record_ready(order, _epoch(order["completed_at"]))
+        if order.get("delivered_at") and _epoch(order["delivered_at"]) >= since:
+            _record_delivered(order, _epoch(order["delivered_at"]))
+
+def parse_stations(stations) -> Dict[str, int]:
+    """Parse station capacities from "prep=2,grill=1,oven=1" (or a dict)."""
+    if isinstance(stations, dict):
+        return {str(name): int(capacity) for name, capacity in stations.items()}
+    parsed = {}
+    for entry in str(stations).split(","):
+        name, _, capacity = entry.partition("=")
+        parsed[name.strip()] = int(capacity)
+    return parsed
 
 # Load orders from file (or start empty)
 ORDERS_DATA = load_orders()
+if LOG_ENTRIES:
+    compact_orders()
+_load_recent_delivered()
+build_status_index(ORDERS_DATA)
+build_kitchen_stats(ORDERS_DATA)
+KITCHEN = build_kitchen(ORDERS_DATA)
 
 @mcp.tool
-def accept_order(recipe: str, prep_time: int = 10, cook_time: int = 0) -> dict:
+def accept_order(recipe: str, prep_time: int = 10, cook_time: int = 0, station: str = None) -> dict:
     """Accept a new order from a customer. Order ID is auto-generated.
 
+    The order queues for the prep station, then for its cooking station, and is
+    ready once both are done. Its ETA accounts for every order ahead of it.
+
     Args:
         recipe: Name of the dish/recipe being prepared
         prep_time: Preparation time in minutes (default: 10)
         cook_time: Cooking time in minutes (default: 0)
+        station: Cooking station, e.g. "grill" or "oven" (default: grill)
 
     Returns:
         Order acceptance confirmation with auto-generated order_id and estimated completion
     """
+    cook_station = station or DEFAULT_COOK_STATION
+    if cook_station not in STATIONS:
+        return {
+            "success": False,
+            "message": f"Unknown station '{cook_station}', choose from: {', '.join(STATIONS)}"
+        }
+
+    _sync_kitchen()
+
     # Get next order ID and increment
     order_id = ORDERS_DATA["next_order_id"]
     ORDERS_DATA["next_order_id"] += 1
@@ -72,6 +579,7 @@ def accept_order(recipe: str, prep_time: int = 10, cook_time: int = 0) -> dict:
     print(f"[ORDER_UP] 📋 Accepting order #{order_id}: {recipe}")
 
     total_time = prep_time + cook_time
+    now = time.time()
 
     order_data = {
         "order_id": order_id,
@@ -79,54 +587,170 @@ def accept_order(recipe: str, prep_time: int = 10, cook_time: int = 0) -> dict:
         "prep_time_minutes": prep_time,
         "cook_time_minutes": cook_time,
         "total_time_minutes": total_time,
-        "status": "ready",  # Orders complete instantly
-        "accepted_at": datetime.now().isoformat(),
-        "completed_at": datetime.now().isoformat(),  # Instant completion
+        "status": None,
+        "station": None,
+        "stages": [
+            {"station": name, "minutes": minutes, "queued_at": None, "started_at": None, "finished_at": None}
+            for name, minutes in ((PREP_STATION, prep_time), (cook_station, cook_time)) if minutes > 0
+        ],
+        "accepted_at": _timestamp(now),
+        "completed_at": None,
     }
 
     ORDERS_DATA["orders"][str(order_id)] = order_data
-    save_orders(ORDERS_DATA)
-
-    print(f"[ORDER_UP] ✅ Order #{order_id} ready! (simulated {total_time} min)")
+    _set_status(order_data, "queued")
+    _apply_transitions(KITCHEN.submit(order_id, _route(order_data), now))
+    # Stages that take no time finish on the spot
+    _apply_transitions(KITCHEN.advance(now))
+
+    ready_at = KITCHEN.estimate_ready().get(order_id, now)
+    order_data["estimated_ready_at"] = _timestamp(ready_at)
+    log_orders([order_id])
+
+    eta_minutes = _kitchen_minutes(ready_at - now)
+    status = order_data["status"]
+    if status == "ready":
+        message = f"Order #{order_id} for {recipe} is ready! (prep: {prep_time}min, cook: {cook_time}min)"
+    else:
+        message = (f"Order #{order_id} for {recipe} is {status}, ready in about {eta_minutes} min "
+                   f"(prep: {prep_time}min, cook: {cook_time}min on the {cook_station})")
+    print(f"[ORDER_UP] ⏱️  Order #{order_id} {status}, ETA {eta_minutes} min (work: {total_time} min)")
 
     return {
         "success": True,
         "order_id": order_id,
         "recipe": recipe,
-        "status": "ready",
-        "message": f"Order #{order_id} for {recipe} is ready! (prep: {prep_time}min, cook: {cook_time}min)",
-        "total_time_minutes": total_time
+        "status": status,
+        "message": message,
+        "total_time_minutes": total_time,
+        "eta_minutes": eta_minutes,
+        "estimated_ready_at": order_data["estimated_ready_at"]
     }
 
+def _encode_cursor(status: Optional[str], since: Optional[str], position: List) -> str:
+    return base64.urlsafe_b64encode(json.dumps([status, since, *position]).encode()).decode()
+
+def _decode_cursor(cursor: str, status: Optional[str], since: Optional[str]) -> List:
+    """Return the position encoded in a list_ready_orders cursor."""
+    try:
+        cursor_status, cursor_since, *position = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_status != status or cursor_since != since:
+        raise ValueError("Cursor was created with a different status or since value")
+    return position
+
+def _live_page(statuses: List[str], since: Optional[str], after: int, limit: Optional[int]) -> List[Dict]:
+    """Live orders with the given statuses, ascending by ID, from the status index."""
+    orders = ORDERS_DATA["orders"]
+    slices = []
+    for status in statuses:
+        order_ids = STATUS_INDEX[status]
+        start = bisect.bisect_right(order_ids, after)
+        if since:
+            # IDs are assigned in acceptance order, so accepted_at ascends with them
+            start = max(start, bisect.bisect_left(
+                order_ids, since, key=lambda order_id: orders[str(order_id)]["accepted_at"]))
+        slices.append(order_ids[start:] if limit is None else order_ids[start:start + limit])
+    merged = list(heapq.merge(*slices)) if len(slices) > 1 else slices[0]
+    return [orders[str(order_id)] for order_id in merged[:limit]]
+
+def _delivered_page(since: Optional[str], after: List, limit: Optional[int]) -> List[Tuple[List, Dict]]:
+    """Archived orders as ([segment date, position], order), by delivery day and then archive position.
+
+    Segments are appended to as orders are delivered, so paging by position
+    rather than by ID still lists an order delivered after the cursor was
+    issued, even one accepted (and numbered) earlier.
+    """
+    after_date, after_position = after or ("", -1)
+    page = []
+    for segment in sorted(ORDERS_DATA["archive_segments"], key=lambda segment: segment["date"]):
+        day = segment["date"]
+        # An order is delivered no earlier than the day it was accepted
+        if day < after_date or (since and day < since[:10]):
+            continue
+        path = _segment_path(day)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r') as f:
+            archived = [json.loads(line) for line in f]
+        # An order archived twice (a crash before its log entry) is listed at its last position
+        last = {order["order_id"]: position for position, order in enumerate(archived)}
+        page += [([day, position], order) for position, order in enumerate(archived)
+                 if last[order["order_id"]] == position
+                 and (day > after_date or position > after_position)
+                 and (not since or order["accepted_at"] >= since)]
+        if limit is not None and len(page) >= limit:
+            break
+    return page[:limit]
+
 @mcp.tool
-def list_ready_orders() -> dict:
-    """List all orders and their completion status.
+def list_ready_orders(status: str = None, since: str = None, limit: int = None, cursor: str = None) -> dict:
+    """List orders and their completion status, optionally one page at a time.
+
+    Args:
+        status: Only orders with this status: "queued", "cooking", "ready" or
+            "delivered" (default: every order not yet delivered)
+        since: Only orders accepted at or after this ISO timestamp, e.g. "2025-01-31T18:00"
+        limit: Maximum number of orders to return (default: all)
+        cursor: The next_cursor from a previous call, to fetch the following page
 
     Returns:
-        Dictionary with all orders grouped by status
+        Matching orders (ready_orders) in the order they were accepted, delivered
+        ones in the order they were delivered, the order count per status and
+        next_cursor (None on the last page)
     """
-    print(f"[ORDER_UP] 📊 Listing all orders")
+    print(f"[ORDER_UP] 📊 Listing {status or 'live'} orders" + (f" since {since}" if since else ""))
 
-    orders = ORDERS_DATA.get("orders", {})
+    if status is not None and status not in VALID_STATUSES:
+        return {"success": False, "message": f"Invalid status '{status}'. Must be one of {VALID_STATUSES}."}
+    if limit is not None and limit < 1:
+        return {"success": False, "message": "limit must be at least 1."}
+    try:
+        after = _decode_cursor(cursor, status, since) if cursor else None
+    except ValueError as e:
+        print(f"[ORDER_UP] ❌ {e}")
+        return {"success": False, "message": str(e)}
+
+    _sync_kitchen()
 
-    ready_orders = []
-    for order_id, order_data in orders.items():
-        ready_orders.append({
-            "order_id": order_id,
+    # Fetch one extra order to learn whether another page follows
+    fetch = limit + 1 if limit else None
+    if status == "delivered":
+        entries = _delivered_page(since, after, fetch)
+    else:
+        statuses = [status] if status else LIVE_STATUSES
+        entries = [([order["order_id"]], order) for order in _live_page(statuses, since, after[0] if after else 0, fetch)]
+    next_cursor = None
+    if limit is not None and len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = _encode_cursor(status, since, entries[-1][0])
+
+    orders = []
+    for _, order_data in entries:
+        orders.append({
+            "order_id": order_data["order_id"],
             "recipe": order_data.get("recipe"),
             "status": order_data.get("status"),
             "total_time_minutes": order_data.get("total_time_minutes"),
             "accepted_at": order_data.get("accepted_at"),
+            "estimated_ready_at": order_data.get("estimated_ready_at"),
             "completed_at": order_data.get("completed_at"),
+            **({"delivered_at": order_data.get("delivered_at")} if status == "delivered" else {}),
         })
 
+    counts = {live_status: len(order_ids) for live_status, order_ids in STATUS_INDEX.items()}
+    counts["delivered"] = sum(segment.get("count", 0) for segment in ORDERS_DATA["archive_segments"])
     result = {
-        "total_orders": len(orders),
-        "ready_orders": ready_orders,
-        "ready_count": len(ready_orders)
+        "total_orders": sum(counts.values()),
+        "delivered_count": counts["delivered"],
+        "ready_orders": orders,
+        "ready_count": counts["ready"],
+        "status_counts": counts,
+        "next_cursor": next_cursor
     }
 
-    print(f"[ORDER_UP] Found {len(ready_orders)} ready orders")
+    print(f"[ORDER_UP] Found {len(orders)} orders" + (" (more available)" if next_cursor else ""))
 
     return result
 
@@ -142,23 +766,32 @@ def get_order_status(order_id: int) -> dict:
     """
     print(f"[ORDER_UP] 🔍 Checking status of order #{order_id}")
 
+    _sync_kitchen()
     orders = ORDERS_DATA.get("orders", {})
     order_id_str = str(order_id)
 
-    if order_id_str not in orders:
+    # Delivered orders live in the archive
+    order = orders.get(order_id_str) or find_archived(order_id)
+    if order is None:
         print(f"[ORDER_UP] ❌ Order #{order_id} not found")
         return {
             "success": False,
             "message": f"Order #{order_id} not found"
         }
 
-    order = orders[order_id_str]
     print(f"[ORDER_UP] ✅ Order #{order_id} status: {order.get('status')}")
 
-    return {
+    result = {
         "success": True,
         "order": order
     }
+    if order.get("status") in ("queued", "cooking"):
+        # Re-estimate: orders ahead of this one may have finished early or late
+        now = time.time()
+        ready_at = KITCHEN.estimate_ready().get(order["order_id"], now)
+        order["estimated_ready_at"] = _timestamp(ready_at)
+        result["eta_minutes"] = _kitchen_minutes(ready_at - now)
+    return result
 
 @mcp.tool
 def mark_order_delivered(order_id: int) -> dict:
@@ -172,20 +805,37 @@ def mark_order_delivered(order_id: int) -> dict:
     """
     print(f"[ORDER_UP] 📦 Marking order #{order_id} as delivered")
 
+    _sync_kitchen()
     orders = ORDERS_DATA.get("orders", {})
     order_id_str = str(order_id)
 
     if order_id_str not in orders:
+        if find_archived(order_id):
+            return {
+                "success": True,
+                "order_id": order_id,
+                "status": "delivered",
+                "message": f"Order #{order_id} was already delivered"
+            }
         return {
             "success": False,
             "message": f"Order #{order_id} not found"
         }
 
+    if orders[order_id_str].get("status") in ("queued", "cooking"):
+        return {
+            "success": False,
+            "message": f"Order #{order_id} is still {orders[order_id_str]['status']} and cannot be delivered yet"
+        }
+
     # Update status to delivered
-    orders[order_id_str]["status"] = "delivered"
-    orders[order_id_str]["delivered_at"] = datetime.now().isoformat()
+    delivered_at = time.time()
+    _set_status(orders[order_id_str], "delivered")
+    orders[order_id_str]["delivered_at"] = _timestamp(delivered_at)
+    _record_delivered(orders[order_id_str], delivered_at)
 
-    save_orders(ORDERS_DATA)
+    # The delivered ticket leaves the live orders for today's archive segment
+    append_log([_archive_order(ORDERS_DATA, orders[order_id_str])])
 
     print(f"[ORDER_UP] ✅ Order #{order_id} marked as delivered")
 
@@ -196,8 +846,139 @@ def mark_order_delivered(order_id: int) -> dict:
         "message": f"Order #{order_id} has been marked as delivered"
     }
 
-def main(transport="stdio", host="0.0.0.0", port=8726):
-    """Run the order_up MCP server."""
+@mcp.tool
+def kitchen_status() -> dict:
+    """Show each station's load and the kitchen's recent throughput.
+
+    Utilization is the share of the station's capacity that was busy over the
+    last THROUGHPUT_WINDOW_MINUTES kitchen minutes; a station with a queue or
+    utilization of 90% or more is saturated.
+
+    Returns:
+        Per-station capacity, busy slots, queue length, utilization and saturation,
+        the bottleneck station, orders in the kitchen and orders completed per hour
+    """
+    print(f"[ORDER_UP] 📈 Checking kitchen status")
+
+    _sync_kitchen()
+    now = time.time()
+    window = THROUGHPUT_WINDOW_MINUTES * _minute_seconds()
+    since = now - window
+
+    busy_seconds = {station: 0.0 for station in KITCHEN.capacities}
+    completed = 0
+    for order in list(ORDERS_DATA.get("orders", {}).values()) + list(RECENT_DELIVERED):
+        if order.get("completed_at") and _epoch(order["completed_at"]) >= since:
+            completed += 1
+        for stage in order.get("stages", []):
+            if not stage.get("started_at") or stage["station"] not in busy_seconds:
+                continue
+            finished = _epoch(stage["finished_at"]) if stage.get("finished_at") else now
+            busy_seconds[stage["station"]] += max(0.0, min(finished, now) - max(_epoch(stage["started_at"]), since))
+
+    stations = {}
+    for station, capacity in KITCHEN.capacities.items():
+        utilization = busy_seconds[station] / (capacity * window)
+        stations[station] = {
+            "capacity": capacity,
+            "busy": KITCHEN.busy[station],
+            "queued": len(KITCHEN.queues[station]),
+            "utilization": round(utilization, 3),
+            "saturated": bool(KITCHEN.queues[station]) or utilization >= 0.9
+        }
+    bottleneck = max(stations, key=lambda name: (stations[name]["queued"], stations[name]["utilization"]))
+
+    result = {
+        "stations": stations,
+        "bottleneck": bottleneck,
+        "orders_in_kitchen": len(KITCHEN.routes),
+        "completed_in_window": completed,
+        "orders_per_hour": round(completed * 60 / THROUGHPUT_WINDOW_MINUTES, 1),
+        "window_minutes": THROUGHPUT_WINDOW_MINUTES
+    }
+    print(f"[ORDER_UP] {len(KITCHEN.routes)} orders in the kitchen, bottleneck: {bottleneck}, "
+          f"{result['orders_per_hour']} orders/hour")
+    return result
+
+def _latency_summary(sketch: QuantileSketch) -> Dict:
+    """Count and p50/p95/p99 of a latency sketch, in kitchen minutes."""
+    summary = {"count": sketch.count}
+    for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        summary[name] = round(sketch.quantile(q) / _minute_seconds(), 1)
+    return summary
+
+@mcp.tool
+def kitchen_stats(recipe: str = None) -> dict:
+    """Show ticket timing percentiles per recipe over the recent window.
+
+    Latencies come from streaming quantile sketches updated as orders become
+    ready and are delivered, covering the last THROUGHPUT_WINDOW_MINUTES
+    kitchen minutes. Percentiles are accurate to about 1%.
+
+    Args:
+        recipe: Only report this recipe (default: every recipe)
+
+    Returns:
+        p50/p95/p99 minutes from accept to ready and from ready to delivered, per
+        recipe and overall, and tickets completed and delivered per kitchen minute
+    """
+    print(f"[ORDER_UP] ⏲️  Computing kitchen stats" + (f" for {recipe}" if recipe else ""))
+
+    _sync_kitchen()
+    now = time.time()
+    metrics = {"accept_to_ready": READY_LATENCY.snapshot(now), "ready_to_delivered": DELIVERY_LATENCY.snapshot(now)}
+
+    recipes = {}
+    overall = {}
+    for metric, sketches in metrics.items():
+        total = QuantileSketch()
+        for name, sketch in sketches.items():
+            total.merge(sketch)
+            if recipe is None or name == recipe:
+                recipes.setdefault(name, {})[metric] = _latency_summary(sketch)
+        overall[metric] = _latency_summary(total) if total.count else {"count": 0}
+    for metrics_by_name in recipes.values():
+        for metric in metrics:
+            metrics_by_name.setdefault(metric, {"count": 0})
+    if recipe is not None and recipe not in recipes:
+        return {
+            "success": False,
+            "message": f"No tickets for '{recipe}' in the last {THROUGHPUT_WINDOW_MINUTES} kitchen minutes"
+        }
+
+    result = {
+        "window_minutes": THROUGHPUT_WINDOW_MINUTES,
+        "tickets_per_minute": {
+            "ready": round(overall["accept_to_ready"]["count"] / THROUGHPUT_WINDOW_MINUTES, 2),
+            "delivered": round(overall["ready_to_delivered"]["count"] / THROUGHPUT_WINDOW_MINUTES, 2)
+        },
+        "overall": overall,
+        "recipes": recipes
+    }
+    print(f"[ORDER_UP] {overall['accept_to_ready']['count']} tickets ready and "
+          f"{overall['ready_to_delivered']['count']} delivered across {len(recipes)} recipes")
+    return result
+
+def main(transport="stdio", host="0.0.0.0", port=8726, stations=None, seconds_per_minute=SECONDS_PER_MINUTE):
+    """Run the order_up MCP server.
+
+    Args:
+        transport: "stdio", "sse" or "streamable-http"
+        host: Host to bind for HTTP transports
+        port: Port to bind for HTTP transports
+        stations: Station capacities, e.g. "prep=2,grill=1,oven=1"
+        seconds_per_minute: Wall-clock seconds per kitchen minute (60 = real time,
+            0 = orders are ready as soon as they are accepted)
+    """
+    global STATIONS, SECONDS_PER_MINUTE, KITCHEN
+    if stations:
+        STATIONS = parse_stations(stations)
+        if PREP_STATION not in STATIONS:
+            raise Exception(f"Stations must include '{PREP_STATION}', got {STATIONS}")
+    SECONDS_PER_MINUTE = float(seconds_per_minute)
+    KITCHEN = build_kitchen(ORDERS_DATA)
+    build_kitchen_stats(ORDERS_DATA)
+    print(f"[ORDER_UP] Kitchen stations: {STATIONS}, {SECONDS_PER_MINUTE}s per kitchen minute")
     if transport in ["sse", "streamable-http"]:
         mcp.run(transport=transport, host=host, port=port)
     elif transport == "stdio":
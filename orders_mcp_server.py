@@ -10,89 +10,1119 @@
 
 This server tracks customer orders, their status, and details.
 The waiter agent uses this to manage the order lifecycle.
+
+Orders are kept in a pluggable storage backend selected from main():
+- json: the original orders.json file (default)
+- sqlite: a SQLite database in WAL mode, indexed by status, customer
+  name and created_at. An existing orders.json is migrated on first start.
+
+Both backends keep only outstanding orders in the live set, indexed by
+status. SERVED orders move into per-day archive segments, so listing
+outstanding orders costs time proportional to open orders, not history.
 """
 
+import asyncio
+import base64
+import bisect
+import fcntl
 import json
 import os
-from typing import Dict, Any, List
-from datetime import datetime
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 from fastmcp import FastMCP
 import fire
 
 mcp = FastMCP()
 
 ORDERS_FILE = 'orders.json'
+ORDERS_DB = 'orders.db'
+ARCHIVE_DIR = 'orders_archive'
+
+VALID_STATUSES = ["RECEIVED", "COOKING", "READY", "SERVED"]
+OUTSTANDING_STATUSES = ["RECEIVED", "COOKING", "READY"]
+
+# list_orders sorting and projection
+SORT_KEYS = ["created_at", "status"]
+ORDER_FIELDS = ["order_id", "name", "order_details", "estimated_wait_time",
+                "eta_minutes", "due_at", "status", "created_at", "updated_at"]
+STATUS_RANK = {status: rank for rank, status in enumerate(OUTSTANDING_STATUSES)}
+
+# Matches "15 minutes", "1 hour", "1h 30m", "20-25 mins" (ranges count as their upper bound).
+# Numbers need a unit, so "7:30" or "2 pizzas" are not read as minutes
+WAIT_TIME_PART = re.compile(
+    r"(?<![\d:.])(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*(\d+(?:\.\d+)?))?\s*(hours?|hrs?|h|minutes?|mins?|m)\b",
+    re.IGNORECASE)
+# A wait time that is only a number or a range of numbers, taken as minutes
+WAIT_TIME_BARE = re.compile(r"\s*(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*(\d+(?:\.\d+)?))?\s*")
+
+# Change feed: how many recent changes are retained, and how watch_orders polls
+CHANGE_LOG_SIZE = 1000
+WATCH_POLL_INTERVAL = 0.25
+WATCH_MAX_TIMEOUT = 60.0
+
+
+class OrderArchivedError(Exception):
+    """Raised when changing an order that was SERVED and moved to the archive."""
+
+
+class OrderStore:
+    """Interface shared by the order storage backends.
+
+    Batch methods apply all their changes with a single durable write.
+    """
+
+    def create_orders(self, new_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create orders from dicts with name, order_details, estimated_wait_time and status.
+
+        Returns the created orders, with their new order_ids, in input order.
+        """
+        raise NotImplementedError
+
+    def update_statuses(self, updates: List[Tuple[int, str]]) -> List[Any]:
+        """Apply (order_id, status) updates. Returns one result per update, in order.
+
+        Each result is (old_status, order), None if the order was not found, or
+        an OrderArchivedError if an archived order was given any status other
+        than SERVED. SERVED orders are moved to the archive.
+        """
+        raise NotImplementedError
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """Return the order with this ID, or None."""
+        raise NotImplementedError
+
+    def create_order(self, name: str, order_details: str, estimated_wait_time: str,
+                     status: str = "RECEIVED") -> Dict[str, Any]:
+        """Create one order and return it with its new order_id."""
+        return self.create_orders([{
+            "name": name,
+            "order_details": order_details,
+            "estimated_wait_time": estimated_wait_time,
+            "status": status
+        }])[0]
+
+    def update_status(self, order_id: int, status: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Set one order's status. Raises OrderArchivedError for archived orders."""
+        result = self.update_statuses([(order_id, status)])[0]
+        if isinstance(result, OrderArchivedError):
+            raise result
+        return result
+
+    def list_outstanding(self, sort_by: str = "created_at", descending: bool = False,
+                         after: Optional[Tuple[Any, int]] = None,
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return orders that are not SERVED, ordered by (sort key, order_id).
+
+        sort_by is "created_at" or "status" (RECEIVED, COOKING, READY). With
+        after=(sort key, order_id), only orders past that position are
+        returned, which gives keyset pagination together with limit.
+        """
+        raise NotImplementedError
+
+    def count_outstanding(self) -> int:
+        """Return the number of orders that are not SERVED."""
+        raise NotImplementedError
+
+    def overdue(self, now: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return outstanding orders with due_at <= now (ISO timestamp), most overdue first."""
+        raise NotImplementedError
+
+    def find_by_customer(self, name_prefix: str) -> List[Dict[str, Any]]:
+        """Return outstanding orders whose customer name starts with name_prefix (case-insensitive)."""
+        raise NotImplementedError
+
+    def all_orders(self) -> List[Dict[str, Any]]:
+        """Return every order, archived and outstanding, by order_id."""
+        raise NotImplementedError
 
-def load_orders() -> Dict[str, Any]:
-    if not os.path.exists(ORDERS_FILE):
-        print(f"[ORDERS] No existing orders file, starting fresh")
-        return {"next_order_id": 1, "orders": {}}
-    with open(ORDERS_FILE, 'r') as f:
+    def current_seq(self) -> int:
+        """Return the sequence number of the latest order change (0 if none)."""
+        raise NotImplementedError
+
+    def changes_since(self, since_seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return (changes with seq > since_seq, truncated).
+
+        Each change is {seq, order_id, old_status, status, changed_at, order}.
+        truncated is True when changes after since_seq were already dropped
+        from the retained log, so the caller should re-read list_orders().
+        """
+        raise NotImplementedError
+
+
+class JsonOrderStore(OrderStore):
+    """Stores live orders in a JSON file and SERVED orders in archive segments.
+
+    orders.json holds only outstanding orders plus a per-status index of their
+    IDs. SERVED orders are appended to one JSON Lines segment per day in
+    orders_archive/, so the live file stays proportional to open orders.
+    The parsed file is cached and only re-read when it changes on disk.
+
+    Every change gets the next sequence number (orders.json "seq") and is
+    appended to orders_changes.jsonl, which is read incrementally and
+    compacted to the last CHANGE_LOG_SIZE entries.
+
+    Several server processes can share the files: every mutation holds an
+    exclusive flock on orders.json.lock, re-reads the file if another
+    process replaced it, and writes the new version to a temp file that is
+    fsynced and renamed over orders.json. Readers never see a partial file.
+    Every write also bumps a generation counter kept in the lock file, so a
+    writer holding the lock notices any other process's write even when the
+    file's mtime, size and inode all look unchanged.
+    """
+
+    def __init__(self, path: str = ORDERS_FILE, archive_dir: str = ARCHIVE_DIR):
+        self.path = path
+        self.archive_dir = archive_dir
+        self.changes_path = os.path.splitext(path)[0] + "_changes.jsonl"
+        self.lock_path = path + ".lock"
+        self._lock = threading.RLock()
+        self._lock_fd: Optional[int] = None
+        self._lock_depth = 0
+        self._data: Optional[Dict[str, Any]] = None
+        self._signature = None
+        self._generation = None  # lock file generation the cached data was read or written at
+        self._name_index: List[Tuple[str, int]] = []  # sorted (lowercase name, order_id)
+        self._due_index: List[Tuple[str, int]] = []  # sorted (due_at, order_id)
+        self._created_index: List[Tuple[str, int]] = []  # sorted (created_at, order_id)
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)
+        self._changes_position = (None, None, 0)  # (inode, first seq, byte offset) read so far
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            print(f"[ORDERS] No existing orders file, starting fresh")
+            return _empty_orders()
+        with open(self.path, 'r') as f:
+            try:
+                data = json.load(f)
+                print(f"[ORDERS] Loaded {len(data.get('orders', {}))} orders from {self.path}")
+                return data
+            except json.JSONDecodeError:
+                print(f"[ORDERS] Error loading orders file, starting fresh")
+                return _empty_orders()
+
+    def save(self, orders: Dict[str, Any]):
+        """Atomically replace the orders file. Callers must hold _locked()."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path)), prefix=".orders-", suffix=".tmp")
         try:
-            data = json.load(f)
-            print(f"[ORDERS] Loaded {len(data.get('orders', {}))} orders from {ORDERS_FILE}")
-            return data
-        except json.JSONDecodeError:
-            print(f"[ORDERS] Error loading orders file, starting fresh")
-            return {"next_order_id": 1, "orders": {}}
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, 'w') as f:
+                # Unindented output lets json use its C encoder; this is the hot write path
+                f.write(json.dumps(orders))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._signature = self._file_signature()
+        self._generation = self._read_generation() + 1
+        os.pwrite(self._lock_fd, self._generation.to_bytes(8, "little"), 0)
+
+    def _read_generation(self) -> int:
+        """How many times orders.json has been written, from the lock file. Callers must hold _locked()."""
+        return int.from_bytes(os.pread(self._lock_fd, 8, 0).ljust(8, b"\0"), "little")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the in-process lock and an exclusive flock shared with other server processes."""
+        with self._lock:
+            if self._lock_depth == 0:
+                if self._lock_fd is None:
+                    self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+                # Another process wrote since our copy was read, whatever the stat signature says
+                if self._data is not None and self._read_generation() != self._generation:
+                    self._signature = None
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _current(self) -> Dict[str, Any]:
+        """Return the cached orders, re-reading the file only if it changed."""
+        if self._data is None or self._file_signature() != self._signature:
+            # Reload under the file lock so an upgrade never races another writer
+            with self._locked():
+                self._signature = self._file_signature()
+                self._generation = self._read_generation()
+                self._data = self.load()
+                if self._normalize(self._data):
+                    self.save(self._data)
+                self._name_index = sorted(
+                    (order['name'].lower(), order['order_id']) for order in self._data['orders'].values())
+                self._due_index = sorted(
+                    (order['due_at'], order['order_id'])
+                    for order in self._data['orders'].values() if order.get('due_at'))
+                self._created_index = sorted(
+                    (order['created_at'], order['order_id']) for order in self._data['orders'].values())
+        return self._data
+
+    def _normalize(self, data: Dict[str, Any]) -> bool:
+        """Upgrade files written before the status index existed. Returns True if changed."""
+        changed = False
+        data.setdefault('next_order_id', 1)
+        data.setdefault('seq', 0)
+        data.setdefault('orders', {})
+        data.setdefault('archive_segments', [])
+        if 'status_index' not in data:
+            data['status_index'] = {status: [] for status in OUTSTANDING_STATUSES}
+            for order in sorted(data['orders'].values(), key=lambda o: o['order_id']):
+                if order['status'] in OUTSTANDING_STATUSES:
+                    data['status_index'][order['status']].append(order['order_id'])
+            changed = True
+        for order in data['orders'].values():
+            if 'due_at' not in order:
+                order.update(_eta_fields(order['estimated_wait_time'], order['created_at']))
+                changed = True
+        served = [order for order in data['orders'].values() if order['status'] == 'SERVED']
+        for order in served:
+            self._archive(data, order)
+            changed = True
+        if served:
+            print(f"[ORDERS] Archived {len(served)} served orders to {self.archive_dir}/")
+        return changed
+
+    def _segment_path(self, day: str) -> str:
+        return os.path.join(self.archive_dir, f"orders-{day}.jsonl")
+
+    def _archive(self, data: Dict[str, Any], order: Dict[str, Any]):
+        """Move a SERVED order out of the live file into its day's archive segment."""
+        order_id = order['order_id']
+        day = order['updated_at'][:10]
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(self._segment_path(day), 'a') as f:
+            f.write(json.dumps(order) + "\n")
+
+        del data['orders'][str(order_id)]
+        for segment in data['archive_segments']:
+            if segment['date'] == day:
+                segment['min_id'] = min(segment['min_id'], order_id)
+                segment['max_id'] = max(segment['max_id'], order_id)
+                break
+        else:
+            data['archive_segments'].append({"date": day, "min_id": order_id, "max_id": order_id})
+
+    def _find_archived(self, data: Dict[str, Any], order_id: int) -> Optional[Dict[str, Any]]:
+        for segment in reversed(data['archive_segments']):
+            if not segment['min_id'] <= order_id <= segment['max_id']:
+                continue
+            path = self._segment_path(segment['date'])
+            if not os.path.exists(path):
+                continue
+            found = None
+            with open(path, 'r') as f:
+                for line in f:
+                    order = json.loads(line)
+                    if order['order_id'] == order_id:
+                        found = order
+            if found:
+                if 'due_at' not in found:
+                    found.update(_eta_fields(found['estimated_wait_time'], found['created_at']))
+                return found
+        return None
+
+    def _record_change(self, data: Dict[str, Any], pending: List[Dict[str, Any]],
+                       order: Dict[str, Any], old_status: Optional[str]):
+        data['seq'] += 1
+        pending.append({"seq": data['seq'], **_change(order, old_status)})
+
+    def _append_changes(self, pending: List[Dict[str, Any]]):
+        """Append committed changes to the change log, compacting it when it doubles."""
+        if not pending:
+            return
+        with open(self.changes_path, 'a') as f:
+            for change in pending:
+                f.write(json.dumps(change) + "\n")
+        self._read_changes()
+        # Compacting each time seq crosses a multiple keeps the file under 2x the retained size
+        if any(change['seq'] % CHANGE_LOG_SIZE == 0 for change in pending):
+            self._compact_changes()
+
+    def _compact_changes(self):
+        tmp_path = self.changes_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for change in self._changes:
+                f.write(json.dumps(change) + "\n")
+        os.replace(tmp_path, self.changes_path)
+        st = os.stat(self.changes_path)
+        self._changes_position = (st.st_ino, self._changes[0]['seq'], st.st_size)
+
+    def _read_changes(self):
+        """Pick up change log lines written since the last read (by any process).
+
+        A compacted log may land on the inode of an earlier one, so the read
+        resumes at the old offset only if the log still starts with the same seq.
+        """
+        try:
+            f = open(self.changes_path, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            head = f.readline()
+            if not head.endswith("\n"):
+                return  # first line still being written
+            first_seq = json.loads(head)['seq']
+            st = os.fstat(f.fileno())
+            inode, read_first_seq, offset = self._changes_position
+            if (inode, read_first_seq) != (st.st_ino, first_seq) or st.st_size < offset:
+                self._changes.clear()
+                offset = 0
+            if st.st_size == offset:
+                return
+            f.seek(offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written line, read it next time
+                offset += len(line.encode())
+                change = json.loads(line)
+                if not self._changes or change['seq'] > self._changes[-1]['seq']:
+                    self._changes.append(change)
+        self._changes_position = (st.st_ino, first_seq, offset)
+
+    def all_orders(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            data = self._current()
+            orders = {}
+            for segment in data['archive_segments']:
+                path = self._segment_path(segment['date'])
+                if os.path.exists(path):
+                    with open(path, 'r') as f:
+                        for line in f:
+                            if line.endswith("\n"):
+                                order = json.loads(line)
+                                orders[order['order_id']] = order
+            orders.update((order['order_id'], order) for order in data['orders'].values())
+        return [orders[order_id] for order_id in sorted(orders)]
+
+    def current_seq(self) -> int:
+        with self._lock:
+            return self._current()['seq']
+
+    def changes_since(self, since_seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        with self._lock:
+            self._read_changes()
+            changes = [change for change in self._changes if change['seq'] > since_seq]
+            oldest = self._changes[0]['seq'] if self._changes else self._current()['seq'] + 1
+        return changes, oldest > since_seq + 1
+
+    def create_orders(self, new_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self._locked():
+            orders_data = self._current()
+            created = []
+            pending = []
+            for spec in new_orders:
+                order_id = orders_data['next_order_id']
+                orders_data['next_order_id'] += 1
+
+                new_order = _new_order(order_id, spec['name'], spec['order_details'],
+                                       spec['estimated_wait_time'], spec.get('status', 'RECEIVED'))
+                orders_data['orders'][str(order_id)] = new_order
+                orders_data['status_index'][new_order['status']].append(order_id)
+                created.append(new_order)
+                self._record_change(orders_data, pending, new_order, None)
+            self.save(orders_data)
+            self._append_changes(pending)
+            for order in created:
+                bisect.insort(self._name_index, (order['name'].lower(), order['order_id']))
+                if order['due_at']:
+                    bisect.insort(self._due_index, (order['due_at'], order['order_id']))
+                bisect.insort(self._created_index, (order['created_at'], order['order_id']))
+        return created
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            orders_data = self._current()
+            order = orders_data['orders'].get(str(order_id))
+            if order is None:
+                order = self._find_archived(orders_data, order_id)
+        return order
+
+    def update_statuses(self, updates: List[Tuple[int, str]]) -> List[Any]:
+        with self._locked():
+            orders_data = self._current()
+            index = orders_data['status_index']
+            results = []
+            pending = []
+            for order_id, status in updates:
+                order = orders_data['orders'].get(str(order_id))
+                if not order:
+                    archived = self._find_archived(orders_data, order_id)
+                    if archived is None:
+                        results.append(None)
+                    elif status == 'SERVED':
+                        results.append(('SERVED', archived))
+                    else:
+                        results.append(OrderArchivedError(
+                            f"Order {order_id} was already SERVED and has been archived."))
+                    continue
+
+                old_status = order['status']
+                order['status'] = status
+                order['updated_at'] = datetime.now().isoformat()
+
+                index[old_status].remove(order_id)
+                if status == 'SERVED':
+                    self._archive(orders_data, order)
+                    self._name_index.remove((order['name'].lower(), order_id))
+                    if order.get('due_at'):
+                        self._due_index.remove((order['due_at'], order_id))
+                    self._created_index.remove((order['created_at'], order_id))
+                else:
+                    bisect.insort(index[status], order_id)
+                results.append((old_status, order))
+                self._record_change(orders_data, pending, order, old_status)
+            if pending:
+                self.save(orders_data)
+                self._append_changes(pending)
+        return results
+
+    def list_outstanding(self, sort_by: str = "created_at", descending: bool = False,
+                         after: Optional[Tuple[Any, int]] = None,
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            orders_data = self._current()
+            # Both indexes are already in (sort key, order_id) order, so a page
+            # is a slice starting at the cursor rather than a sort of every order
+            if sort_by == "status":
+                keys = [(rank, order_id)
+                        for status, rank in STATUS_RANK.items()
+                        for order_id in orders_data['status_index'][status]]
+            else:
+                keys = self._created_index
+            if descending:
+                end = bisect.bisect_left(keys, tuple(after)) if after is not None else len(keys)
+                start = max(end - limit, 0) if limit is not None else 0
+                window = keys[start:end][::-1]
+            else:
+                start = bisect.bisect_right(keys, tuple(after)) if after is not None else 0
+                window = keys[start:start + limit] if limit is not None else keys[start:]
+            return [orders_data['orders'][str(order_id)] for _, order_id in window]
+
+    def count_outstanding(self) -> int:
+        with self._lock:
+            index = self._current()['status_index']
+            return sum(len(index[status]) for status in OUTSTANDING_STATUSES)
+
+    def overdue(self, now: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            orders_data = self._current()
+            # Entries due at or before now form a prefix of the sorted index
+            end = bisect.bisect_right(self._due_index, (now, float('inf')))
+            if limit is not None:
+                end = min(end, limit)
+            return [orders_data['orders'][str(order_id)] for _, order_id in self._due_index[:end]]
+
+    def find_by_customer(self, name_prefix: str) -> List[Dict[str, Any]]:
+        prefix = name_prefix.lower()
+        with self._lock:
+            orders_data = self._current()
+            matches = []
+            start = bisect.bisect_left(self._name_index, (prefix,))
+            for name, order_id in self._name_index[start:]:
+                if not name.startswith(prefix):
+                    break
+                matches.append(orders_data['orders'][str(order_id)])
+        return sorted(matches, key=lambda o: o['order_id'])
+
+
+class SqliteOrderStore(OrderStore):
+    """Stores orders in SQLite (WAL mode) so each call touches only the rows it needs.
+
+    Outstanding orders live in the orders table. SERVED orders are moved to
+    archived_orders, partitioned by the day they were served (archived_on).
+    Every change is written to order_changes in the same transaction; its
+    AUTOINCREMENT key is the change sequence number.
+    """
+
+    COLUMNS = ["order_id", "name", "order_details", "estimated_wait_time",
+               "eta_minutes", "due_at", "status", "created_at", "updated_at"]
+
+    def __init__(self, path: str = ORDERS_DB, json_path: str = ORDERS_FILE,
+                 archive_dir: str = ARCHIVE_DIR):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._migrate_from_json(json_path, archive_dir)
+        self._archive_served()
+        print(f"[ORDERS] Using SQLite storage at {path} (WAL mode)")
+
+    def _create_schema(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS orders (
+                order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                order_details TEXT NOT NULL,
+                estimated_wait_time TEXT,
+                eta_minutes INTEGER,
+                due_at TEXT,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+            CREATE INDEX IF NOT EXISTS idx_orders_name ON orders(name COLLATE NOCASE);
+            DROP INDEX IF EXISTS idx_orders_created_at;
+            CREATE INDEX IF NOT EXISTS idx_orders_created_page ON orders(created_at, order_id);
+            CREATE TABLE IF NOT EXISTS archived_orders (
+                order_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                order_details TEXT NOT NULL,
+                estimated_wait_time TEXT,
+                eta_minutes INTEGER,
+                due_at TEXT,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                archived_on TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_archived_orders_day ON archived_orders(archived_on);
+            CREATE TABLE IF NOT EXISTS order_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER NOT NULL,
+                change TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._add_eta_columns()
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_due_at ON orders(due_at)")
+
+    def _add_eta_columns(self):
+        """Add eta_minutes/due_at to databases created before they existed, and backfill them."""
+        for table in ("orders", "archived_orders"):
+            with self._transaction() as conn:
+                columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if "due_at" in columns:
+                    continue
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN eta_minutes INTEGER")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN due_at TEXT")
+                rows = conn.execute(
+                    f"SELECT order_id, estimated_wait_time, created_at FROM {table}").fetchall()
+                for order_id, estimated_wait_time, created_at in rows:
+                    eta = _eta_fields(estimated_wait_time, created_at)
+                    conn.execute(f"UPDATE {table} SET eta_minutes = ?, due_at = ? WHERE order_id = ?",
+                                 (eta['eta_minutes'], eta['due_at'], order_id))
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block inside BEGIN IMMEDIATE so concurrent writers serialize."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _migrate_from_json(self, json_path: str, archive_dir: str):
+        """Import an existing orders.json the first time the database is opened."""
+        if not os.path.exists(json_path):
+            return
+        with self._lock:
+            done = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+            if done:
+                return
+
+            data = JsonOrderStore(json_path, archive_dir).load()
+            orders = list(data.get('orders', {}).values())
+            for segment in data.get('archive_segments', []):
+                segment_path = os.path.join(archive_dir, f"orders-{segment['date']}.jsonl")
+                if os.path.exists(segment_path):
+                    with open(segment_path, 'r') as f:
+                        orders.extend(json.loads(line) for line in f)
+
+            for order in orders:
+                if 'due_at' not in order:
+                    order.update(_eta_fields(order.get('estimated_wait_time'), order['created_at']))
+            with self._transaction() as conn:
+                # Another server process may have migrated while we were reading
+                if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+                    return
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO orders ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                    [tuple(order.get(col) for col in self.COLUMNS) for order in orders])
+                # Keep the ID sequence where the JSON file left off
+                last_id = data.get('next_order_id', 1) - 1
+                row = conn.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = 'orders'").fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES ('orders', ?)", (last_id,))
+                elif row[0] < last_id:
+                    conn.execute(
+                        "UPDATE sqlite_sequence SET seq = ? WHERE name = 'orders'", (last_id,))
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                    (datetime.now().isoformat(),))
+            print(f"[ORDERS] Migrated {len(orders)} orders from {json_path} to {self.path}")
+
+    def _archive_served(self):
+        """Move any SERVED rows still in the live table into archived_orders."""
+        with self._transaction() as conn:
+            moved = conn.execute(
+                f"INSERT OR REPLACE INTO archived_orders ({', '.join(self.COLUMNS)}, archived_on) "
+                f"SELECT {', '.join(self.COLUMNS)}, substr(updated_at, 1, 10) "
+                f"FROM orders WHERE status = 'SERVED'").rowcount
+            conn.execute("DELETE FROM orders WHERE status = 'SERVED'")
+        if moved > 0:
+            print(f"[ORDERS] Archived {moved} served orders")
+
+    def _row_to_order(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {col: row[col] for col in self.COLUMNS}
+
+    def _record_change(self, conn: sqlite3.Connection, order: Dict[str, Any], old_status: Optional[str]):
+        seq = conn.execute(
+            "INSERT INTO order_changes (order_id, change) VALUES (?, ?)",
+            (order['order_id'], json.dumps(_change(order, old_status)))).lastrowid
+        if seq % CHANGE_LOG_SIZE == 0:
+            conn.execute("DELETE FROM order_changes WHERE seq <= ?", (seq - CHANGE_LOG_SIZE,))
+
+    def all_orders(self) -> List[Dict[str, Any]]:
+        columns = ", ".join(self.COLUMNS)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {columns} FROM archived_orders UNION ALL SELECT {columns} FROM orders "
+                "ORDER BY order_id").fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def current_seq(self) -> int:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'order_changes'").fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, since_seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, change FROM order_changes WHERE seq > ? ORDER BY seq", (since_seq,)).fetchall()
+            oldest = self.conn.execute("SELECT MIN(seq) FROM order_changes").fetchone()[0]
+        if oldest is None:
+            oldest = self.current_seq() + 1
+        return [{"seq": row[0], **json.loads(row[1])} for row in rows], oldest > since_seq + 1
+
+    def create_orders(self, new_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        now = datetime.now().isoformat()
+        created = []
+        with self._transaction() as conn:
+            for spec in new_orders:
+                new_order = _new_order(None, spec['name'], spec['order_details'],
+                                       spec['estimated_wait_time'], spec.get('status', 'RECEIVED'), now)
+                columns = self.COLUMNS[1:]
+                new_order['order_id'] = conn.execute(
+                    f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    tuple(new_order[col] for col in columns)).lastrowid
+                created.append(new_order)
+                self._record_change(conn, new_order, None)
+        return created
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM orders WHERE order_id = ?", (order_id,)).fetchone()
+            if row is None:
+                row = self.conn.execute(
+                    "SELECT * FROM archived_orders WHERE order_id = ?", (order_id,)).fetchone()
+        return self._row_to_order(row) if row else None
+
+    def update_statuses(self, updates: List[Tuple[int, str]]) -> List[Any]:
+        results = []
+        with self._transaction() as conn:
+            for order_id, status in updates:
+                row = conn.execute(
+                    "SELECT * FROM orders WHERE order_id = ?", (order_id,)).fetchone()
+                if not row:
+                    archived = conn.execute(
+                        "SELECT * FROM archived_orders WHERE order_id = ?", (order_id,)).fetchone()
+                    if archived is None:
+                        results.append(None)
+                    elif status == 'SERVED':
+                        results.append(('SERVED', self._row_to_order(archived)))
+                    else:
+                        results.append(OrderArchivedError(
+                            f"Order {order_id} was already SERVED and has been archived."))
+                    continue
+
+                order = self._row_to_order(row)
+                old_status = order['status']
+                order['status'] = status
+                order['updated_at'] = datetime.now().isoformat()
+                if status == 'SERVED':
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO archived_orders ({', '.join(self.COLUMNS)}, archived_on) "
+                        f"VALUES ({', '.join('?' * len(self.COLUMNS))}, ?)",
+                        tuple(order[col] for col in self.COLUMNS) + (order['updated_at'][:10],))
+                    conn.execute("DELETE FROM orders WHERE order_id = ?", (order_id,))
+                else:
+                    conn.execute(
+                        "UPDATE orders SET status = ?, updated_at = ? WHERE order_id = ?",
+                        (status, order['updated_at'], order_id))
+                results.append((old_status, order))
+                self._record_change(conn, order, old_status)
+        return results
+
+    def list_outstanding(self, sort_by: str = "created_at", descending: bool = False,
+                         after: Optional[Tuple[Any, int]] = None,
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # The orders table only holds outstanding rows (served ones are archived),
+        # so created_at pages walk idx_orders_created_page from the cursor
+        if sort_by == "status":
+            key = "CASE status " + " ".join(
+                f"WHEN '{status}' THEN {rank}" for status, rank in STATUS_RANK.items()) + " END"
+        else:
+            key = "created_at"
+        direction = "DESC" if descending else "ASC"
+        sql = "SELECT * FROM orders"
+        params: List[Any] = []
+        if after is not None:
+            sql += f" WHERE ({key}, order_id) {'<' if descending else '>'} (?, ?)"
+            params.extend(after)
+        sql += f" ORDER BY {key} {direction}, order_id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def overdue(self, now: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Only outstanding orders are in this table, so late ones are a range of idx_orders_due_at
+        sql = "SELECT * FROM orders WHERE due_at <= ? ORDER BY due_at, order_id"
+        params: List[Any] = [now]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+    def count_outstanding(self) -> int:
+        placeholders = ', '.join('?' * len(OUTSTANDING_STATUSES))
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT COUNT(*) FROM orders WHERE status IN ({placeholders})",
+                OUTSTANDING_STATUSES).fetchone()[0]
+
+    def find_by_customer(self, name_prefix: str) -> List[Dict[str, Any]]:
+        # LIKE is case-insensitive and can use the NOCASE name index for a prefix range
+        pattern = name_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM orders WHERE name LIKE ? ESCAPE '\\' ORDER BY order_id",
+                (pattern,)).fetchall()
+        return [self._row_to_order(row) for row in rows]
+
+
+def _empty_orders() -> Dict[str, Any]:
+    return {
+        "next_order_id": 1,
+        "seq": 0,
+        "orders": {},
+        "status_index": {status: [] for status in OUTSTANDING_STATUSES},
+        "archive_segments": []
+    }
+
+
+def _new_order(order_id: int, name: str, order_details: str, estimated_wait_time: str,
+               status: str = "RECEIVED", now: Optional[str] = None) -> Dict[str, Any]:
+    now = now or datetime.now().isoformat()
+    return {
+        "order_id": order_id,
+        "name": name,
+        "order_details": order_details,
+        "estimated_wait_time": estimated_wait_time,
+        **_eta_fields(estimated_wait_time, now),
+        "status": status,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def parse_wait_minutes(text: Optional[str]) -> Optional[int]:
+    """Parse free-text wait times like "15 minutes" or "1h 30m" into minutes.
+
+    Ranges such as "20-25 minutes" count as their upper bound. Only numbers
+    followed by a time unit are counted, unless the whole text is a number
+    (taken as minutes). Returns None for anything else, e.g. "ready by 7:30".
+    """
+    if not text:
+        return None
+    bare = WAIT_TIME_BARE.fullmatch(text)
+    if bare:
+        return round(float(bare.group(2) or bare.group(1)))
+    parts = WAIT_TIME_PART.findall(text)
+    if not parts:
+        return None
+    return round(sum(float(high or low) * (60 if unit.lower().startswith('h') else 1)
+                     for low, high, unit in parts))
+
+
+def _eta_fields(estimated_wait_time: Optional[str], created_at: str) -> Dict[str, Any]:
+    """Structured ETA for an order: parsed minutes and the due_at timestamp."""
+    eta_minutes = parse_wait_minutes(estimated_wait_time)
+    due_at = None
+    if eta_minutes is not None:
+        due = datetime.fromisoformat(created_at) + timedelta(minutes=eta_minutes)
+        due_at = due.isoformat(timespec='seconds')
+    return {"eta_minutes": eta_minutes, "due_at": due_at}
+
+
+def _sort_key(order: Dict[str, Any], sort_by: str) -> Tuple[Any, int]:
+    if sort_by == "status":
+        return (STATUS_RANK[order['status']], order['order_id'])
+    return (order['created_at'], order['order_id'])
+
 
+def _encode_cursor(order: Dict[str, Any], sort_by: str, descending: bool) -> str:
+    payload = [sort_by, descending, *_sort_key(order, sort_by)]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
 
-def save_orders(orders: Dict[str, Any]):
-    with open(ORDERS_FILE, 'w') as f:
-        json.dump(orders, f, indent=4)
+
+def _decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Any, int]:
+    """Return the (sort key, order_id) position encoded in a list_orders cursor."""
+    try:
+        cursor_sort, cursor_descending, key, order_id = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort_by or cursor_descending != descending:
+        raise ValueError("Cursor was created with a different sort_by or descending value")
+    return key, order_id
+
+
+def _change(order: Dict[str, Any], old_status: Optional[str]) -> Dict[str, Any]:
+    """Describe one order change for the change feed (the store adds its seq)."""
+    return {
+        "order_id": order['order_id'],
+        "old_status": old_status,
+        "status": order['status'],
+        "changed_at": order['updated_at'],
+        "order": dict(order)
+    }
+
+
+def create_store(storage: str = "json", db_path: str = ORDERS_DB,
+                 orders_file: str = ORDERS_FILE, archive_dir: str = ARCHIVE_DIR) -> OrderStore:
+    """Build the storage backend named by `storage` ("json" or "sqlite")."""
+    if storage == "json":
+        return JsonOrderStore(orders_file, archive_dir)
+    elif storage == "sqlite":
+        return SqliteOrderStore(db_path, json_path=orders_file, archive_dir=archive_dir)
+    raise ValueError(f"Invalid storage backend '{storage}'. Must be 'json' or 'sqlite'.")
+
+
+STORE: OrderStore = JsonOrderStore(ORDERS_FILE)
 
 @mcp.tool
-def save_order(name: str, order_details: str, estimated_wait_time: str) -> int:
+def save_order(name: str, order_details: str, estimated_wait_time: str, status: str = "RECEIVED") -> int:
     """Saves a customer's order and returns the new order_id.
 
     Args:
         name: Customer name
         order_details: Details of what was ordered
         estimated_wait_time: How long the order will take
+        status: Initial status (RECEIVED, COOKING or READY, default: RECEIVED).
+            Pass the final status directly instead of calling set_order_status afterwards.
 
     Returns:
         The auto-incremented order_id
     """
-    orders_data = load_orders()
-    order_id = orders_data['next_order_id']
-    orders_data['next_order_id'] += 1
+    if status not in OUTSTANDING_STATUSES:
+        print(f"[ORDERS] ❌ Invalid initial status '{status}'")
+        raise ValueError(f"Invalid initial status '{status}'. Must be one of {OUTSTANDING_STATUSES}.")
 
-    new_order = {
-        "order_id": order_id,
-        "name": name,
-        "order_details": order_details,
-        "estimated_wait_time": estimated_wait_time,
-        "status": "RECEIVED",
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
-    orders_data['orders'][str(order_id)] = new_order
-    save_orders(orders_data)
+    new_order = STORE.create_order(name, order_details, estimated_wait_time, status)
+    order_id = new_order['order_id']
 
-    print(f"[ORDERS] ✅ Created order #{order_id} for {name} - Status: RECEIVED")
+    print(f"[ORDERS] ✅ Created order #{order_id} for {name} - Status: {status}")
     print(f"[ORDERS]    Details: {order_details}")
     print(f"[ORDERS]    Est. wait: {estimated_wait_time}")
 
     return order_id
 
 @mcp.tool
-def list_orders() -> List[Dict[str, Any]]:
-    """Returns a list of all outstanding (not SERVED) orders.
+def save_orders(orders: List[Dict[str, str]], status: str = "RECEIVED") -> Dict[str, Any]:
+    """Saves several orders (e.g. a whole table) in one call with a single write.
+
+    Args:
+        orders: List of orders, each with name, order_details and estimated_wait_time.
+            An order may also carry its own "status" to override the default.
+        status: Initial status for every order (RECEIVED, COOKING or READY, default: RECEIVED)
+
+    Returns:
+        The new order_ids in the same order as the input, or an error message.
+        Nothing is saved if any order is invalid.
+    """
+    new_orders = []
+    for i, order in enumerate(orders):
+        missing = [key for key in ("name", "order_details", "estimated_wait_time") if not order.get(key)]
+        order_status = order.get("status", status)
+        if missing:
+            print(f"[ORDERS] ❌ Order {i} is missing {missing}")
+            return {"success": False, "message": f"Order {i} is missing {', '.join(missing)}."}
+        if order_status not in OUTSTANDING_STATUSES:
+            print(f"[ORDERS] ❌ Invalid initial status '{order_status}'")
+            return {
+                "success": False,
+                "message": f"Order {i} has invalid status '{order_status}'. Must be one of {OUTSTANDING_STATUSES}."
+            }
+        new_orders.append({**order, "status": order_status})
+
+    created = STORE.create_orders(new_orders)
+
+    print(f"[ORDERS] ✅ Created {len(created)} orders in one batch")
+    for order in created:
+        print(f"[ORDERS]   #{order['order_id']}: {order['name']} - {order['order_details']} ({order['status']})")
+
+    return {
+        "success": True,
+        "order_ids": [order['order_id'] for order in created],
+        "count": len(created)
+    }
+
+@mcp.tool
+def list_orders(limit: Optional[int] = None, cursor: Optional[str] = None,
+                fields: Optional[List[str]] = None, sort_by: str = "created_at",
+                descending: bool = False) -> Dict[str, Any]:
+    """Returns outstanding (not SERVED) orders, optionally one page at a time.
+
+    Args:
+        limit: Maximum number of orders to return (default: all)
+        cursor: The next_cursor from a previous call, to fetch the following page
+        fields: Only include these order fields, e.g. ["order_id", "name", "status"]
+            (order_id is always included). Default: all fields
+        sort_by: "created_at" (default) or "status" (RECEIVED, COOKING, READY)
+        descending: Sort newest / most advanced first (default: False)
 
     Returns:
-        List of orders that are RECEIVED, COOKING, or READY
+        Orders that are RECEIVED, COOKING, or READY, the total outstanding count,
+        next_cursor (None on the last page) and the change feed seq for watch_orders
     """
-    orders_data = load_orders()
-    outstanding_orders = [
-        order for order in orders_data['orders'].values()
-        if order['status'] != 'SERVED'
-    ]
-
-    print(f"[ORDERS] Found {len(outstanding_orders)} outstanding orders")
-    for order in outstanding_orders:
+    if sort_by not in SORT_KEYS:
+        print(f"[ORDERS] ❌ Invalid sort_by '{sort_by}'")
+        return {"success": False, "message": f"Invalid sort_by '{sort_by}'. Must be one of {SORT_KEYS}."}
+    unknown = [field for field in fields or [] if field not in ORDER_FIELDS]
+    if unknown:
+        print(f"[ORDERS] ❌ Unknown fields {unknown}")
+        return {"success": False, "message": f"Unknown fields {unknown}. Must be from {ORDER_FIELDS}."}
+    if limit is not None and limit < 1:
+        return {"success": False, "message": "limit must be at least 1."}
+    try:
+        after = _decode_cursor(cursor, sort_by, descending) if cursor else None
+    except ValueError as e:
+        print(f"[ORDERS] ❌ {e}")
+        return {"success": False, "message": str(e)}
+
+    seq = STORE.current_seq()
+    # Fetch one extra row to learn whether another page follows
+    page = STORE.list_outstanding(sort_by, descending, after, limit + 1 if limit else None)
+    next_cursor = None
+    if limit is not None and len(page) > limit:
+        page = page[:limit]
+        next_cursor = _encode_cursor(page[-1], sort_by, descending)
+
+    print(f"[ORDERS] Found {len(page)} outstanding orders" + (" (more available)" if next_cursor else ""))
+    for order in page:
         print(f"[ORDERS]   #{order['order_id']}: {order['name']} - {order['status']}")
 
-    return outstanding_orders
+    if fields:
+        keep = ["order_id"] + [field for field in fields if field != "order_id"]
+        page = [{field: order.get(field) for field in keep} for order in page]
+
+    return {
+        "orders": page,
+        "count": len(page),
+        "total_outstanding": STORE.count_outstanding(),
+        "next_cursor": next_cursor,
+        "seq": seq
+    }
+
+@mcp.tool
+def overdue_orders(limit: Optional[int] = None) -> Dict[str, Any]:
+    """Returns outstanding orders that are past their estimated wait time, most late first.
+
+    Each order's due time is its creation time plus the parsed estimated_wait_time.
+
+    Args:
+        limit: Maximum number of late orders to return (default: all)
+
+    Returns:
+        Late orders with how many minutes late each one is
+    """
+    now = datetime.now()
+    late = STORE.overdue(now.isoformat(timespec='seconds'), limit)
+
+    orders = []
+    for order in late:
+        minutes_late = int((now - datetime.fromisoformat(order['due_at'])).total_seconds() // 60)
+        orders.append({
+            "order_id": order['order_id'],
+            "name": order['name'],
+            "order_details": order['order_details'],
+            "status": order['status'],
+            "due_at": order['due_at'],
+            "minutes_late": minutes_late
+        })
+        print(f"[ORDERS]   ⏰ #{order['order_id']}: {order['name']} - {order['status']}, {minutes_late} min late")
+
+    print(f"[ORDERS] Found {len(orders)} overdue orders")
+    return {
+        "orders": orders,
+        "count": len(orders),
+        "checked_at": now.isoformat(timespec='seconds')
+    }
+
+@mcp.tool
+def find_orders_by_customer(name: str) -> Dict[str, Any]:
+    """Finds a customer's outstanding (not SERVED) orders by name.
+
+    Matching is case-insensitive and by prefix, so "ali" finds "Alice".
+    Use this instead of list_orders() when a customer asks about their own order.
+
+    Args:
+        name: Customer name, or the start of it
+
+    Returns:
+        Dictionary with the matching orders and their count
+    """
+    matches = STORE.find_by_customer(name.strip())
+
+    print(f"[ORDERS] Found {len(matches)} outstanding orders for '{name}'")
+    for order in matches:
+        print(f"[ORDERS]   #{order['order_id']}: {order['name']} - {order['status']}")
+
+    return {
+        "orders": matches,
+        "count": len(matches),
+        "name": name
+    }
 
 @mcp.tool
 def set_order_status(order_id: int, status: str) -> str:
@@ -105,27 +1135,76 @@ def set_order_status(order_id: int, status: str) -> str:
     Returns:
         Success message or error message
     """
-    orders_data = load_orders()
-    order = orders_data['orders'].get(str(order_id))
+    if status not in VALID_STATUSES:
+        if STORE.get_order(order_id) is None:
+            print(f"[ORDERS] ❌ Order #{order_id} not found")
+            return f"Error: Order with ID {order_id} not found."
+        print(f"[ORDERS] ❌ Invalid status '{status}'")
+        return f"Error: Invalid status '{status}'. Must be one of {VALID_STATUSES}."
 
-    if not order:
+    try:
+        result = STORE.update_status(order_id, status)
+    except OrderArchivedError as e:
+        print(f"[ORDERS] ❌ {e}")
+        return f"Error: {e}"
+    if result is None:
         print(f"[ORDERS] ❌ Order #{order_id} not found")
         return f"Error: Order with ID {order_id} not found."
 
-    valid_statuses = ["RECEIVED", "COOKING", "READY", "SERVED"]
-    if status not in valid_statuses:
-        print(f"[ORDERS] ❌ Invalid status '{status}'")
-        return f"Error: Invalid status '{status}'. Must be one of {valid_statuses}."
-
-    old_status = order['status']
-    order['status'] = status
-    order['updated_at'] = datetime.now().isoformat()
-    save_orders(orders_data)
-
+    old_status, order = result
     print(f"[ORDERS] ✅ Order #{order_id} ({order['name']}) status: {old_status} → {status}")
 
     return f"Order {order_id} status updated to {status}"
 
+@mcp.tool
+def set_order_statuses(updates: List[Tuple[int, str]]) -> Dict[str, Any]:
+    """Sets the status of several orders in one call with a single write.
+
+    Useful for moving a whole table to READY or marking many orders SERVED.
+
+    Args:
+        updates: List of [order_id, status] pairs. Valid statuses are RECEIVED, COOKING, READY, SERVED.
+
+    Returns:
+        One result per update (in input order) and the number of orders updated
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(updates)
+    valid = []
+    for i, (order_id, status) in enumerate(updates):
+        if status in VALID_STATUSES:
+            valid.append(i)
+        else:
+            print(f"[ORDERS] ❌ Invalid status '{status}' for order #{order_id}")
+            results[i] = {
+                "order_id": order_id,
+                "success": False,
+                "message": f"Invalid status '{status}'. Must be one of {VALID_STATUSES}."
+            }
+
+    outcomes = STORE.update_statuses([updates[i] for i in valid])
+    for i, outcome in zip(valid, outcomes):
+        order_id, status = updates[i]
+        if outcome is None:
+            print(f"[ORDERS] ❌ Order #{order_id} not found")
+            results[i] = {"order_id": order_id, "success": False,
+                          "message": f"Order with ID {order_id} not found."}
+        elif isinstance(outcome, OrderArchivedError):
+            print(f"[ORDERS] ❌ {outcome}")
+            results[i] = {"order_id": order_id, "success": False, "message": str(outcome)}
+        else:
+            old_status, order = outcome
+            print(f"[ORDERS] ✅ Order #{order_id} ({order['name']}) status: {old_status} → {status}")
+            results[i] = {"order_id": order_id, "success": True, "status": status,
+                          "message": f"Order {order_id} status updated to {status}"}
+
+    updated = sum(1 for result in results if result["success"])
+    print(f"[ORDERS] Updated {updated}/{len(updates)} orders in one batch")
+    return {
+        "results": results,
+        "updated": updated,
+        "failed": len(updates) - updated
+    }
+
 @mcp.tool
 def get_order_status(order_id: int) -> str:
     """Gets the status for a given order_id.
@@ -136,8 +1215,7 @@ def get_order_status(order_id: int) -> str:
     Returns:
         The order status or an error message
     """
-    orders_data = load_orders()
-    order = orders_data['orders'].get(str(order_id))
+    order = STORE.get_order(order_id)
 
     if not order:
         print(f"[ORDERS] ❌ Order #{order_id} not found")
@@ -146,7 +1224,47 @@ def get_order_status(order_id: int) -> str:
     print(f"[ORDERS] Order #{order_id} ({order['name']}): {order['status']}")
     return order['status']
 
-def main(transport="stdio", host="0.0.0.0", port=8004):
+@mcp.tool
+async def watch_orders(since_seq: int = 0, timeout: float = 30.0) -> Dict[str, Any]:
+    """Waits for order changes after since_seq and returns only those changes.
+
+    Blocks until at least one order is created or changes status, or until the
+    timeout passes. Pass the returned "seq" as since_seq on the next call to
+    follow the feed without re-reading list_orders().
+
+    Args:
+        since_seq: Sequence number of the last change already seen (default: 0)
+        timeout: Maximum seconds to wait for a change (default: 30, max: 60)
+
+    Returns:
+        Changes with seq > since_seq (each with order_id, old_status, status and the order),
+        the latest seq, and "truncated" if older changes were dropped and list_orders() should be re-read
+    """
+    deadline = time.monotonic() + min(max(timeout, 0), WATCH_MAX_TIMEOUT)
+    while STORE.current_seq() <= since_seq and time.monotonic() < deadline:
+        await asyncio.sleep(WATCH_POLL_INTERVAL)
+
+    changes, truncated = STORE.changes_since(since_seq)
+    seq = changes[-1]['seq'] if changes else STORE.current_seq()
+
+    print(f"[ORDERS] Watch since #{since_seq}: {len(changes)} changes (seq {seq})")
+    return {
+        "changes": changes,
+        "count": len(changes),
+        "seq": seq,
+        "truncated": truncated
+    }
+
+def main(transport="stdio", host="0.0.0.0", port=8004, storage="json", db_path=ORDERS_DB):
+    """Run the orders MCP server.
+
+    Args:
+        storage: Storage backend, "json" (orders.json) or "sqlite"
+        db_path: SQLite database path when storage="sqlite"
+    """
+    global STORE
+    STORE = create_store(storage, db_path)
+
     if transport in ["sse", "streamable-http"]:
         mcp.run(transport=transport, host=host, port=port)
     elif transport == "stdio":
@@ -156,4 +1274,4 @@ def main(transport="stdio", host="0.0.0.0", port=8004):
 
 
 if __name__ == "__main__":
-    fire.Fire(main)
\ No newline at end of file
+    fire.Fire(main)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Pantry MCP connection shared by the chef and supplier agents.
+
+Both agents prefer the shared pantry service (make pantry) so every agent
+sees one inventory, and fall back to spawning their own stdio pantry server
+when nothing is listening at PANTRY_MCP_URL.
+"""
+
+import os
+import socket
+from urllib.parse import urlparse
+
+DEFAULT_PANTRY_URL = "http://localhost:8725/mcp"
+
+# Where pantry_mcp_server.py is when an agent runs from the root (webapp) or its own directory (a2a_server)
+PANTRY_SERVER_PATHS = [
+    "pantry_mcp_server.py",
+    "../pantry_mcp_server.py",
+]
+
+
+def pantry_service_available(url: str) -> bool:
+    """Check whether the shared pantry MCP service is listening at url."""
+    parsed = urlparse(url)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port or 80), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def connect_pantry(agent_name: str):
+    """Connect an agent to the pantry: the shared service if it is up, otherwise a stdio server.
+
+    Args:
+        agent_name: Log prefix of the agent, e.g. "CHEF"
+
+    Returns:
+        The pantry McpToolset, or None if the pantry could not be reached
+    """
+    from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset as McpToolset
+    from google.adk.tools.mcp_tool.mcp_session_manager import (
+        StdioConnectionParams, StdioServerParameters, StreamableHTTPConnectionParams)
+
+    pantry_url = os.environ.get("PANTRY_MCP_URL", DEFAULT_PANTRY_URL)
+    if pantry_service_available(pantry_url):
+        print(f"[{agent_name}] ✅ Connected to shared pantry MCP service at {pantry_url}")
+        return McpToolset(connection_params=StreamableHTTPConnectionParams(url=pantry_url))
+
+    pantry_path = next((os.path.abspath(path) for path in PANTRY_SERVER_PATHS if os.path.exists(path)), None)
+    if pantry_path is None:
+        print(f"[{agent_name}] ⚠️  Could not find pantry_mcp_server.py in any of: {PANTRY_SERVER_PATHS}")
+        return None
+    try:
+        toolset = McpToolset(
+                connection_params=StdioConnectionParams(
+                    server_params=StdioServerParameters(
+                        command="uv",
+                        args=["run", pantry_path]
+                )
+            )
+        )
+    except Exception as e:
+        print(f"[{agent_name}] ⚠️  Could not connect to pantry MCP: {e}")
+        return None
+    print(f"[{agent_name}] ✅ Connected to pantry MCP server (using {pantry_path}, no shared service at {pantry_url})")
+    return toolset
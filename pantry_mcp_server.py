@@ -4,6 +4,7 @@
 # dependencies = [
 #     "fastmcp",
 #     "fire",
+#     "numpy",
 # ]
 # ///
 """Pantry MCP Server - Manages ingredient inventory using Food IDs.
@@ -14,20 +15,112 @@ Both the chef and supplier agents use this to check and update inventory.
 """
 
 from fastmcp import FastMCP
+import atexit
+import bisect
 import fire
+import fcntl
+import heapq
 import json
 import os
-from typing import Dict, List
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 mcp = FastMCP()
 
 # File paths
 PANTRY_FILE = "pantry.json"
+PANTRY_VERSIONS_FILE = "pantry.versions.json"
+PANTRY_JOURNAL = "pantry.journal.jsonl"
+PANTRY_LOCK_FILE = "pantry.json.lock"
+PANTRY_SERVICE_LOCK = "pantry.service.lock"
 FOOD_FILE = "food.json"
+REORDER_FILE = "reorder_points.json"
+RECIPE_BOM_FILE = "recipe_bom.json"
+
+# Durability window: mutations are acknowledged from memory and group-committed
+# to disk at most this many seconds later (0 = write through on every call)
+FLUSH_INTERVAL = 0.5
+
+# How long a reservation holds stock before it is released automatically
+RESERVATION_TTL = 300
+
+# Compare-and-swap attempts before a take gives up on a contended item
+CAS_MAX_RETRIES = 5
 
-# Global data
-PANTRY_INVENTORY: Dict[str, float] = {}  # food_id -> quantity
+# True when this process is the shared pantry service and no other pantry process
+# can write: takes then wait for the next group commit like restocks do
+SOLE_WRITER = False
+_SERVICE_LOCK_FD = None
+
+# Highest food ID accepted. The arrays grow with the number of distinct foods, not the largest ID
+MAX_FOOD_ID = 1_000_000
+
+# Global data: dense arrays with one slot per food ID seen, assigned by _food_id_vector()
+# in first-seen order and grown geometrically by _ensure_capacity()
+_FOOD_SLOTS: Dict[int, int] = {}  # food_id -> slot in the arrays
+SLOT_FOOD_IDS = np.zeros(0, dtype=np.int64)  # slot -> food_id
+QUANTITIES = np.zeros(0, dtype=np.float64)  # quantity on hand (0 for items not in the pantry)
+IN_PANTRY = np.zeros(0, dtype=bool)  # whether the pantry has an entry for the food
+VERSIONS = np.zeros(0, dtype=np.int64)  # bumped on every change to the item
 FOOD_DATABASE: Dict[str, Dict] = {}  # food_id -> {id, name}
+FOOD_NAME_TABLE = np.empty(0, dtype=object)  # food_id -> interned name (None if unknown)
+
+# Reorder policy per food (reorder_points.json); foods without an entry use the default
+REORDER_POINTS: Dict[str, Dict] = {}  # food_id -> {reorder_point, reorder_quantity}
+DEFAULT_REORDER = {"reorder_point": 3, "reorder_quantity": 10}
+
+# Bill of materials for can_make: one row per recipe, one column per food used by any recipe
+RECIPE_BOM: Dict[str, Dict] = {}  # recipe_id -> {name, ingredients: {food_id: quantity}}
+_BOM_RECIPE_IDS: List[str] = []  # row order of _BOM_MATRIX
+_BOM_FOOD_IDS = np.zeros(0, dtype=np.int64)  # column order of _BOM_MATRIX
+_BOM_SLOTS = np.zeros(0, dtype=np.int64)  # array slot of each column's food
+_BOM_MATRIX = np.zeros((0, 0), dtype=np.float64)  # quantity of each food one serving needs (0 = unused)
+
+# Low-stock index: sorted (quantity - reorder_point, food_id) for every pantry item, kept
+# current on each quantity change so items at or below their reorder point are a prefix
+_REORDER_DISTANCES: List[Tuple[float, int]] = []
+_LOW_STOCK_LOCK = threading.Lock()
+
+# Food name search index, rebuilt by build_food_index()
+_FOOD_NAMES: List[Tuple[str, int]] = []  # sorted (lowercase name, food_id): prefix matches are one bisect
+_FOOD_NGRAMS: Dict[str, List[int]] = {}  # bigram/trigram -> ascending positions in _FOOD_NAMES
+
+# Write-behind state
+PENDING_DELTAS: Dict[str, float] = {}  # food_id -> net change not yet on disk
+_COMMITTED_INVENTORY: Dict[str, float] = {}  # pantry.json as last read or written
+_COMMITTED_VERSIONS: Dict[str, int] = {}  # pantry.versions.json as last read or written
+_PANTRY_SIGNATURE = None  # (mtime_ns, size, inode) of pantry.json when last read or written
+_FLUSH_TIMER = None
+_TIMER_LOCK = threading.Lock()
+
+# Locking: the commit lock (in-process + flock shared with other pantry processes)
+# covers reloads and commits; striped item locks (food_id % LOCK_STRIPES) cover
+# in-memory updates, so changes to different items rarely wait on each other.
+# Growing the arrays takes every stripe. Order: commit lock -> item locks -> reservations.
+LOCK_STRIPES = 64
+_COMMIT_LOCK = threading.RLock()
+_COMMIT_LOCK_FD = None
+_COMMIT_LOCK_DEPTH = 0
+_ITEM_LOCKS = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+# Reservations hold stock for a chef without removing it from on-hand inventory
+RESERVATIONS: Dict[str, Dict] = {}  # reservation_id -> {ingredients, food_ids, quantities, expires_at}
+RESERVED = np.zeros(0, dtype=np.float64)  # slot -> total quantity held by open reservations
+_RESERVATION_EXPIRY: List = []  # heap of (expires_at, reservation_id)
+_RESERVATION_LOCK = threading.Lock()
+
+
+class PantryConflictError(Exception):
+    """Raised when a compare-and-swap update keeps losing to concurrent writers."""
+
 
 def load_food_database() -> Dict[str, Dict]:
     """Load food database from JSON file."""
@@ -45,6 +138,37 @@ def load_food_database() -> Dict[str, Dict]:
         print(f"[PANTRY] ⚠️  No {FOOD_FILE} found!")
         return {}
 
+def load_reorder_points() -> Dict[str, Dict]:
+    """Load per-food reorder points and quantities from JSON file."""
+    global DEFAULT_REORDER
+    if not os.path.exists(REORDER_FILE):
+        print(f"[PANTRY] No {REORDER_FILE} found, every food reorders at {DEFAULT_REORDER['reorder_point']}")
+        return {}
+    try:
+        with open(REORDER_FILE, 'r') as f:
+            data = json.load(f)
+        DEFAULT_REORDER = {**DEFAULT_REORDER, **data.get("default", {})}
+        foods = data.get("foods", {})
+        print(f"[PANTRY] Loaded reorder points from {REORDER_FILE} ({len(foods)} foods)")
+        return foods
+    except Exception as e:
+        print(f"[PANTRY] ⚠️  Error loading {REORDER_FILE}: {e}, using default reorder points")
+        return {}
+
+def load_recipe_bom() -> Dict[str, Dict]:
+    """Load the recipe -> food ID bill of materials from JSON file."""
+    if not os.path.exists(RECIPE_BOM_FILE):
+        print(f"[PANTRY] No {RECIPE_BOM_FILE} found, can_make has no recipes")
+        return {}
+    try:
+        with open(RECIPE_BOM_FILE, 'r') as f:
+            recipes = json.load(f).get("recipes", {})
+        print(f"[PANTRY] Loaded bill of materials from {RECIPE_BOM_FILE} ({len(recipes)} recipes)")
+        return recipes
+    except Exception as e:
+        print(f"[PANTRY] ⚠️  Error loading {RECIPE_BOM_FILE}: {e}, can_make has no recipes")
+        return {}
+
 def load_pantry() -> Dict[str, float]:
     """Load pantry inventory from JSON file."""
     if os.path.exists(PANTRY_FILE):
@@ -60,54 +184,558 @@ def load_pantry() -> Dict[str, float]:
         print(f"[PANTRY] No {PANTRY_FILE} found, starting with empty inventory")
         return {}
 
+def load_versions() -> Dict[str, int]:
+    """Load per-item version counters (items without an entry are at version 0)."""
+    if not os.path.exists(PANTRY_VERSIONS_FILE):
+        return {}
+    try:
+        with open(PANTRY_VERSIONS_FILE, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[PANTRY] ⚠️  Error loading {PANTRY_VERSIONS_FILE}: {e}, treating all items as changed")
+        return {}
+
+def _write_json_atomic(path: str, data: Dict, indent: int = None) -> None:
+    """Replace a JSON file atomically (temp file + fsync + rename)."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".pantry-", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def save_pantry(inventory: Dict[str, float]) -> None:
-    """Save pantry inventory to JSON file."""
+    """Atomically replace the pantry file. Raises if it could not be written."""
     try:
-        with open(PANTRY_FILE, 'w') as f:
-            json.dump(inventory, f, indent=2)
+        _write_json_atomic(PANTRY_FILE, inventory, indent=2)
         print(f"[PANTRY] 💾 Saved inventory to {PANTRY_FILE}")
     except Exception as e:
         print(f"[PANTRY] ⚠️  Error saving to {PANTRY_FILE}: {e}")
+        raise
+
+def _pantry_signature():
+    try:
+        st = os.stat(PANTRY_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+@contextmanager
+def _commit_locked():
+    """Hold the in-process commit lock and an exclusive flock shared with other pantry processes."""
+    global _COMMIT_LOCK_FD, _COMMIT_LOCK_DEPTH
+    with _COMMIT_LOCK:
+        if _COMMIT_LOCK_DEPTH == 0:
+            if _COMMIT_LOCK_FD is None:
+                _COMMIT_LOCK_FD = os.open(PANTRY_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(_COMMIT_LOCK_FD, fcntl.LOCK_EX)
+        _COMMIT_LOCK_DEPTH += 1
+        try:
+            yield
+        finally:
+            _COMMIT_LOCK_DEPTH -= 1
+            if _COMMIT_LOCK_DEPTH == 0:
+                fcntl.flock(_COMMIT_LOCK_FD, fcntl.LOCK_UN)
+
+@contextmanager
+def _item_locks(food_ids):
+    """Lock the stripes of just the given items, always in the same order to avoid deadlocks."""
+    locks = [_ITEM_LOCKS[stripe] for stripe in sorted({food_id % LOCK_STRIPES for food_id in food_ids})]
+    for lock in locks:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+def _all_item_locks():
+    return _item_locks(range(LOCK_STRIPES))
+
+def _ensure_capacity(slots: int) -> None:
+    """Grow the pantry arrays, at least doubling them, to fit this many slots. Callers must hold every item lock."""
+    global SLOT_FOOD_IDS, QUANTITIES, IN_PANTRY, VERSIONS, RESERVED
+    size = len(QUANTITIES)
+    if slots <= size:
+        return
+    grow = max(slots, 2 * size) - size
+    SLOT_FOOD_IDS = np.concatenate([SLOT_FOOD_IDS, np.zeros(grow, dtype=np.int64)])
+    QUANTITIES = np.concatenate([QUANTITIES, np.zeros(grow, dtype=np.float64)])
+    IN_PANTRY = np.concatenate([IN_PANTRY, np.zeros(grow, dtype=bool)])
+    VERSIONS = np.concatenate([VERSIONS, np.zeros(grow, dtype=np.int64)])
+    RESERVED = np.concatenate([RESERVED, np.zeros(grow, dtype=np.float64)])
+
+def _food_id_vector(food_ids) -> np.ndarray:
+    """Parse food IDs (ints or numeric strings) and give any new ones a slot in the pantry arrays.
+
+    Callers must not hold item locks (a new ID may grow the arrays).
+
+    Raises:
+        ValueError: If an ID is not a whole number between 0 and MAX_FOOD_ID
+    """
+    ids = np.array([int(food_id) for food_id in food_ids], dtype=np.int64)
+    if len(ids) and (ids.min() < 0 or ids.max() > MAX_FOOD_ID):
+        raise ValueError(f"Food IDs must be between 0 and {MAX_FOOD_ID}")
+    new = [food_id for food_id in ids.tolist() if food_id not in _FOOD_SLOTS]
+    if new:
+        with _all_item_locks():
+            new = [food_id for food_id in dict.fromkeys(new) if food_id not in _FOOD_SLOTS]
+            _ensure_capacity(len(_FOOD_SLOTS) + len(new))
+            for food_id in new:
+                SLOT_FOOD_IDS[len(_FOOD_SLOTS)] = food_id
+                _FOOD_SLOTS[food_id] = len(_FOOD_SLOTS)
+    return ids
+
+def _slots(food_ids) -> np.ndarray:
+    """Array slots of food IDs that already went through _food_id_vector."""
+    return np.fromiter((_FOOD_SLOTS[food_id] for food_id in np.asarray(food_ids).tolist()),
+                       dtype=np.int64, count=len(food_ids))
+
+def _slots_by_food_id(mask: np.ndarray) -> np.ndarray:
+    """Slots where mask is set, in food ID order."""
+    slots = np.flatnonzero(mask)
+    return slots[np.argsort(SLOT_FOOD_IDS[slots], kind="stable")]
+
+def _ingredient_vector(ingredients: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn {food_id: quantity} into aligned (food IDs, quantities) vectors, in key order.
+
+    Raises:
+        ValueError: If an ID is invalid or repeated, or a quantity is not a number
+    """
+    ids = _food_id_vector(ingredients.keys())
+    if len(np.unique(ids)) != len(ids):
+        raise ValueError("Each food ID may only appear once")
+    quantities = np.array([float(quantity) for quantity in ingredients.values()], dtype=np.float64)
+    return ids, quantities
+
+def _numbers(values: np.ndarray) -> list:
+    """Convert an array to JSON-safe numbers, keeping whole quantities as ints."""
+    return [int(value) if value.is_integer() else value for value in np.asarray(values, dtype=np.float64).tolist()]
+
+def get_reorder_policy(food_id: int) -> Tuple[float, float]:
+    """Return (reorder_point, reorder_quantity) for a food."""
+    policy = REORDER_POINTS.get(str(food_id), {})
+    return (policy.get("reorder_point", DEFAULT_REORDER["reorder_point"]),
+            policy.get("reorder_quantity", DEFAULT_REORDER["reorder_quantity"]))
+
+def _track_quantity(food_id: int, old: Optional[float], new: Optional[float]) -> None:
+    """Move an item within the low-stock index when its quantity changes (None = not in pantry)."""
+    reorder_point = get_reorder_policy(food_id)[0]
+    with _LOW_STOCK_LOCK:
+        if old is not None:
+            entry = (old - reorder_point, food_id)
+            position = bisect.bisect_left(_REORDER_DISTANCES, entry)
+            if position < len(_REORDER_DISTANCES) and _REORDER_DISTANCES[position] == entry:
+                del _REORDER_DISTANCES[position]
+        if new is not None:
+            bisect.insort(_REORDER_DISTANCES, (new - reorder_point, food_id))
+
+def _replay_journal(inventory: Dict[str, float], versions: Dict[str, int]) -> int:
+    """Apply journal batches that were committed but not yet checkpointed into pantry.json.
+
+    Each batch records the resulting quantities and versions, so replaying it twice is harmless.
+    """
+    if not os.path.exists(PANTRY_JOURNAL):
+        return 0
+    batches = 0
+    with open(PANTRY_JOURNAL, 'r') as f:
+        for line in f:
+            try:
+                batch = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn final write; everything before it was fsynced
+            inventory.update(batch["quantities"])
+            versions.update(batch.get("versions", {}))
+            batches += 1
+    if batches:
+        print(f"[PANTRY] Replayed {batches} journal batches from {PANTRY_JOURNAL}")
+    return batches
+
+def _reload_pantry() -> None:
+    """Re-read the pantry from disk and re-apply this process's unflushed deltas.
+
+    Items another process changed get their version bumped, which makes any
+    in-flight compare-and-swap on them retry. Callers must hold _commit_locked().
+    """
+    global _COMMITTED_INVENTORY, _COMMITTED_VERSIONS, _PANTRY_SIGNATURE
+    _PANTRY_SIGNATURE = _pantry_signature()
+    inventory = load_pantry()
+    versions = load_versions()
+    _replay_journal(inventory, versions)
+    disk_slots = _slots(_food_id_vector(inventory.keys()))
+    disk_quantities = np.array(list(inventory.values()), dtype=np.float64)
+    recommitted = _slots(_food_id_vector(
+        food_id_str for food_id_str in set(versions) | set(_COMMITTED_VERSIONS)
+        if versions.get(food_id_str, 0) != _COMMITTED_VERSIONS.get(food_id_str, 0)))
+    with _all_item_locks():
+        quantities = np.zeros(len(QUANTITIES), dtype=np.float64)
+        in_pantry = np.zeros(len(QUANTITIES), dtype=bool)
+        quantities[disk_slots] = disk_quantities
+        in_pantry[disk_slots] = True
+        # Unflushed local deltas land on top of whatever is now on disk
+        if PENDING_DELTAS:
+            pending_slots = _slots([int(food_id_str) for food_id_str in PENDING_DELTAS])
+            quantities[pending_slots] += np.array(list(PENDING_DELTAS.values()), dtype=np.float64)
+            in_pantry[pending_slots] = True
+        changed = (in_pantry != IN_PANTRY) | (quantities != QUANTITIES)
+        changed[recommitted] = True
+        for slot in np.flatnonzero(changed).tolist():
+            _track_quantity(int(SLOT_FOOD_IDS[slot]),
+                            float(QUANTITIES[slot]) if IN_PANTRY[slot] else None,
+                            float(quantities[slot]) if in_pantry[slot] else None)
+        QUANTITIES[:] = quantities
+        IN_PANTRY[:] = in_pantry
+        VERSIONS[changed] += 1
+    _COMMITTED_INVENTORY = inventory
+    _COMMITTED_VERSIONS = versions
+
+def refresh_pantry() -> None:
+    """Reload the pantry only if another process changed pantry.json (mtime, size or inode)."""
+    if _pantry_signature() == _PANTRY_SIGNATURE:
+        return
+    with _commit_locked():
+        if _pantry_signature() != _PANTRY_SIGNATURE:
+            print(f"[PANTRY] {PANTRY_FILE} changed on disk, reloading")
+            _reload_pantry()
+
+def flush_pantry() -> int:
+    """Group-commit all pending deltas: one journal append and one checkpoint of pantry.json.
+
+    If the journal append or the checkpoint fails, both are rolled back, the
+    deltas stay pending for the next flush and the error is raised.
+
+    Returns:
+        Number of food items whose changes were written
+    """
+    global _COMMITTED_VERSIONS, _PANTRY_SIGNATURE, _FLUSH_TIMER
+    with _TIMER_LOCK:
+        _FLUSH_TIMER = None
+    with _commit_locked():
+        if not PENDING_DELTAS:
+            return 0
+        # Another process may have committed since we last read; deltas merge on top
+        if _pantry_signature() != _PANTRY_SIGNATURE:
+            _reload_pantry()
+        with _all_item_locks():
+            deltas = dict(PENDING_DELTAS)
+            PENDING_DELTAS.clear()
+        previous = {food_id_str: _COMMITTED_INVENTORY.get(food_id_str) for food_id_str in deltas}
+        versions = dict(_COMMITTED_VERSIONS)
+        for food_id_str, delta in deltas.items():
+            _COMMITTED_INVENTORY[food_id_str] = _COMMITTED_INVENTORY.get(food_id_str, 0) + delta
+            versions[food_id_str] = versions.get(food_id_str, 0) + 1
+        batch = {
+            "committed_at": datetime.now().isoformat(),
+            "deltas": deltas,
+            "quantities": {food_id_str: _COMMITTED_INVENTORY[food_id_str] for food_id_str in deltas},
+            "versions": {food_id_str: versions[food_id_str] for food_id_str in deltas},
+        }
+        journal_size = os.path.getsize(PANTRY_JOURNAL) if os.path.exists(PANTRY_JOURNAL) else 0
+        try:
+            with open(PANTRY_JOURNAL, 'a') as f:
+                f.write(json.dumps(batch) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            save_pantry(_COMMITTED_INVENTORY)
+        except Exception:
+            # Undo the batch so no reader replays it, and retry the deltas on the next flush
+            if os.path.exists(PANTRY_JOURNAL):
+                os.truncate(PANTRY_JOURNAL, journal_size)
+            for food_id_str, quantity in previous.items():
+                if quantity is None:
+                    _COMMITTED_INVENTORY.pop(food_id_str, None)
+                else:
+                    _COMMITTED_INVENTORY[food_id_str] = quantity
+            with _all_item_locks():
+                for food_id_str, delta in deltas.items():
+                    PENDING_DELTAS[food_id_str] = PENDING_DELTAS.get(food_id_str, 0) + delta
+            if FLUSH_INTERVAL > 0:
+                _schedule_flush()
+            raise
+        _PANTRY_SIGNATURE = _pantry_signature()
+        _COMMITTED_VERSIONS = versions
+        # pantry.json now holds the batch; until the versions are written too the
+        # journal keeps it, and replaying it restores them
+        try:
+            _write_json_atomic(PANTRY_VERSIONS_FILE, versions)
+            os.truncate(PANTRY_JOURNAL, 0)
+        except Exception as e:
+            print(f"[PANTRY] ⚠️  Error saving {PANTRY_VERSIONS_FILE}: {e}, keeping the journal")
+    print(f"[PANTRY] ✅ Group commit of {len(deltas)} item changes")
+    return len(deltas)
+
+def _apply_deltas(food_ids: np.ndarray, deltas: np.ndarray) -> None:
+    """Apply changes in memory and journal them for the next group commit.
+
+    Callers must hold the item locks for every food ID in food_ids.
+    """
+    slots = _slots(food_ids)
+    old = QUANTITIES[slots]
+    was_in_pantry = IN_PANTRY[slots]
+    QUANTITIES[slots] = old + deltas
+    IN_PANTRY[slots] = True
+    VERSIONS[slots] += 1
+    for food_id, before, existed, after, delta in zip(
+            food_ids.tolist(), old.tolist(), was_in_pantry.tolist(),
+            (old + deltas).tolist(), _numbers(deltas)):
+        _track_quantity(food_id, before if existed else None, after)
+        PENDING_DELTAS[str(food_id)] = PENDING_DELTAS.get(str(food_id), 0) + delta
+
+def _schedule_flush() -> None:
+    """Make sure pending deltas are committed within the durability window."""
+    global _FLUSH_TIMER
+    if FLUSH_INTERVAL <= 0:
+        flush_pantry()
+        return
+    with _TIMER_LOCK:
+        if _FLUSH_TIMER is None:
+            _FLUSH_TIMER = threading.Timer(FLUSH_INTERVAL, flush_pantry)
+            _FLUSH_TIMER.daemon = True
+            _FLUSH_TIMER.start()
+
+def _claim_pantry(exclusive: bool) -> bool:
+    """Register this process as a pantry writer for its lifetime.
+
+    The shared pantry service claims the pantry exclusively, stdio servers share it.
+
+    Returns:
+        False if the claim conflicts with a running service or stdio server
+    """
+    global _SERVICE_LOCK_FD
+    fd = os.open(PANTRY_SERVICE_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    _SERVICE_LOCK_FD = fd
+    return True
 
 def get_food_name(food_id: int) -> str:
     """Get food name from food ID."""
-    food_data = FOOD_DATABASE.get(str(food_id))
-    if food_data:
-        return food_data.get("name", f"Unknown({food_id})")
+    if 0 <= food_id < len(FOOD_NAME_TABLE) and FOOD_NAME_TABLE[food_id] is not None:
+        return FOOD_NAME_TABLE[food_id]
     return f"Unknown({food_id})"
 
+def _ngrams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def build_food_index(foods: Dict[str, Dict]) -> None:
+    """Index food names: an ID -> interned name table for lookups, and for list_foods
+    a sorted name list plus bigram and trigram posting lists."""
+    global FOOD_NAME_TABLE, _FOOD_NAMES, _FOOD_NGRAMS
+    table = np.empty(max((food_data.get("id", 0) for food_data in foods.values()), default=0) + 1, dtype=object)
+    for food_data in foods.values():
+        if "name" in food_data:
+            table[food_data["id"]] = sys.intern(food_data["name"])
+    names = sorted((food_data.get("name", "").lower(), food_data.get("id")) for food_data in foods.values())
+    ngrams: Dict[str, List[int]] = {}
+    for position, (name, _) in enumerate(names):
+        for gram in _ngrams(name, 2) | _ngrams(name, 3):
+            ngrams.setdefault(gram, []).append(position)
+    FOOD_NAME_TABLE, _FOOD_NAMES, _FOOD_NGRAMS = table, names, ngrams
+
+def search_food_index(search: str, limit: Optional[int] = None) -> Tuple[List[int], int]:
+    """Find foods whose name contains search, ranked exact, then prefix, then substring.
+
+    Within each rank names are alphabetical. Prefix matches are a bisect range of the
+    sorted names; substring matches are verified against the shortest posting list
+    of the query's trigrams (its bigram for 2 characters; 1 character scans every name).
+
+    Returns:
+        Up to limit matching food IDs, and the total number of matches
+    """
+    query = search.lower()
+    start = bisect.bisect_left(_FOOD_NAMES, (query,))
+    end = bisect.bisect_left(_FOOD_NAMES, (query + "\U0010ffff",), start)
+
+    grams = _ngrams(query, min(len(query), 3))
+    if len(query) >= 2:
+        candidates = min((_FOOD_NGRAMS.get(gram, []) for gram in grams), key=len)
+    else:
+        candidates = range(len(_FOOD_NAMES))
+    substring = [position for position in candidates
+                 if not start <= position < end and query in _FOOD_NAMES[position][0]]
+
+    total = (end - start) + len(substring)
+    # An exact match sorts before every longer name with the same prefix
+    ranked = range(start, end) if limit is None else range(start, min(end, start + limit))
+    food_ids = [_FOOD_NAMES[position][1] for position in ranked]
+    remaining = None if limit is None else limit - len(food_ids)
+    food_ids += [_FOOD_NAMES[position][1] for position in substring[:remaining]]
+    return food_ids, total
+
+def build_bom_matrix(recipes: Dict[str, Dict]) -> None:
+    """Lay the bill of materials out as a dense recipes x foods matrix for can_make."""
+    global _BOM_RECIPE_IDS, _BOM_FOOD_IDS, _BOM_SLOTS, _BOM_MATRIX
+    recipe_ids = [recipe_id for recipe_id, recipe in recipes.items() if recipe.get("ingredients")]
+    food_ids = _food_id_vector(sorted({int(food_id) for recipe_id in recipe_ids
+                                       for food_id in recipes[recipe_id]["ingredients"]}))
+    column = {food_id: position for position, food_id in enumerate(food_ids.tolist())}
+    matrix = np.zeros((len(recipe_ids), len(food_ids)), dtype=np.float64)
+    for row, recipe_id in enumerate(recipe_ids):
+        for food_id, quantity in recipes[recipe_id]["ingredients"].items():
+            matrix[row, column[int(food_id)]] = quantity
+    _BOM_RECIPE_IDS, _BOM_FOOD_IDS, _BOM_SLOTS, _BOM_MATRIX = recipe_ids, food_ids, _slots(food_ids), matrix
+
+def _hold_reserved(food_ids: np.ndarray, quantities: np.ndarray, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) reserved quantities. Callers must hold the item locks."""
+    slots = _slots(food_ids)
+    RESERVED[slots] = np.maximum(RESERVED[slots] + sign * quantities, 0)
+    VERSIONS[slots] += 1
+
+def _drop_reservation(reservation_id: str) -> Optional[Dict]:
+    """Remove a reservation and return its held stock to the free pool."""
+    with _RESERVATION_LOCK:
+        reservation = RESERVATIONS.pop(reservation_id, None)
+    if reservation is None:
+        return None
+    with _item_locks(reservation["food_ids"]):
+        _hold_reserved(reservation["food_ids"], reservation["quantities"], -1)
+    return reservation
+
+def _expire_reservations() -> None:
+    """Release reservations whose TTL has passed."""
+    now = time.time()
+    expired = []
+    with _RESERVATION_LOCK:
+        while _RESERVATION_EXPIRY and _RESERVATION_EXPIRY[0][0] <= now:
+            _, reservation_id = heapq.heappop(_RESERVATION_EXPIRY)
+            if reservation_id in RESERVATIONS:
+                expired.append(reservation_id)
+    for reservation_id in expired:
+        if _drop_reservation(reservation_id):
+            print(f"[PANTRY] ⌛ Reservation {reservation_id} expired, stock released")
+
+def _find_missing(food_ids: np.ndarray, quantities: np.ndarray, held=0) -> List[Dict]:
+    """List ingredients whose free quantity (plus anything already held for the caller) falls short.
+
+    Free quantity is on-hand stock not held by a reservation.
+    """
+    slots = _slots(food_ids)
+    available = QUANTITIES[slots] - RESERVED[slots] + held
+    short = available < quantities
+    return [
+        {
+            "food_id": food_id,
+            "name": get_food_name(food_id),
+            "needed": needed,
+            "available": have,
+            "shortage": shortage
+        }
+        for food_id, needed, have, shortage in zip(
+            food_ids[short].tolist(), _numbers(quantities[short]),
+            _numbers(available[short]), _numbers(quantities[short] - available[short]))
+    ]
+
+def _consume(food_ids: np.ndarray, quantities: np.ndarray, reservation_id: str = None) -> None:
+    """Take stock (and the reservation holding it) in memory. Callers must hold the item locks."""
+    if reservation_id:
+        with _RESERVATION_LOCK:
+            reservation = RESERVATIONS.pop(reservation_id)
+        _hold_reserved(reservation["food_ids"], reservation["quantities"], -1)
+    _apply_deltas(food_ids, -quantities)
+
+def _take_with_cas(food_ids: np.ndarray, quantities: np.ndarray, reservation_id: str = None) -> List[Dict]:
+    """Take ingredients, checking availability and applying the take atomically per item.
+
+    When this process is the sole writer, the check and the take happen together
+    under the items' lock stripes only and the durable write is left to the next
+    group commit, so takes of different items never wait on each other or on disk.
+
+    Otherwise other pantry processes may take the same stock: availability is
+    checked under the item locks, then the take commits under the commit lock
+    (which serializes it with every other take and commit, across processes) only
+    if none of its items' versions changed since, and is retried from fresh state
+    otherwise. It is written to disk before returning so the other processes
+    never hand out the same stock.
+
+    Args:
+        food_ids: Food IDs to take (from _ingredient_vector)
+        quantities: Quantity of each food to take
+        reservation_id: Reservation holding exactly these quantities, which this take consumes
+
+    Returns:
+        Empty list once taken, or the missing ingredients (nothing is taken)
+
+    Raises:
+        KeyError: If reservation_id is not (or no longer) an open reservation
+        PantryConflictError: If the items kept changing for CAS_MAX_RETRIES attempts
+    """
+    for attempt in range(CAS_MAX_RETRIES):
+        refresh_pantry()
+        _expire_reservations()
+        with _item_locks(food_ids):
+            held = RESERVATIONS[reservation_id]["quantities"] if reservation_id else 0
+            seen = VERSIONS[_slots(food_ids)]
+            missing = _find_missing(food_ids, quantities, held)
+            if SOLE_WRITER and not missing:
+                _consume(food_ids, quantities, reservation_id)
+        if missing:
+            return missing
+        if SOLE_WRITER:
+            _schedule_flush()
+            return []
+
+        with _commit_locked():
+            refresh_pantry()
+            with _item_locks(food_ids):
+                swapped = np.array_equal(VERSIONS[_slots(food_ids)], seen)
+                if swapped:
+                    _consume(food_ids, quantities, reservation_id)
+            if swapped:
+                flush_pantry()
+                return []
+        print(f"[PANTRY] 🔁 Items changed during take, retrying ({attempt + 1}/{CAS_MAX_RETRIES})")
+    raise PantryConflictError(f"Pantry items kept changing after {CAS_MAX_RETRIES} attempts")
+
 # Load data at startup
 FOOD_DATABASE = load_food_database()
-PANTRY_INVENTORY = load_pantry()
+build_food_index(FOOD_DATABASE)
+REORDER_POINTS = load_reorder_points()
+RECIPE_BOM = load_recipe_bom()
+build_bom_matrix(RECIPE_BOM)
+with _commit_locked():
+    _reload_pantry()
+atexit.register(flush_pantry)
 
 @mcp.tool
-def list_foods(search: str = None) -> dict:
+def list_foods(search: str = None, limit: int = None) -> dict:
     """List all available foods in the database, optionally filtered by search term.
 
     Args:
-        search: Optional search term to filter food names (case-insensitive)
+        search: Optional search term to filter food names (case-insensitive).
+            Matches are ranked: exact name first, then names starting with the
+            term, then names containing it.
+        limit: Optional maximum number of foods to return
 
     Returns:
-        List of foods with their IDs and names
+        List of foods with their IDs and names, and the total number of matches
     """
     print(f"[PANTRY] Listing foods" + (f" matching '{search}'" if search else ""))
 
-    foods = []
-    for food_id, food_data in FOOD_DATABASE.items():
-        name = food_data.get("name", "")
-        if search is None or search.lower() in name.lower():
-            foods.append({
-                "id": food_data.get("id"),
-                "name": name
-            })
+    if search:
+        food_ids, total = search_food_index(search, limit)
+    else:
+        # Sort by ID
+        food_ids = sorted(food_data.get("id") for food_data in FOOD_DATABASE.values())
+        total = len(food_ids)
+        food_ids = food_ids[:limit]
 
-    # Sort by ID
-    foods.sort(key=lambda x: x["id"])
+    foods = [{"id": food_id, "name": get_food_name(food_id)} for food_id in food_ids]
 
-    print(f"[PANTRY] Found {len(foods)} foods")
+    print(f"[PANTRY] Found {total} foods")
     return {
         "foods": foods,
-        "count": len(foods)
+        "count": len(foods),
+        "total_matches": total
     }
 
 @mcp.tool
@@ -117,22 +745,15 @@ def list_pantry() -> dict:
     Returns:
         List of pantry items with food IDs, names, and quantities
     """
-    # RELOAD from disk to get latest data
-    global PANTRY_INVENTORY
-    PANTRY_INVENTORY = load_pantry()
+    refresh_pantry()
 
     print(f"[PANTRY] Listing pantry contents")
 
-    items = []
-    for food_id, quantity in PANTRY_INVENTORY.items():
-        items.append({
-            "food_id": int(food_id),
-            "name": get_food_name(int(food_id)),
-            "quantity": quantity
-        })
-
-    # Sort by food ID
-    items.sort(key=lambda x: x["food_id"])
+    slots = _slots_by_food_id(IN_PANTRY)
+    items = [
+        {"food_id": food_id, "name": get_food_name(food_id), "quantity": quantity}
+        for food_id, quantity in zip(SLOT_FOOD_IDS[slots].tolist(), _numbers(QUANTITIES[slots]))
+    ]
 
     print(f"[PANTRY] Pantry contains {len(items)} different items")
     return {
@@ -141,41 +762,75 @@ def list_pantry() -> dict:
     }
 
 @mcp.tool
-def check_pantry(food_id: int = None) -> dict:
-    """Check pantry inventory for a specific food ID or all items.
+def check_pantry(food_id: int = None, food_ids: List[int] = None) -> dict:
+    """Check pantry inventory for a specific food ID, a batch of food IDs, or all items.
 
     Args:
         food_id: Optional food ID to check. If None, returns all inventory.
+        food_ids: Optional list of food IDs to check in one call; only these
+            items are returned, each with its reserved and available stock
 
     Returns:
         Dictionary with food quantities
     """
-    # RELOAD from disk to get latest data
-    global PANTRY_INVENTORY
-    PANTRY_INVENTORY = load_pantry()
+    refresh_pantry()
+    _expire_reservations()
+
+    if food_ids is not None:
+        print(f"[PANTRY] Checking inventory for {len(food_ids)} food IDs")
+        try:
+            ids = _food_id_vector(food_ids)
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+        with _item_locks(ids):
+            slots = _slots(ids)
+            quantities = QUANTITIES[slots]
+            reserved = RESERVED[slots]
+            versions = VERSIONS[slots]
+        items = [
+            {
+                "food_id": fid,
+                "name": get_food_name(fid),
+                "quantity": quantity,
+                "reserved": held,
+                "available": free > 0,
+                "version": version
+            }
+            for fid, quantity, held, free, version in zip(
+                ids.tolist(), _numbers(quantities), _numbers(reserved),
+                (quantities - reserved).tolist(), versions.tolist())
+        ]
+        print(f"[PANTRY] {sum(item['available'] for item in items)} of {len(items)} items available")
+        return {"items": items, "count": len(items)}
 
     print(f"[PANTRY] Checking inventory for: {f'Food ID {food_id}' if food_id else 'ALL'}")
 
     if food_id is not None:
-        quantity = PANTRY_INVENTORY.get(str(food_id), 0)
+        try:
+            _food_id_vector([food_id])
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+        with _item_locks([food_id]):
+            slot = _FOOD_SLOTS[food_id]
+            quantity, reserved = _numbers([QUANTITIES[slot], RESERVED[slot]])
+            version = int(VERSIONS[slot])
         food_name = get_food_name(food_id)
         result = {
             "food_id": food_id,
             "name": food_name,
             "quantity": quantity,
-            "available": quantity > 0
+            "reserved": reserved,
+            "available": quantity - reserved > 0,
+            "version": version
         }
-        print(f"[PANTRY] {food_name} (ID {food_id}): {quantity} units")
+        print(f"[PANTRY] {food_name} (ID {food_id}): {quantity} units ({reserved} reserved)")
         return result
     else:
-        items = []
-        for food_id_str, quantity in PANTRY_INVENTORY.items():
-            fid = int(food_id_str)
-            items.append({
-                "food_id": fid,
-                "name": get_food_name(fid),
-                "quantity": quantity
-            })
+        slots = _slots_by_food_id(IN_PANTRY)
+        items = [
+            {"food_id": fid, "name": get_food_name(fid), "quantity": quantity}
+            for fid, quantity in zip(SLOT_FOOD_IDS[slots].tolist(), _numbers(QUANTITIES[slots]))
+        ]
         print(f"[PANTRY] Total items in pantry: {len(items)}")
         return {"items": items, "total_items": len(items)}
 
@@ -184,31 +839,20 @@ def take_ingredients(ingredients: dict) -> dict:
     """Remove ingredients from pantry by Food ID (chef taking ingredients for a recipe).
 
     Args:
-        ingredients: Dictionary of food IDs (as strings) to quantities needed
+        ingredients: Dictionary of food IDs (as strings, 0 to 1,000,000) to quantities needed
 
     Returns:
         Success status and updated inventory or list of missing ingredients
     """
-    # RELOAD from disk to get latest data
-    global PANTRY_INVENTORY
-    PANTRY_INVENTORY = load_pantry()
-
     print(f"[PANTRY] Chef requesting ingredients: {ingredients}")
 
-    missing = []
-
-    # First check if all ingredients are available
-    for food_id_str, quantity in ingredients.items():
-        available = PANTRY_INVENTORY.get(food_id_str, 0)
-        if available < quantity:
-            food_name = get_food_name(int(food_id_str))
-            missing.append({
-                "food_id": int(food_id_str),
-                "name": food_name,
-                "needed": quantity,
-                "available": available,
-                "shortage": quantity - available
-            })
+    # Reserved stock is off limits; only the unreserved remainder can be taken
+    try:
+        food_ids, quantities = _ingredient_vector(ingredients)
+        missing = _take_with_cas(food_ids, quantities)
+    except (ValueError, PantryConflictError) as e:
+        print(f"[PANTRY] ❌ {e}")
+        return {"success": False, "message": str(e)}
 
     if missing:
         print(f"[PANTRY] ❌ Cannot fulfill request - missing ingredients: {missing}")
@@ -218,17 +862,11 @@ def take_ingredients(ingredients: dict) -> dict:
             "missing": missing
         }
 
-    # Take ingredients from pantry
-    for food_id_str, quantity in ingredients.items():
-        PANTRY_INVENTORY[food_id_str] -= quantity
-        food_name = get_food_name(int(food_id_str))
-        print(f"[PANTRY] Took {quantity} units of {food_name} (ID {food_id_str}, remaining: {PANTRY_INVENTORY[food_id_str]})")
-
-    # Save to file
-    save_pantry(PANTRY_INVENTORY)
+    updated = dict(zip(ingredients.keys(), _numbers(QUANTITIES[_slots(food_ids)])))
+    for food_id, food_id_str, quantity in zip(food_ids.tolist(), ingredients, ingredients.values()):
+        print(f"[PANTRY] Took {quantity} units of {get_food_name(food_id)} (ID {food_id}, remaining: {updated[food_id_str]})")
 
     print(f"[PANTRY] ✅ Successfully provided all ingredients")
-    updated = {food_id_str: PANTRY_INVENTORY[food_id_str] for food_id_str in ingredients.keys()}
     return {
         "success": True,
         "message": "All ingredients provided",
@@ -240,28 +878,32 @@ def add_ingredients(ingredients: dict) -> dict:
     """Add ingredients to pantry by Food ID (supplier restocking).
 
     Args:
-        ingredients: Dictionary of food IDs (as strings) to quantities to add
+        ingredients: Dictionary of food IDs (as strings, 0 to 1,000,000) to quantities to add
 
     Returns:
         Success status and updated inventory
     """
-    # RELOAD from disk to get latest data
-    global PANTRY_INVENTORY
-    PANTRY_INVENTORY = load_pantry()
+    refresh_pantry()
 
     print(f"[PANTRY] Supplier adding ingredients: {ingredients}")
 
-    for food_id_str, quantity in ingredients.items():
-        current = PANTRY_INVENTORY.get(food_id_str, 0)
-        PANTRY_INVENTORY[food_id_str] = current + quantity
-        food_name = get_food_name(int(food_id_str))
-        print(f"[PANTRY] Added {quantity} units of {food_name} (ID {food_id_str}, now: {PANTRY_INVENTORY[food_id_str]})")
+    try:
+        food_ids, quantities = _ingredient_vector(ingredients)
+    except ValueError as e:
+        print(f"[PANTRY] ❌ {e}")
+        return {"success": False, "message": str(e)}
 
-    # Save to file
-    save_pantry(PANTRY_INVENTORY)
+    # Restocks are blind increments: they cannot conflict, so they only lock their own
+    # items and merge with other processes' changes at commit time
+    with _item_locks(food_ids):
+        _apply_deltas(food_ids, quantities)
+        updated = dict(zip(ingredients.keys(), _numbers(QUANTITIES[_slots(food_ids)])))
+    _schedule_flush()
+
+    for food_id, food_id_str, quantity in zip(food_ids.tolist(), ingredients, ingredients.values()):
+        print(f"[PANTRY] Added {quantity} units of {get_food_name(food_id)} (ID {food_id}, now: {updated[food_id_str]})")
 
     print(f"[PANTRY] ✅ Successfully restocked {len(ingredients)} items")
-    updated = {food_id_str: PANTRY_INVENTORY[food_id_str] for food_id_str in ingredients.keys()}
     return {
         "success": True,
         "message": f"Added {len(ingredients)} ingredient types",
@@ -269,30 +911,177 @@ def add_ingredients(ingredients: dict) -> dict:
     }
 
 @mcp.tool
-def get_low_stock_items(threshold: int = 3) -> dict:
-    """Get list of ingredients that are running low.
+def reserve_ingredients(ingredients: dict, ttl_seconds: int = RESERVATION_TTL) -> dict:
+    """Hold ingredients for a recipe without removing them from the pantry yet.
+
+    Reserved stock stays on hand but cannot be taken or reserved by anyone else.
+    Finish with commit_reservation once cooking starts, or release_reservation
+    if the order is abandoned. Unclaimed reservations expire after ttl_seconds.
+
+    Args:
+        ingredients: Dictionary of food IDs (as strings, 0 to 1,000,000) to quantities needed
+        ttl_seconds: Seconds before the reservation is released automatically (default: 300)
+
+    Returns:
+        reservation_id and expiry, or the list of missing ingredients (nothing is held)
+    """
+    refresh_pantry()
+    _expire_reservations()
+
+    print(f"[PANTRY] Chef reserving ingredients: {ingredients}")
+
+    try:
+        food_ids, quantities = _ingredient_vector(ingredients)
+    except ValueError as e:
+        print(f"[PANTRY] ❌ {e}")
+        return {"success": False, "message": str(e)}
+
+    with _item_locks(food_ids):
+        missing = _find_missing(food_ids, quantities)
+        if not missing:
+            reservation_id = uuid.uuid4().hex[:12]
+            expires_at = time.time() + ttl_seconds
+            _hold_reserved(food_ids, quantities, 1)
+            with _RESERVATION_LOCK:
+                RESERVATIONS[reservation_id] = {
+                    "ingredients": dict(ingredients),
+                    "food_ids": food_ids,
+                    "quantities": quantities,
+                    "expires_at": expires_at
+                }
+                heapq.heappush(_RESERVATION_EXPIRY, (expires_at, reservation_id))
+
+    if missing:
+        print(f"[PANTRY] ❌ Cannot reserve - missing ingredients: {missing}")
+        return {
+            "success": False,
+            "message": "Insufficient ingredients",
+            "missing": missing
+        }
+
+    print(f"[PANTRY] 🔒 Reservation {reservation_id} holds {len(ingredients)} ingredient types for {ttl_seconds}s")
+    return {
+        "success": True,
+        "reservation_id": reservation_id,
+        "reserved": ingredients,
+        "expires_at": datetime.fromtimestamp(expires_at).isoformat(timespec='seconds'),
+        "ttl_seconds": ttl_seconds
+    }
+
+@mcp.tool
+def commit_reservation(reservation_id: str) -> dict:
+    """Take the ingredients held by a reservation out of the pantry.
+
+    Args:
+        reservation_id: ID returned by reserve_ingredients
+
+    Returns:
+        Success status and updated inventory, or an error if the reservation expired
+    """
+    print(f"[PANTRY] Committing reservation {reservation_id}")
+
+    reservation = RESERVATIONS.get(reservation_id)
+    try:
+        if reservation is None:
+            raise KeyError(reservation_id)
+        ingredients = reservation["ingredients"]
+        food_ids = reservation["food_ids"]
+        missing = _take_with_cas(food_ids, reservation["quantities"], reservation_id)
+    except KeyError:
+        print(f"[PANTRY] ❌ Reservation {reservation_id} not found or expired")
+        return {
+            "success": False,
+            "message": f"Reservation {reservation_id} not found or expired"
+        }
+    except PantryConflictError as e:
+        print(f"[PANTRY] ❌ {e}")
+        return {"success": False, "message": str(e)}
+
+    if missing:
+        # Another pantry process used the stock before this reservation was committed
+        print(f"[PANTRY] ❌ Reserved stock is no longer on hand: {missing}")
+        return {
+            "success": False,
+            "message": "Insufficient ingredients",
+            "missing": missing
+        }
+
+    updated = dict(zip(ingredients.keys(), _numbers(QUANTITIES[_slots(food_ids)])))
+    for food_id, food_id_str, quantity in zip(food_ids.tolist(), ingredients, ingredients.values()):
+        print(f"[PANTRY] Took {quantity} units of {get_food_name(food_id)} (ID {food_id}, remaining: {updated[food_id_str]})")
+
+    print(f"[PANTRY] ✅ Reservation {reservation_id} committed")
+    return {
+        "success": True,
+        "message": "All reserved ingredients provided",
+        "updated_inventory": updated
+    }
+
+@mcp.tool
+def release_reservation(reservation_id: str) -> dict:
+    """Give the ingredients held by a reservation back to the free pool.
+
+    Args:
+        reservation_id: ID returned by reserve_ingredients
+
+    Returns:
+        Confirmation, or an error if the reservation was already committed or expired
+    """
+    print(f"[PANTRY] Releasing reservation {reservation_id}")
+
+    _expire_reservations()
+    reservation = _drop_reservation(reservation_id)
+    if reservation is None:
+        return {
+            "success": False,
+            "message": f"Reservation {reservation_id} not found or expired"
+        }
+
+    print(f"[PANTRY] 🔓 Reservation {reservation_id} released")
+    return {
+        "success": True,
+        "message": f"Released {len(reservation['ingredients'])} ingredient types",
+        "released": reservation["ingredients"]
+    }
+
+@mcp.tool
+def get_low_stock_items(threshold: int = None) -> dict:
+    """Get list of ingredients that are at or below their reorder point.
 
     Args:
-        threshold: Quantity threshold for low stock (default: 3)
+        threshold: Optional quantity threshold applied to every item instead of
+            the per-food reorder points
 
     Returns:
-        List of low stock ingredients with IDs and names
+        Low stock ingredients with IDs, names, reorder points and reorder quantities,
+        most depleted (relative to the reorder point) first
     """
-    # RELOAD from disk to get latest data
-    global PANTRY_INVENTORY
-    PANTRY_INVENTORY = load_pantry()
+    refresh_pantry()
 
-    print(f"[PANTRY] Checking for items below {threshold} units")
+    if threshold is None:
+        print(f"[PANTRY] Checking for items at or below their reorder points")
+        # Items at or below their reorder point are the non-positive prefix of the index
+        with _LOW_STOCK_LOCK:
+            end = bisect.bisect_right(_REORDER_DISTANCES, (0, float("inf")))
+            low = _REORDER_DISTANCES[:end]
+    else:
+        print(f"[PANTRY] Checking for items below {threshold} units")
+        slots = np.flatnonzero(IN_PANTRY & (QUANTITIES <= threshold))
+        food_ids = SLOT_FOOD_IDS[slots]
+        distances = QUANTITIES[slots] - threshold
+        order = np.lexsort((food_ids, distances))
+        low = list(zip(distances[order].tolist(), food_ids[order].tolist()))
 
     low_stock = []
-    for food_id_str, quantity in PANTRY_INVENTORY.items():
-        if quantity <= threshold:
-            food_name = get_food_name(int(food_id_str))
-            low_stock.append({
-                "food_id": int(food_id_str),
-                "name": food_name,
-                "quantity": quantity
-            })
+    for distance, food_id in low:
+        reorder_point, reorder_quantity = get_reorder_policy(food_id)
+        low_stock.append({
+            "food_id": food_id,
+            "name": get_food_name(food_id),
+            "quantity": _numbers([distance + (reorder_point if threshold is None else threshold)])[0],
+            "reorder_point": reorder_point,
+            "reorder_quantity": reorder_quantity
+        })
 
     print(f"[PANTRY] Found {len(low_stock)} low stock items")
     return {
@@ -301,14 +1090,107 @@ def get_low_stock_items(threshold: int = 3) -> dict:
         "threshold": threshold
     }
 
-def main(transport="stdio", host="0.0.0.0", port=8725):
-    """Run the pantry MCP server."""
+@mcp.tool
+def can_make(recipe_ids: List[str] = None) -> dict:
+    """Compute how many servings of each recipe the current stock can make.
+
+    A serving uses the recipe's ingredient quantities from recipe_bom.json once
+    (one chef order). Only unreserved stock counts. All recipes are computed in
+    one pass: free stock divided by the bill of materials, minimum per recipe.
+
+    Args:
+        recipe_ids: Optional recipe IDs (e.g. ["recipe_004"]) to report; defaults to all
+
+    Returns:
+        For each recipe its ID, name, max_servings and the limiting ingredient
+    """
+    refresh_pantry()
+    _expire_reservations()
+
+    print(f"[PANTRY] Checking which recipes can be made" + (f": {recipe_ids}" if recipe_ids else ""))
+
+    unknown = sorted(set(recipe_ids or []) - set(_BOM_RECIPE_IDS))
+    if _BOM_MATRIX.size == 0:
+        print(f"[PANTRY] No recipes in the bill of materials")
+        result = {"recipes": [], "count": 0}
+        if unknown:
+            result["unknown_recipe_ids"] = unknown
+        return result
+
+    free = QUANTITIES[_BOM_SLOTS] - RESERVED[_BOM_SLOTS]
+    ratios = np.divide(free, _BOM_MATRIX, out=np.full(_BOM_MATRIX.shape, np.inf), where=_BOM_MATRIX > 0)
+    # A recipe whose quantities are all zero needs nothing measurable: no servings, no limit
+    has_ingredients = (_BOM_MATRIX > 0).any(axis=1)
+    limiting = np.argmin(ratios, axis=1)
+    best = np.where(has_ingredients, ratios[np.arange(len(limiting)), limiting], 0)
+    servings = np.floor(np.maximum(best, 0)).astype(np.int64)
+
+    recipes = []
+    for row, recipe_id in enumerate(_BOM_RECIPE_IDS):
+        if recipe_ids and recipe_id not in recipe_ids:
+            continue
+        if not has_ingredients[row]:
+            recipes.append({
+                "recipe_id": recipe_id,
+                "name": RECIPE_BOM[recipe_id].get("name", recipe_id),
+                "max_servings": 0,
+                "limiting_ingredient": None
+            })
+            continue
+        column = limiting[row]
+        food_id = int(_BOM_FOOD_IDS[column])
+        recipes.append({
+            "recipe_id": recipe_id,
+            "name": RECIPE_BOM[recipe_id].get("name", recipe_id),
+            "max_servings": int(servings[row]),
+            "limiting_ingredient": {
+                "food_id": food_id,
+                "name": get_food_name(food_id),
+                "available": _numbers([free[column]])[0],
+                "needed_per_serving": _numbers([_BOM_MATRIX[row, column]])[0]
+            }
+        })
+
+    print(f"[PANTRY] {sum(recipe['max_servings'] > 0 for recipe in recipes)} of {len(recipes)} recipes can be made")
+    result = {"recipes": recipes, "count": len(recipes)}
+    if unknown:
+        result["unknown_recipe_ids"] = unknown
+    return result
+
+def main(transport="stdio", host="0.0.0.0", port=8725, flush_interval=FLUSH_INTERVAL):
+    """Run the pantry MCP server.
+
+    Run it once with transport="streamable-http" to share one pantry between the
+    chef and supplier (they connect to http://localhost:8725/mcp); with stdio each
+    agent spawns its own server and they coordinate through pantry.json.
+
+    Args:
+        transport: "stdio", "sse" or "streamable-http"
+        host: Host to bind for HTTP transports
+        port: Port to bind for HTTP transports
+        flush_interval: Durability window in seconds for group-committing pantry
+            changes to disk (0 writes every change through immediately)
+    """
+    global FLUSH_INTERVAL, SOLE_WRITER
+    FLUSH_INTERVAL = float(flush_interval)
+    print(f"[PANTRY] Group commit window: {FLUSH_INTERVAL}s")
     if transport in ["sse", "streamable-http"]:
-        mcp.run(transport=transport, host=host, port=port)
-    elif transport == "stdio":
-        mcp.run()
-    else:
-        raise Exception(f"Invalid parameters {transport=} {host=} {port=}")
+        SOLE_WRITER = _claim_pantry(exclusive=True)
+        if SOLE_WRITER:
+            print(f"[PANTRY] 🔑 Serving the shared pantry on port {port}, takes are group-committed")
+        else:
+            print(f"[PANTRY] ⚠️  Other pantry servers are running, committing every take immediately")
+    elif transport == "stdio" and not _claim_pantry(exclusive=False):
+        raise Exception(f"A pantry service already owns {PANTRY_FILE}; connect to it over HTTP instead")
+    try:
+        if transport in ["sse", "streamable-http"]:
+            mcp.run(transport=transport, host=host, port=port)
+        elif transport == "stdio":
+            mcp.run()
+        else:
+            raise Exception(f"Invalid parameters {transport=} {host=} {port=}")
+    finally:
+        flush_pantry()
 
 if __name__ == "__main__":
     fire.Fire(main)
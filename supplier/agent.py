@@ -37,11 +37,12 @@ from google.adk.tools import FunctionTool
 
 try:
     from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset as McpToolset
-    from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams, StdioServerParameters
 except ImportError:
     print("Error: Could not import MCP tools", file=sys.stderr)
     McpToolset = None
 
+from pantry_connection import connect_pantry
+
 def wait_time(item: str, quantity: int) -> dict:
     """Simulate waiting for supplier delivery (instant for fast UI).
 
@@ -65,45 +66,11 @@ def wait_time(item: str, quantity: int) -> dict:
 # Create tools list
 tools = [FunctionTool(wait_time)]
 
-# Add pantry MCP tools
+# Add pantry MCP tools (the shared service if it is running, otherwise a stdio server)
 if McpToolset:
-    # Determine pantry MCP server path (works from both root and supplier/ directory)
-    import os
-
-    # Try to find pantry_mcp_server.py in multiple locations
-    possible_paths = [
-        "pantry_mcp_server.py",           # When running from root (webapp)
-        "../pantry_mcp_server.py",        # When running from supplier/ (a2a_server)
-    ]
-
-    pantry_path = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            # Convert to absolute path so it works regardless of current directory
-            pantry_path = os.path.abspath(path)
-            break
-
-    if pantry_path is None:
-        print(f"[SUPPLIER] ⚠️  Could not find pantry_mcp_server.py in any of: {possible_paths}")
-    else:
-        try:
-            # Suppress MCP connection messages
-            pantry_connection = StdioConnectionParams(
-                    server_params=StdioServerParameters(
-                        command="uv",
-                        args=["run", pantry_path]
-                )
-            )
-
-            pantry_toolset = McpToolset(
-                    connection_params=pantry_connection
-            )
-
-            tools.append(pantry_toolset)
-            print(f"[SUPPLIER] ✅ Connected to pantry MCP server (using {pantry_path})")
-
-        except Exception as e:
-            print(f"[SUPPLIER] ⚠️  Could not connect to pantry MCP: {e}")
+    pantry_toolset = connect_pantry("SUPPLIER")
+    if pantry_toolset:
+        tools.append(pantry_toolset)
 
 # Create the supplier agent
 root_agent = Agent(
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for can_make in pantry_mcp_server.
+
+Runs the pantry in a scratch directory and checks servings and the limiting
+ingredient, and that a missing bill of materials or a recipe with nothing to
+measure gives an empty or zero answer instead of an error.
+
+Usage:
+    uv run test_can_make.py
+"""
+
+import fire
+
+from test_helpers import scratch_pantry, write
+
+FOODS = {"1": {"id": 1, "name": "Flour"}, "2": {"id": 2, "name": "Eggs"}, "3": {"id": 3, "name": "Salt"}}
+
+
+def test_servings_and_limiting_ingredient():
+    bom = {"recipes": {
+        "recipe_001": {"name": "Pasta", "ingredients": {"1": 2, "2": 3}},
+        "recipe_002": {"name": "Seasoning", "ingredients": {"3": 0}},
+    }}
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"1": 10, "2": 7}, "recipe_bom.json": bom}) as pantry:
+        recipes = {recipe["recipe_id"]: recipe for recipe in pantry.can_make()["recipes"]}
+        assert recipes["recipe_001"]["max_servings"] == 2
+        assert recipes["recipe_001"]["limiting_ingredient"]["name"] == "Eggs"
+        # Quantities of zero only: nothing to divide by
+        assert recipes["recipe_002"]["max_servings"] == 0
+        assert recipes["recipe_002"]["limiting_ingredient"] is None
+
+        result = pantry.can_make(["recipe_001", "recipe_999"])
+        assert result["count"] == 1 and result["unknown_recipe_ids"] == ["recipe_999"]
+
+
+def test_missing_or_empty_bill_of_materials():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"1": 10}}) as pantry:
+        assert pantry.can_make() == {"recipes": [], "count": 0}
+
+        write("recipe_bom.json", {"recipes": {}})
+        pantry.build_bom_matrix(pantry.load_recipe_bom())
+        assert pantry.can_make() == {"recipes": [], "count": 0}
+        assert pantry.can_make(["recipe_001"])["unknown_recipe_ids"] == ["recipe_001"]
+
+
+def main():
+    print("🧪 Testing can_make...\n")
+    test_servings_and_limiting_ingredient()
+    print("   ✅ Servings follow the scarcest ingredient")
+    test_missing_or_empty_bill_of_materials()
+    print("   ✅ No bill of materials means no recipes, not an error")
+    print("\n✅ can_make works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
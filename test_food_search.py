@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for the food name search behind list_foods in pantry_mcp_server.
+
+Runs the pantry in a scratch directory and checks that matches are ranked
+exact name first, then names starting with the term, then names containing
+it (alphabetical within each rank), and that limit and total_matches agree.
+
+Usage:
+    uv run test_food_search.py
+"""
+
+import fire
+
+from test_helpers import scratch_pantry
+
+NAMES = ["Egg", "Eggplant", "Egg Noodles", "Nutmeg", "Veggie Stock", "Veggie Burger", "Flour", "Eggnog", "Salt"]
+FOODS = {str(i): {"id": i, "name": name} for i, name in enumerate(NAMES, start=1)}
+
+
+def names(result: dict) -> list:
+    return [food["name"] for food in result["foods"]]
+
+
+def test_ranked_exact_prefix_substring():
+    with scratch_pantry({"food.json": {"foods": FOODS}}) as pantry:
+        result = pantry.list_foods(search="egg")
+        assert names(result) == ["Egg", "Egg Noodles", "Eggnog", "Eggplant", "Veggie Burger", "Veggie Stock"]
+        assert result["total_matches"] == 6
+        # Case-insensitive, and a prefix that is no name is not an exact match
+        assert names(pantry.list_foods(search="EGGN")) == ["Eggnog"]
+        assert names(pantry.list_foods(search="nog")) == ["Eggnog"]
+        assert names(pantry.list_foods(search="salt")) == ["Salt"]
+        assert pantry.list_foods(search="saffron")["total_matches"] == 0
+
+
+def test_short_queries_and_limit():
+    with scratch_pantry({"food.json": {"foods": FOODS}}) as pantry:
+        # Two characters use the bigram lists, one character scans every name
+        assert names(pantry.list_foods(search="ut")) == ["Nutmeg"]
+        assert names(pantry.list_foods(search="f")) == ["Flour"]
+        assert set(names(pantry.list_foods(search="g"))) == {
+            "Egg", "Eggplant", "Egg Noodles", "Nutmeg", "Veggie Stock", "Veggie Burger", "Eggnog"}
+
+        page = pantry.list_foods(search="egg", limit=2)
+        assert names(page) == ["Egg", "Egg Noodles"]
+        assert (page["count"], page["total_matches"]) == (2, 6)
+        # The limit can end inside the substring matches too
+        page = pantry.list_foods(search="egg", limit=5)
+        assert names(page) == ["Egg", "Egg Noodles", "Eggnog", "Eggplant", "Veggie Burger"]
+        assert pantry.list_foods(search="g", limit=1)["total_matches"] == 7
+
+
+def main():
+    print("🧪 Testing the food search...\n")
+    test_ranked_exact_prefix_substring()
+    print("   ✅ Exact names come first, then prefixes, then substrings")
+    test_short_queries_and_limit()
+    print("   ✅ Short queries and limits return the right foods and totals")
+    print("\n✅ Food search works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
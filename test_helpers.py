@@ -0,0 +1,98 @@
+"""Scratch-directory fixtures shared by the MCP server test scripts.
+
+The servers read and write their files relative to the working directory,
+so each test loads a fresh copy of the server module inside a temporary
+directory that holds only the files it needs, with the server's log output
+silenced. The directory is removed, and the module dropped from
+sys.modules, when the test is done.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+
+def write(name: str, data, mtime_ns: int = None) -> None:
+    """Write a JSON file (or raw text), optionally with a distinct mtime as a later save would have."""
+    with open(name, "w") as f:
+        f.write(data if isinstance(data, str) else json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(name, ns=(mtime_ns, mtime_ns))
+
+
+@contextlib.contextmanager
+def scratch_dir(files: dict = None):
+    """Work inside a temporary directory holding `files` ({name: JSON data or text})."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="restaurant-test-") as workdir:
+        os.chdir(workdir)
+        try:
+            for name, data in (files or {}).items():
+                write(name, data)
+            yield workdir
+        finally:
+            os.chdir(cwd)
+
+
+@contextlib.contextmanager
+def scratch_module(module_name: str, files: dict = None):
+    """Load `module_name` fresh inside a scratch directory holding `files`."""
+    with scratch_dir(files), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            module = importlib.import_module(module_name)
+            yield importlib.reload(module)
+        finally:
+            # Later tests (and their forked workers) must import a copy of their own
+            sys.modules.pop(module_name, None)
+
+
+@contextlib.contextmanager
+def scratch_pantry(files: dict = None, flush_interval: float = 0):
+    """pantry_mcp_server in a scratch directory; flush_interval=0 commits every change at once."""
+    with scratch_module("pantry_mcp_server", files) as pantry:
+        pantry.FLUSH_INTERVAL = flush_interval
+        yield pantry
+
+
+@contextlib.contextmanager
+def scratch_menu(files: dict = None):
+    """menu_mcp_server in a scratch directory."""
+    with scratch_module("menu_mcp_server", files) as menu_server:
+        yield menu_server
+
+
+@contextlib.contextmanager
+def scratch_order_up(files: dict = None, seconds_per_minute: float = 1.0):
+    """order_up_mcp_server in a scratch directory, on a fast kitchen clock (seconds per kitchen minute)."""
+    with scratch_module("order_up_mcp_server", files) as order_up:
+        order_up.SECONDS_PER_MINUTE = seconds_per_minute
+        yield order_up
+
+
+@contextlib.contextmanager
+def scratch_store(storage: str = "json"):
+    """An orders_mcp_server store ("json" or "sqlite") in a scratch directory."""
+    with scratch_dir() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        import orders_mcp_server
+        yield orders_mcp_server.create_store(
+            storage,
+            db_path=os.path.join(workdir, "orders.db"),
+            orders_file=os.path.join(workdir, "orders.json"),
+            archive_dir=os.path.join(workdir, "orders_archive"),
+        )
+
+
+@contextlib.contextmanager
+def scratch_orders_server(storage: str = "json"):
+    """orders_mcp_server with its tools backed by a scratch store ("json" or "sqlite")."""
+    with scratch_store(storage) as store, contextlib.redirect_stdout(io.StringIO()):
+        import orders_mcp_server
+        default, orders_mcp_server.STORE = orders_mcp_server.STORE, store
+        try:
+            yield orders_mcp_server
+        finally:
+            orders_mcp_server.STORE = default
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for the streaming latency sketches behind order_up's kitchen_stats.
+
+Checks that sketch quantiles stay within the configured relative error of the
+exact ones, that merged sketches match a single sketch over the same values,
+and that samples leave the rolling window once it moves past them.
+
+Usage:
+    uv run test_kitchen_stats.py
+"""
+
+import contextlib
+import io
+import math
+import random
+
+import fire
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from order_up_mcp_server import SKETCH_ACCURACY, QuantileSketch, RollingSketches
+
+
+def exact_quantile(values, q: float) -> float:
+    """Nearest-rank quantile: the ceil(q * n)-th smallest value."""
+    return sorted(values)[max(math.ceil(q * len(values)), 1) - 1]
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(20_000)] + [0.0] * 100
+    sketch, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        sketch.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= SKETCH_ACCURACY * exact
+        assert left.quantile(q) == sketch.quantile(q)
+    assert sketch.quantile(0.0) == 0.0
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_quantile_uses_nearest_rank():
+    values = [10.0, 20.0, 30.0, 40.0]
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    for q in (0.25, 0.5, 0.75, 0.95, 1.0):
+        exact = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= SKETCH_ACCURACY * exact
+    # The median of four samples is the 2nd smallest, not the 3rd
+    assert abs(sketch.quantile(0.5) - 20.0) <= SKETCH_ACCURACY * 20.0
+
+
+def test_rolling_window_expires_samples():
+    window = RollingSketches(window=60.0, slices=6)
+    window.add("Steak", 30.0, at=5.0)
+    window.add("Steak", 10.0, at=50.0)
+    window.add("Salad", 5.0, at=55.0)
+    # A late sample lands in its own slice
+    window.add("Salad", 7.0, at=25.0)
+
+    snapshot = window.snapshot(now=59.0)
+    assert snapshot["Steak"].count == 2 and snapshot["Salad"].count == 2
+    # At t=75 the slices before t=20 have left the window
+    snapshot = window.snapshot(now=75.0)
+    assert snapshot["Steak"].count == 1 and snapshot["Salad"].count == 2
+    assert window.snapshot(now=200.0) == {}
+
+
+def main():
+    print("🧪 Testing the kitchen latency sketches...\n")
+    test_quantiles_within_relative_error()
+    print("   ✅ p50/p95/p99 stay within the sketch's relative error, merged or not")
+    test_quantile_uses_nearest_rank()
+    print("   ✅ Quantiles use the nearest rank, ceil(q * n)")
+    test_rolling_window_expires_samples()
+    print("   ✅ Samples leave the rolling window slice by slice")
+    print("\n✅ Kitchen latency sketches work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for get_low_stock_items in pantry_mcp_server.
+
+Runs the pantry in a scratch directory with per-food reorder points and
+checks that takes and restocks move items into and out of the low-stock
+list, most depleted (relative to the reorder point) first.
+
+Usage:
+    uv run test_low_stock.py
+"""
+
+import fire
+
+from test_helpers import scratch_pantry
+
+FOODS = {str(i): {"id": i, "name": name} for i, name in enumerate(["Flour", "Eggs", "Salt", "Milk"], start=1)}
+REORDER = {"default": {"reorder_point": 3, "reorder_quantity": 10},
+           "foods": {"1": {"reorder_point": 5, "reorder_quantity": 20}, "4": {"reorder_point": 0}}}
+
+
+def low(pantry, threshold=None) -> list:
+    return [(item["name"], item["quantity"]) for item in pantry.get_low_stock_items(threshold)["low_stock_items"]]
+
+
+def test_low_stock_follows_takes_and_restocks():
+    files = {"food.json": {"foods": FOODS}, "reorder_points.json": REORDER,
+             "pantry.json": {"1": 8, "2": 3, "3": 10, "4": 1}}
+    with scratch_pantry(files) as pantry:
+        # Eggs sit exactly at the default reorder point; Milk reorders only when out
+        assert low(pantry) == [("Eggs", 3)]
+
+        assert pantry.take_ingredients({"1": 5, "4": 1})["success"]
+        # Flour is 2 under its point of 5, Eggs 0 under theirs, Milk at 0
+        assert low(pantry) == [("Flour", 3), ("Eggs", 3), ("Milk", 0)]
+        item = pantry.get_low_stock_items()["low_stock_items"][0]
+        assert (item["reorder_point"], item["reorder_quantity"]) == (5, 20)
+
+        assert pantry.add_ingredients({"1": 20, "2": 1})["success"]
+        assert low(pantry) == [("Milk", 0)]
+        assert pantry.take_ingredients({"3": 8})["success"]
+        assert low(pantry) == [("Salt", 2), ("Milk", 0)]
+
+
+def test_threshold_and_new_items():
+    files = {"food.json": {"foods": FOODS}, "reorder_points.json": REORDER, "pantry.json": {"1": 8, "2": 3}}
+    with scratch_pantry(files) as pantry:
+        assert low(pantry, threshold=8) == [("Eggs", 3), ("Flour", 8)]
+        assert low(pantry, threshold=2) == []
+        # A restock of a food not yet in the pantry adds it to the index
+        assert pantry.add_ingredients({"3": 1})["success"]
+        assert low(pantry) == [("Salt", 1), ("Eggs", 3)]
+
+
+def main():
+    print("🧪 Testing the low-stock index...\n")
+    test_low_stock_follows_takes_and_restocks()
+    print("   ✅ Takes and restocks move items into and out of the low-stock list")
+    test_threshold_and_new_items()
+    print("   ✅ Thresholds and newly stocked foods are reported")
+    print("\n✅ Low-stock tracking works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for recommend_pairings in menu_mcp_server.
+
+Runs the menu server next to an orders store (JSON and SQLite) in a scratch
+directory and checks that dishes are counted once per customer and day,
+including archived orders, that new orders are picked up from the change
+feed without a rebuild (or from the order history when the feed was
+truncated), and that the top k partners come out most often first.
+
+Usage:
+    uv run test_menu_pairings.py
+"""
+
+import contextlib
+import io
+
+import fire
+
+from test_helpers import scratch_menu
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import orders_mcp_server
+
+MENU = {"menu": {name: {"name": name, "category": "Mains", "price": "$10.00", "description": name}
+                 for name in ["Greek Salad", "Grilled Salmon with Vegetables", "Pancakes", "Lemonade"]}}
+
+
+def open_store(storage: str):
+    return orders_mcp_server.create_store(storage, "orders.db", "orders.json", "orders_archive")
+
+
+def partners(menu_server, item_name: str, k: int = 3) -> list:
+    result = menu_server.recommend_pairings(item_name, k=k)
+    assert result["success"], result
+    return [(pairing["name"], pairing["ordered_together"]) for pairing in result["pairings"]]
+
+
+def check_pairings(storage: str):
+    with scratch_menu({"menu.json": MENU}) as menu_server:
+        orders = open_store(storage)
+        menu_server.ORDERS_STORE = open_store(storage)
+        orders.create_order("Ann", "1 Greek Salad, 1 lemonade", "10 min")
+        orders.create_order("Bob", "2 grilled salmon and a lemonade", "20 min")
+        # Ann's second order joins her basket for the day; a served order still counts
+        orders.create_order("ann", "pancakes", "15 min")
+        orders.update_status(1, "SERVED")
+        orders.create_order("Cat", "greek salad", "10 min")
+
+        assert partners(menu_server, "Lemonade") == [("Greek Salad", 1), ("Grilled Salmon with Vegetables", 1),
+                                                     ("Pancakes", 1)]
+        assert menu_server.recommend_pairings("Greek Salad")["times_ordered"] == 2
+        built = menu_server.PAIRINGS
+
+        # New orders come from the change feed; only touched rows are re-ranked
+        orders.create_order("Dan", "Greek Salad and Lemonade", "10 min")
+        orders.create_order("Eve", "greek salads, lemonade", "10 min")
+        assert partners(menu_server, "Lemonade", k=1) == [("Greek Salad", 3)]
+        assert menu_server.recommend_pairings("Lemonade")["times_ordered"] == 4
+        assert menu_server.PAIRINGS is built
+        assert partners(menu_server, "Pancakes") == [("Greek Salad", 1), ("Lemonade", 1)]
+        assert not menu_server.recommend_pairings("Lemonade", k=0)["success"]
+        assert not menu_server.recommend_pairings("Soup")["success"]
+
+
+def test_pairings():
+    for storage in ("json", "sqlite"):
+        check_pairings(storage)
+
+
+def check_truncated_feed(storage: str):
+    retained = orders_mcp_server.CHANGE_LOG_SIZE
+    orders_mcp_server.CHANGE_LOG_SIZE = 4
+    try:
+        with scratch_menu({"menu.json": MENU}) as menu_server:
+            orders = open_store(storage)
+            menu_server.ORDERS_STORE = open_store(storage)
+            orders.create_order("Ann", "pancakes, lemonade", "10 min")
+            assert partners(menu_server, "Pancakes") == [("Lemonade", 1)]
+            for i in range(10):
+                orders.create_order(f"guest{i}", "pancakes with lemonade", "10 min")
+            assert orders.changes_since(1)[1]
+            assert partners(menu_server, "Pancakes") == [("Lemonade", 11)]
+    finally:
+        orders_mcp_server.CHANGE_LOG_SIZE = retained
+
+
+def test_truncated_feed():
+    for storage in ("json", "sqlite"):
+        check_truncated_feed(storage)
+
+
+def main():
+    print("🧪 Testing menu pairings...\n")
+    for storage in ("json", "sqlite"):
+        check_pairings(storage)
+        print(f"   ✅ {storage}: pairs counted per basket, updated from the change feed, top k first")
+        check_truncated_feed(storage)
+        print(f"   ✅ {storage}: orders dropped from the change feed are read from the history")
+    print("\n✅ Menu pairings work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
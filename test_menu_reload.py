@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test that list_menu follows changes to menu.json in menu_mcp_server.
+
+Runs the menu server in a scratch directory, rewrites menu.json and checks
+that the precomputed list_menu responses are rebuilt on reload and reused
+until then, and that a broken file keeps the current menu.
+
+Usage:
+    uv run test_menu_reload.py
+"""
+
+import os
+
+import fire
+
+from test_helpers import scratch_menu, write
+
+
+def menu_of(*items) -> dict:
+    return {"menu": {name: {"name": name, "category": category, "price": price, "dietary": [],
+                            "description": f"House {name.lower()}."}
+                     for name, category, price in items}}
+
+
+def names(response: dict) -> list:
+    return [entry["name"] for entry in response["items"]]
+
+
+def test_list_menu_follows_menu_json():
+    first = menu_of(("Greek Salad", "Salads", "$12.99"), ("Pancakes", "Breakfast", "$11.99"))
+    with scratch_menu({"menu.json": first}) as menu_server:
+        full = menu_server.list_menu()
+        assert names(full) == ["Pancakes", "Greek Salad"]
+        # Unchanged menu: the same precomputed response every call, no reload
+        assert menu_server.list_menu() is full
+        assert menu_server.reload_menu() is False
+
+        write("menu.json", menu_of(("Greek Salad", "Salads", "$13.49"), ("Caesar Salad", "Salads", "$11.99"),
+                                   ("Pancakes", "Breakfast", "$11.99")), 10**18)
+        assert menu_server.list_menu() is full  # until the watcher notices
+        assert menu_server.reload_menu() is True
+        salads = menu_server.list_menu(category="Salads", detail="summary")
+        assert names(salads) == ["Caesar Salad", "Greek Salad"]
+        assert [entry["price"] for entry in salads["items"]] == ["$11.99", "$13.49"]
+        assert names(menu_server.list_menu()) == ["Pancakes", "Caesar Salad", "Greek Salad"]
+        assert menu_server.get_menu_item("Caesar Salad")["success"]
+        assert menu_server.list_menu(category="Breakfast")["count"] == 1
+        assert menu_server.search_menu(query="caesar")["count"] == 1
+
+        # A category that disappears lists nothing
+        write("menu.json", menu_of(("Greek Salad", "Salads", "$13.49")), 2 * 10**18)
+        assert menu_server.reload_menu() is True
+        assert menu_server.list_menu(category="Breakfast") == {"items": [], "count": 0}
+        assert not menu_server.get_menu_item("Pancakes")["success"]
+
+
+def test_broken_menu_json_keeps_the_menu():
+    with scratch_menu({"menu.json": menu_of(("Greek Salad", "Salads", "$12.99"))}) as menu_server:
+        listed = menu_server.list_menu()
+        write("menu.json", '{"menu": {"Greek Sal', 10**18)
+        assert menu_server.reload_menu() is False
+        assert menu_server.list_menu() is listed
+
+        os.remove("menu.json")
+        assert menu_server.reload_menu() is False
+        assert names(menu_server.list_menu()) == ["Greek Salad"]
+
+        # Once the file is whole again it is picked up
+        write("menu.json", menu_of(("Greek Salad", "Salads", "$12.99"), ("Pancakes", "Breakfast", "$11.99")), 2 * 10**18)
+        assert menu_server.reload_menu() is True
+        assert menu_server.list_menu()["count"] == 2
+
+
+def main():
+    print("🧪 Testing list_menu reloads...\n")
+    test_list_menu_follows_menu_json()
+    print("   ✅ list_menu is rebuilt when menu.json changes and reused until then")
+    test_broken_menu_json_keeps_the_menu()
+    print("   ✅ A broken or missing menu.json keeps the current menu")
+    print("\n✅ list_menu reloads work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
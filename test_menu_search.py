@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for search_menu and build_menu_index in menu_mcp_server.
+
+Runs the menu server in a scratch directory and checks that keyword,
+category, dietary and price constraints combine with AND, that price bands
+include their edges (an item at exactly $15.00 is "under $15"), and that
+matches come back in menu order.
+
+Usage:
+    uv run test_menu_search.py
+"""
+
+import fire
+
+from test_helpers import scratch_menu
+
+
+def item(name, category, price, dietary, description=""):
+    return {"name": name, "category": category, "price": price, "dietary": dietary,
+            "description": description or f"House {name.lower()}."}
+
+
+MENU = {"menu": {entry["name"]: entry for entry in [
+    item("Quinoa Buddha Bowl", "Healthy Bowls", "$15.00", ["vegan", "gluten-free"], "Quinoa, chickpeas and tahini."),
+    item("Smoothie Bowl", "Breakfast", "$14.99", ["vegan"], "Frozen berries and granola."),
+    item("Poke Bowl", "Healthy Bowls", "$15.01", ["gluten-free"], "Raw tuna over rice."),
+    item("Greek Salad", "Salads", "$9.99", ["vegetarian", "gluten-free"], "Feta and olives."),
+    item("Beef Stir Fry", "Asian Fusion", "$20.00", ["dairy-free"], "Sirloin over jasmine rice."),
+    item("Soup of the Day", "Soups", "market price", ["vegan"], "Ask your server."),
+]}}
+
+
+def found(menu_server, **constraints) -> list:
+    return [match["name"] for match in menu_server.search_menu(**constraints)["matches"]]
+
+
+def test_constraints_combine_with_and():
+    with scratch_menu({"menu.json": MENU}) as menu_server:
+        assert found(menu_server, query="bowl") == ["Quinoa Buddha Bowl", "Smoothie Bowl", "Poke Bowl"]
+        assert found(menu_server, query="bowl", dietary=["vegan"]) == ["Quinoa Buddha Bowl", "Smoothie Bowl"]
+        assert found(menu_server, query="bowl", dietary=["vegan", "gluten-free"]) == ["Quinoa Buddha Bowl"]
+        assert found(menu_server, query="bowl", dietary="vegan, gluten-free", category="breakfast") == []
+        assert found(menu_server, category="Healthy Bowls", max_price=15) == ["Quinoa Buddha Bowl"]
+        # Every query word must match a word or the start of one, in name or description
+        assert found(menu_server, query="rice") == ["Poke Bowl", "Beef Stir Fry"]
+        assert found(menu_server, query="bowl tuna") == ["Poke Bowl"]
+        assert found(menu_server, query="chick") == ["Quinoa Buddha Bowl"]
+        assert found(menu_server, query="owl") == []
+        assert found(menu_server, dietary=["kosher"]) == []
+        # No constraints: the whole menu, in menu.json order
+        assert found(menu_server) == list(MENU["menu"])
+
+
+def test_price_band_edges():
+    with scratch_menu({"menu.json": MENU}) as menu_server:
+        assert found(menu_server, max_price=15) == ["Quinoa Buddha Bowl", "Smoothie Bowl", "Greek Salad"]
+        assert found(menu_server, max_price=15.00, min_price=15.00) == ["Quinoa Buddha Bowl"]
+        assert found(menu_server, min_price=15) == ["Quinoa Buddha Bowl", "Poke Bowl", "Beef Stir Fry"]
+        assert found(menu_server, min_price=15.01, max_price=20) == ["Poke Bowl", "Beef Stir Fry"]
+        assert found(menu_server, max_price=14.99) == ["Smoothie Bowl", "Greek Salad"]
+        assert found(menu_server, min_price=20) == ["Beef Stir Fry"]
+        assert found(menu_server, min_price=10, max_price=14.98) == []
+        assert found(menu_server, max_price=100, query="bowl") == ["Quinoa Buddha Bowl", "Smoothie Bowl", "Poke Bowl"]
+        # An item without a numeric price never matches a price constraint
+        assert "Soup of the Day" not in found(menu_server, min_price=0)
+        assert found(menu_server, query="soup") == ["Soup of the Day"]
+
+
+def main():
+    print("🧪 Testing search_menu...\n")
+    test_constraints_combine_with_and()
+    print("   ✅ Keyword, category, dietary and price constraints all have to hold")
+    test_price_band_edges()
+    print("   ✅ Price bands include their edges ($15.00 is under $15)")
+    print("\n✅ search_menu works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
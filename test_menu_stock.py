@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test the stock annotations on list_menu and get_menu_item in menu_mcp_server.
+
+Runs the menu server in a scratch directory with a bill of materials and a
+pantry, and checks that servings_available and in_stock are cached between
+calls and refreshed when pantry.json, recipe_bom.json or menu.json changes.
+
+Usage:
+    uv run test_menu_stock.py
+"""
+
+import os
+
+import fire
+
+from test_helpers import scratch_menu, write
+
+
+def menu_of(*items) -> dict:
+    return {"menu": {name: {"name": name, "category": category, "price": price, "dietary": [],
+                            "description": f"House {name.lower()}."}
+                     for name, category, price in items}}
+
+
+MENU = menu_of(("Greek Salad", "Salads", "$12.99"), ("Pancakes", "Breakfast", "$11.99"),
+               ("Soup of the Day", "Soups", "$7.99"))
+BOM = {"recipes": {
+    "recipe_001": {"name": "Greek Salad", "ingredients": {"1": 2, "2": 1}},
+    "recipe_002": {"name": "Pancakes", "ingredients": {"3": 3}},
+}}
+
+
+def stock(response: dict) -> dict:
+    return {entry["name"]: (entry["in_stock"], entry["servings_available"]) for entry in response["items"]}
+
+
+def test_stock_follows_pantry_json():
+    with scratch_menu({"menu.json": MENU, "recipe_bom.json": BOM, "pantry.json": {"1": 9, "2": 3, "3": 2}}) as menu_server:
+        listed = menu_server.list_menu(detail="summary")
+        assert stock(listed) == {"Greek Salad": (True, 3), "Pancakes": (False, 0), "Soup of the Day": (None, None)}
+        # Nothing changed: the cached, annotated response is reused
+        assert menu_server.list_menu(detail="summary") is listed
+
+        write("pantry.json", {"1": 9, "2": 1, "3": 7}, 10**18)
+        assert stock(menu_server.list_menu(detail="summary")) == {
+            "Greek Salad": (True, 1), "Pancakes": (True, 2), "Soup of the Day": (None, None)}
+        item = menu_server.get_menu_item("Pancakes")["item"]
+        assert (item["in_stock"], item["servings_available"]) == (True, 2)
+        assert stock(menu_server.list_menu(category="Salads")) == {"Greek Salad": (True, 1)}
+
+        # A pantry that cannot be read leaves stock unknown until it can
+        write("pantry.json", '{"1": ', 2 * 10**18)
+        assert stock(menu_server.list_menu())["Greek Salad"] == (None, None)
+        write("pantry.json", {"1": 0, "2": 5, "3": 3}, 3 * 10**18)
+        assert stock(menu_server.list_menu())["Greek Salad"] == (False, 0)
+        os.remove("pantry.json")
+        assert stock(menu_server.list_menu())["Pancakes"] == (None, None)
+
+
+def test_stock_follows_recipes_and_menu():
+    with scratch_menu({"menu.json": MENU, "recipe_bom.json": BOM, "pantry.json": {"1": 9, "2": 3, "3": 2, "4": 4}}) as menu_server:
+        assert stock(menu_server.list_menu())["Soup of the Day"] == (None, None)
+
+        bom = {"recipes": {**BOM["recipes"], "recipe_003": {"name": "soup of the day", "ingredients": {"4": 1}}}}
+        write("recipe_bom.json", bom, 10**18)
+        assert stock(menu_server.list_menu())["Soup of the Day"] == (True, 4)
+
+        write("menu.json", menu_of(("Pancakes", "Breakfast", "$11.99"), ("Waffles", "Breakfast", "$10.99")), 10**18)
+        assert menu_server.reload_menu() is True
+        assert stock(menu_server.list_menu()) == {"Pancakes": (False, 0), "Waffles": (None, None)}
+        assert menu_server.get_menu_item("Waffles")["item"]["servings_available"] is None
+
+
+def main():
+    print("🧪 Testing the menu stock view...\n")
+    test_stock_follows_pantry_json()
+    print("   ✅ Servings are cached and refreshed when pantry.json changes")
+    test_stock_follows_recipes_and_menu()
+    print("   ✅ Servings are refreshed when recipe_bom.json or menu.json changes")
+    print("\n✅ Menu stock view works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for order_up's operation log and snapshot compaction.
+
+Runs order_up in a scratch directory, makes the snapshot write fail and checks
+that the log is kept, then that a later compaction folds it in and a restart
+sees every order.
+
+Usage:
+    uv run test_order_up_log.py
+"""
+
+import importlib
+import os
+
+import fire
+
+from test_helpers import scratch_order_up
+
+
+def test_failed_snapshot_keeps_the_log():
+    with scratch_order_up() as order_up:
+        for recipe in ("Greek Salad", "Pancakes", "Caesar Salad"):
+            order_up.accept_order(recipe, prep_time=0, cook_time=0)
+        logged = os.path.getsize(order_up.ORDERS_LOG)
+        assert logged > 0 and order_up.LOG_ENTRIES == 3
+
+        # A snapshot path in a missing directory cannot be written
+        order_up.ORDERS_FILE = os.path.join("missing", "chef_orders.json")
+        order_up.compact_orders()
+        assert os.path.getsize(order_up.ORDERS_LOG) == logged
+        assert order_up.LOG_ENTRIES == 3
+
+        order_up.ORDERS_FILE = "chef_orders.json"
+        order_up.compact_orders()
+        assert os.path.getsize(order_up.ORDERS_LOG) == 0
+        assert order_up.LOG_ENTRIES == 0
+
+        restarted = importlib.reload(order_up)
+        assert sorted(order["recipe"] for order in restarted.ORDERS_DATA["orders"].values()) == \
+            ["Caesar Salad", "Greek Salad", "Pancakes"]
+
+
+def main():
+    print("🧪 Testing the order_up log...\n")
+    test_failed_snapshot_keeps_the_log()
+    print("   ✅ The log is only truncated once a snapshot holds it")
+    print("\n✅ order_up log works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for order_up's list_ready_orders paging.
+
+Runs order_up in a scratch directory with orders in every live status and
+delivered orders spread over several archive day segments, and checks that
+following next_cursor visits each order once, in order, for every filter,
+including orders delivered while a client is paging.
+
+Usage:
+    uv run test_order_up_paging.py
+"""
+
+import time
+
+import fire
+
+from test_helpers import scratch_order_up
+
+
+def walk(order_up, limit: int, **filters) -> list:
+    """Follow next_cursor to the last page; return (order_id, status) in page order."""
+    seen, cursor = [], None
+    while True:
+        page = order_up.list_ready_orders(limit=limit, cursor=cursor, **filters)
+        assert len(page["ready_orders"]) <= limit
+        seen += [(order["order_id"], order["status"]) for order in page["ready_orders"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def deliver_on(order_up, order_id: int, day: str) -> None:
+    """Deliver an order as if on day, so it lands in that day's archive segment."""
+    timestamp = order_up._timestamp
+    order_up._timestamp = lambda at: f"{day}T12:00:00"
+    try:
+        assert order_up.mark_order_delivered(order_id)["success"]
+    finally:
+        order_up._timestamp = timestamp
+
+
+def accept_mixed(order_up) -> None:
+    """Orders 1-9: quick salads (ready) alternating with slow pancakes (cooking, then queued)."""
+    for i in range(9):
+        if i % 2:
+            order_up.accept_order("Pancakes", prep_time=30, cook_time=30)
+        else:
+            order_up.accept_order("Greek Salad", prep_time=0, cook_time=0)
+    time.sleep(0.05)
+
+
+def test_live_pages_across_statuses():
+    with scratch_order_up() as order_up:
+        accept_mixed(order_up)
+        everything = order_up.list_ready_orders()
+        live = [(order["order_id"], order["status"]) for order in everything["ready_orders"]]
+        assert [order_id for order_id, _ in live] == list(range(1, 10))
+        assert {status for _, status in live} == {"queued", "cooking", "ready"}
+        assert everything["next_cursor"] is None
+
+        for limit in (1, 2, 4, 9):
+            assert walk(order_up, limit) == live
+        ready = [entry for entry in live if entry[1] == "ready"]
+        assert walk(order_up, 2, status="ready") == ready
+        assert walk(order_up, 1, status="queued") == [entry for entry in live if entry[1] == "queued"]
+        assert walk(order_up, 3, since="2000-01-01T00:00") == live
+        assert order_up.list_ready_orders(since="2999-01-01T00:00")["ready_orders"] == []
+
+        # A cursor only continues the listing it came from
+        cursor = order_up.list_ready_orders(status="ready", limit=1)["next_cursor"]
+        assert not order_up.list_ready_orders(status="cooking", cursor=cursor).get("success", True)
+        assert not order_up.list_ready_orders(cursor="not-a-cursor").get("success", True)
+
+
+def test_delivered_pages_across_segments():
+    with scratch_order_up() as order_up:
+        accept_mixed(order_up)
+        deliver_on(order_up, 3, "2025-03-02")
+        deliver_on(order_up, 9, "2025-03-01")
+        deliver_on(order_up, 1, "2025-03-02")
+        deliver_on(order_up, 5, "2025-03-03")
+        deliver_on(order_up, 7, "2025-03-01")
+        assert len(order_up.ORDERS_DATA["archive_segments"]) == 3
+
+        # By delivery day, then in delivery order within the day
+        expected = [(9, "delivered"), (7, "delivered"), (3, "delivered"), (1, "delivered"), (5, "delivered")]
+        for limit in (1, 2, 3, 5):
+            assert walk(order_up, limit, status="delivered") == expected
+        page = order_up.list_ready_orders(status="delivered", limit=2)
+        assert [order["delivered_at"][:10] for order in page["ready_orders"]] == ["2025-03-01"] * 2
+        assert page["status_counts"]["delivered"] == 5
+        assert page["total_orders"] == 9
+
+        # Delivered orders have left the live listing
+        assert [order_id for order_id, _ in walk(order_up, 2)] == [2, 4, 6, 8]
+
+
+def test_delivered_while_paging():
+    with scratch_order_up() as order_up:
+        accept_mixed(order_up)
+        deliver_on(order_up, 9, "2025-03-01")
+        deliver_on(order_up, 7, "2025-03-01")
+        page = order_up.list_ready_orders(status="delivered", limit=1)
+        assert [order["order_id"] for order in page["ready_orders"]] == [9]
+
+        # Accepted before the orders already listed, delivered after the cursor was issued
+        deliver_on(order_up, 1, "2025-03-01")
+        rest = order_up.list_ready_orders(status="delivered", cursor=page["next_cursor"])
+        assert [order["order_id"] for order in rest["ready_orders"]] == [7, 1]
+
+
+def main():
+    print("🧪 Testing list_ready_orders paging...\n")
+    test_live_pages_across_statuses()
+    print("   ✅ Live orders page by ID across queued, cooking and ready")
+    test_delivered_pages_across_segments()
+    print("   ✅ Delivered orders page by day across archive segments")
+    test_delivered_while_paging()
+    print("   ✅ Orders delivered while paging are not skipped")
+    print("\n✅ list_ready_orders paging works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for the status index and served-order archive in orders_mcp_server.
+
+Checks on both storage backends that SERVED orders leave the live set but
+can still be looked up, that archived orders refuse any status but SERVED,
+and that the outstanding count follows every change. For JSON storage it
+checks the per-status index and per-day segments on disk, and that a file
+written before either existed is upgraded on load; for SQLite, that served
+rows left in the live table are moved to archived_orders on open.
+
+Usage:
+    uv run test_orders_archive.py
+"""
+
+import contextlib
+import io
+import json
+import sqlite3
+from datetime import datetime
+
+import fire
+
+from test_helpers import scratch_dir, scratch_orders_server
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import orders_mcp_server
+
+
+def check_served_orders_are_archived(storage: str):
+    with scratch_orders_server(storage) as server:
+        for name in ("Ann", "Bob", "Cat", "Dan"):
+            server.save_order(name, "soup", "5 min")
+        server.set_order_statuses([[2, "SERVED"], [3, "READY"], [4, "COOKING"]])
+
+        assert [order["order_id"] for order in server.list_orders()["orders"]] == [1, 3, 4]
+        assert server.STORE.count_outstanding() == 3
+        assert server.get_order_status(2) == "SERVED"
+        assert server.STORE.get_order(2)["name"] == "Bob"
+        assert server.set_order_status(2, "READY").startswith("Error")
+        assert not server.set_order_status(2, "SERVED").startswith("Error")
+        assert server.set_order_status(7, "READY").startswith("Error")
+        assert [order["order_id"] for order in server.STORE.all_orders()] == [1, 2, 3, 4]
+
+        server.set_order_statuses([[1, "SERVED"], [3, "SERVED"]])
+        assert server.STORE.count_outstanding() == 1
+        assert [order["status"] for order in server.STORE.all_orders()] == ["SERVED", "SERVED", "SERVED", "COOKING"]
+
+
+def test_served_orders_are_archived():
+    for storage in ("json", "sqlite"):
+        check_served_orders_are_archived(storage)
+
+
+def test_json_files_hold_only_live_orders():
+    with scratch_orders_server("json") as server:
+        for name in ("Ann", "Bob", "Cat", "Dan", "Eve"):
+            server.save_order(name, "soup", "5 min")
+        server.set_order_statuses([[4, "READY"], [2, "COOKING"], [1, "READY"], [3, "SERVED"], [5, "SERVED"]])
+
+        with open("orders.json") as f:
+            data = json.load(f)
+        assert sorted(data["orders"]) == ["1", "2", "4"]
+        assert data["status_index"] == {"RECEIVED": [], "COOKING": [2], "READY": [1, 4]}
+        today = datetime.now().date().isoformat()
+        assert data["archive_segments"] == [{"date": today, "min_id": 3, "max_id": 5}]
+        with open(f"orders_archive/orders-{today}.jsonl") as f:
+            assert [json.loads(line)["order_id"] for line in f] == [3, 5]
+
+
+def test_json_upgrades_old_files():
+    old = {"next_order_id": 4, "orders": {
+        "1": {"order_id": 1, "name": "Ann", "order_details": "soup", "estimated_wait_time": "10 min",
+              "status": "SERVED", "created_at": "2024-05-01T12:00:00", "updated_at": "2024-05-01T12:30:00"},
+        "2": {"order_id": 2, "name": "Bob", "order_details": "tea", "estimated_wait_time": "5 min",
+              "status": "READY", "created_at": "2024-05-02T09:00:00", "updated_at": "2024-05-02T09:05:00"},
+        "3": {"order_id": 3, "name": "Cat", "order_details": "pie", "estimated_wait_time": "soon",
+              "status": "RECEIVED", "created_at": "2024-05-02T09:01:00", "updated_at": "2024-05-02T09:01:00"},
+    }}
+    with scratch_dir({"orders.json": old}), contextlib.redirect_stdout(io.StringIO()):
+        store = orders_mcp_server.JsonOrderStore("orders.json", "orders_archive")
+        assert [order["order_id"] for order in store.list_outstanding()] == [2, 3]
+        assert store.get_order(1)["status"] == "SERVED"
+        assert store.get_order(2)["due_at"] == "2024-05-02T09:05:00"
+        assert store.create_order("Dan", "soup", "5 min")["order_id"] == 4
+        with open("orders.json") as f:
+            data = json.load(f)
+        assert data["status_index"] == {"RECEIVED": [3, 4], "COOKING": [], "READY": [2]}
+        assert data["archive_segments"] == [{"date": "2024-05-01", "min_id": 1, "max_id": 1}]
+
+
+def test_sqlite_archives_served_rows_on_open():
+    with scratch_orders_server("sqlite") as server:
+        server.save_order("Ann", "soup", "5 min")
+        server.save_order("Bob", "tea", "5 min")
+        server.set_order_status(1, "SERVED")
+        archived = server.STORE.conn.execute("SELECT order_id, archived_on FROM archived_orders").fetchall()
+        assert [tuple(row) for row in archived] == [(1, datetime.now().date().isoformat())]
+        assert server.STORE.conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 1
+
+        # A row marked SERVED behind the store's back is archived the next time the database opens
+        with sqlite3.connect("orders.db") as conn:
+            conn.execute("UPDATE orders SET status = 'SERVED' WHERE order_id = 2")
+        reopened = orders_mcp_server.create_store("sqlite", "orders.db", "orders.json", "orders_archive")
+        assert reopened.count_outstanding() == 0
+        assert reopened.get_order(2)["status"] == "SERVED"
+
+
+def main():
+    print("🧪 Testing the order archive...\n")
+    for storage in ("json", "sqlite"):
+        check_served_orders_are_archived(storage)
+        print(f"   ✅ {storage}: served orders leave the live set but can still be looked up")
+    test_json_files_hold_only_live_orders()
+    print("   ✅ json: orders.json keeps live orders by status, served ones go to day segments")
+    test_json_upgrades_old_files()
+    print("   ✅ json: files from before the index and archive are upgraded on load")
+    test_sqlite_archives_served_rows_on_open()
+    print("   ✅ sqlite: served rows move to archived_orders")
+    print("\n✅ Order archive works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
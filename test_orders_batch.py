@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for the batch order tools in orders_mcp_server.
+
+Checks on both storage backends that save_orders and set_order_statuses
+apply a whole batch with a single durable write, return one result per
+input in input order, and that save_orders saves nothing when any order in
+the batch is invalid.
+
+Usage:
+    uv run test_orders_batch.py
+"""
+
+import contextlib
+
+import fire
+
+from test_helpers import scratch_orders_server
+
+
+@contextlib.contextmanager
+def count_writes(store):
+    """Count durable writes: orders.json saves, or committed SQLite transactions."""
+    writes = []
+    if hasattr(store, "conn"):
+        store.conn.set_trace_callback(lambda sql: sql.strip().upper() == "COMMIT" and writes.append(sql))
+        try:
+            yield writes
+        finally:
+            store.conn.set_trace_callback(None)
+    else:
+        save = store.save
+        store.save = lambda data: (writes.append(data), save(data))
+        try:
+            yield writes
+        finally:
+            del store.save
+
+
+def check_save_orders(storage: str):
+    with scratch_orders_server(storage) as server:
+        table = [
+            {"name": "Ann", "order_details": "soup", "estimated_wait_time": "5 min"},
+            {"name": "Bob", "order_details": "tea", "estimated_wait_time": "2 min", "status": "READY"},
+            {"name": "Cat", "order_details": "pie", "estimated_wait_time": "10 min"},
+        ]
+        with count_writes(server.STORE) as writes:
+            result = server.save_orders(table, status="COOKING")
+        assert len(writes) == 1
+        assert result["order_ids"] == [1, 2, 3] and result["count"] == 3, result
+        assert [server.get_order_status(order_id) for order_id in (1, 2, 3)] == ["COOKING", "READY", "COOKING"]
+
+        # One bad order rejects the whole batch before anything is written
+        with count_writes(server.STORE) as writes:
+            missing = server.save_orders([{"name": "Dan", "order_details": "stew", "estimated_wait_time": "5 min"},
+                                          {"name": "Eve", "order_details": ""}])
+            invalid = server.save_orders([{"name": "Fay", "order_details": "soup", "estimated_wait_time": "5 min",
+                                           "status": "SERVED"}])
+        assert not missing["success"] and "Order 1" in missing["message"]
+        assert not invalid["success"] and "SERVED" in invalid["message"]
+        assert writes == [] and server.list_orders()["total_outstanding"] == 3
+        assert server.save_order("Dan", "stew", "5 min") == 4
+
+
+def test_save_orders():
+    for storage in ("json", "sqlite"):
+        check_save_orders(storage)
+
+
+def check_set_order_statuses(storage: str):
+    with scratch_orders_server(storage) as server:
+        for name in ("Ann", "Bob", "Cat"):
+            server.save_order(name, "soup", "5 min")
+        server.set_order_status(3, "SERVED")
+
+        updates = [[1, "COOKING"], [2, "READY"], [1, "READY"], [9, "READY"], [2, "DONE"], [3, "READY"], [3, "SERVED"]]
+        with count_writes(server.STORE) as writes:
+            result = server.set_order_statuses(updates)
+        assert len(writes) == 1
+        assert [entry["order_id"] for entry in result["results"]] == [update[0] for update in updates]
+        assert [entry["success"] for entry in result["results"]] == [True, True, True, False, False, False, True]
+        assert "not found" in result["results"][3]["message"]
+        assert "Invalid status" in result["results"][4]["message"]
+        assert "archived" in result["results"][5]["message"]
+        assert (result["updated"], result["failed"]) == (4, 3)
+        # Updates to the same order apply in input order
+        assert server.get_order_status(1) == "READY" and server.get_order_status(2) == "READY"
+        assert server.get_order_status(3) == "SERVED"
+
+        result = server.set_order_statuses([[9, "READY"], [1, "LATE"]])
+        assert (result["updated"], result["failed"]) == (0, 2) and server.get_order_status(1) == "READY"
+
+        # Serving a batch moves every order out of the outstanding list at once
+        result = server.set_order_statuses([[1, "SERVED"], [2, "SERVED"]])
+        assert result["updated"] == 2 and server.list_orders()["total_outstanding"] == 0
+
+
+def test_set_order_statuses():
+    for storage in ("json", "sqlite"):
+        check_set_order_statuses(storage)
+
+
+def main():
+    print("🧪 Testing batch order tools...\n")
+    for storage in ("json", "sqlite"):
+        check_save_orders(storage)
+        print(f"   ✅ {storage}: save_orders writes a table at once, or nothing if an order is invalid")
+        check_set_order_statuses(storage)
+        print(f"   ✅ {storage}: set_order_statuses reports each update and writes once")
+    print("\n✅ Batch order tools work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
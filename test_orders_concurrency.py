@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Stress test for concurrent orders_mcp_server writers.
+
+Starts several writer processes against one order store, the way several
+waiter replicas each run their own orders_mcp_server.py, and checks that no
+update is lost and no order_id is handed out twice. Prints the throughput.
+
+Usage:
+    uv run test_orders_concurrency.py --storage=json --processes=8 --orders=200
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+
+import fire
+
+import orders_mcp_server
+
+
+def open_store(storage: str, workdir: str):
+    return orders_mcp_server.create_store(
+        storage,
+        db_path=os.path.join(workdir, "orders.db"),
+        orders_file=os.path.join(workdir, "orders.json"),
+        archive_dir=os.path.join(workdir, "orders_archive"),
+    )
+
+
+def writer(storage: str, workdir: str, worker_id: int, orders: int):
+    """Create orders one at a time, move each to COOKING, and serve every other one."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        store = open_store(storage, workdir)
+        for i in range(orders):
+            order = store.create_order(f"worker{worker_id}", f"dish {i}", "10 minutes")
+            store.update_status(order["order_id"], "COOKING")
+            if i % 2 == 0:
+                store.update_status(order["order_id"], "SERVED")
+
+
+def run_stress(storage: str = "json", processes: int = 8, orders: int = 200) -> dict:
+    """Run the writers in a scratch directory and verify the resulting store."""
+    with tempfile.TemporaryDirectory(prefix="orders-stress-") as workdir:
+        served_per_worker = (orders + 1) // 2
+        operations = processes * (orders * 2 + served_per_worker)
+
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=writer, args=(storage, workdir, worker_id, orders))
+            for worker_id in range(processes)
+        ]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - start
+        assert all(p.exitcode == 0 for p in workers), "a writer process failed"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = open_store(storage, workdir)
+            total = processes * orders
+            found = [store.get_order(order_id) for order_id in range(1, total + 1)]
+            outstanding = store.list_outstanding()
+            seq = store.current_seq()
+            extra = store.get_order(total + 1)
+
+        # Every ID from 1..total exists exactly once and nothing beyond it
+        assert all(found), f"missing orders: {[i + 1 for i, o in enumerate(found) if not o]}"
+        assert extra is None, f"unexpected order #{total + 1}"
+        per_worker = {}
+        for order in found:
+            per_worker.setdefault(order["name"], []).append(order)
+        assert sorted(len(v) for v in per_worker.values()) == [orders] * processes
+        # Status updates were not lost: served orders are archived, the rest are COOKING
+        assert len(outstanding) == processes * (orders - served_per_worker)
+        assert all(order["status"] == "COOKING" for order in outstanding)
+        assert sum(order["status"] == "SERVED" for order in found) == processes * served_per_worker
+        assert seq == operations, f"expected {operations} changes, feed is at {seq}"
+
+        return {
+            "storage": storage,
+            "processes": processes,
+            "orders": total,
+            "operations": operations,
+            "seconds": round(elapsed, 3),
+            "ops_per_second": round(operations / elapsed, 1),
+        }
+
+
+def test_writer_ignores_unchanged_looking_file():
+    """A write the stat signature cannot see (coarse mtime, same size, reused inode) is still picked up."""
+    with tempfile.TemporaryDirectory(prefix="orders-stale-") as workdir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            first, second = open_store("json", workdir), open_store("json", workdir)
+            assert first.create_order("ann", "dish", "10 minutes")["order_id"] == 1
+            assert second.create_order("bob", "dish", "10 minutes")["order_id"] == 2
+            assert first.create_order("cy", "dish", "10 minutes")["order_id"] == 3
+            # Make the second store believe its cached copy matches the file on disk
+            second._signature = second._file_signature()
+            assert second.create_order("dee", "dish", "10 minutes")["order_id"] == 4
+            assert {order["name"] for order in open_store("json", workdir).list_outstanding()} == {"ann", "bob", "cy", "dee"}
+
+
+def test_concurrent_writers():
+    for storage in ("json", "sqlite"):
+        run_stress(storage, processes=4, orders=25)
+
+
+def main(storage: str = "both", processes: int = 8, orders: int = 200):
+    print("🧪 Stress testing concurrent order writers...\n")
+    backends = ["json", "sqlite"] if storage == "both" else [storage]
+    for backend in backends:
+        result = run_stress(backend, processes, orders)
+        print(f"   ✅ {backend}: {result['orders']} orders / {result['operations']} writes "
+              f"from {processes} processes in {result['seconds']}s "
+              f"({result['ops_per_second']} writes/s), no lost updates or duplicate IDs")
+    test_writer_ignores_unchanged_looking_file()
+    print("   ✅ json: a write hidden from the file's stat signature is still seen")
+    print("\n✅ Concurrent writers are safe!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
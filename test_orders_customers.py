@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for find_orders_by_customer in orders_mcp_server.
+
+Checks on both storage backends that a customer's outstanding orders are
+found by case-insensitive name prefix, in order_id order, that served
+orders drop out, and that characters SQL LIKE treats as wildcards match
+only themselves. It also checks that SQLite answers from its name index
+and that the JSON name index follows orders written by another server
+process.
+
+Usage:
+    uv run test_orders_customers.py
+"""
+
+import contextlib
+import io
+
+import fire
+
+from test_helpers import scratch_dir, scratch_orders_server, scratch_store
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import orders_mcp_server
+
+NAMES = ["Alice", "bob", "ALISON", "Al", "Bobby", "alice", "A_x", "A%", "Ab"]
+
+
+def found(server, name: str) -> list:
+    result = server.find_orders_by_customer(name)
+    assert result["count"] == len(result["orders"])
+    return [order["order_id"] for order in result["orders"]]
+
+
+def check_find_by_customer(storage: str):
+    with scratch_orders_server(storage) as server:
+        for name in NAMES:
+            server.save_order(name, "soup", "5 min")
+
+        assert found(server, "ali") == [1, 3, 6]
+        assert found(server, "ALICE") == [1, 6]
+        assert found(server, "  bob ") == [2, 5]
+        assert found(server, "al") == [1, 3, 4, 6]
+        assert found(server, "Alicia") == []
+        # Wildcards in SQL LIKE are plain characters in a name
+        assert found(server, "a_") == [7]
+        assert found(server, "a%") == [8]
+        assert found(server, "") == list(range(1, len(NAMES) + 1))
+
+        server.set_order_statuses([[1, "READY"], [6, "SERVED"]])
+        result = server.find_orders_by_customer("alice")
+        assert [(order["order_id"], order["status"]) for order in result["orders"]] == [(1, "READY")]
+        assert result["name"] == "alice"
+
+
+def test_find_by_customer():
+    for storage in ("json", "sqlite"):
+        check_find_by_customer(storage)
+
+
+def test_sqlite_prefix_uses_name_index():
+    with scratch_store("sqlite") as store:
+        statements = []
+        store.conn.set_trace_callback(statements.append)
+        store.find_by_customer("al")
+        store.conn.set_trace_callback(None)
+        query = next(sql for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+        plan = " ".join(row[3] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert "idx_orders_name" in plan, plan
+
+
+def test_json_index_follows_other_writers():
+    with scratch_dir(), contextlib.redirect_stdout(io.StringIO()):
+        writer, reader = (orders_mcp_server.JsonOrderStore("orders.json", "orders_archive") for _ in range(2))
+        writer.create_order("Dana", "soup", "5 min")
+        assert [order["order_id"] for order in reader.find_by_customer("da")] == [1]
+        writer.create_order("Dan", "tea", "5 min")
+        writer.update_status(1, "SERVED")
+        assert [order["order_id"] for order in reader.find_by_customer("da")] == [2]
+
+
+def main():
+    print("🧪 Testing find_orders_by_customer...\n")
+    for storage in ("json", "sqlite"):
+        check_find_by_customer(storage)
+        print(f"   ✅ {storage}: outstanding orders found by case-insensitive name prefix")
+    test_sqlite_prefix_uses_name_index()
+    print("   ✅ sqlite: a name prefix is a range scan of idx_orders_name")
+    test_json_index_follows_other_writers()
+    print("   ✅ json: the name index follows other writers")
+    print("\n✅ find_orders_by_customer works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for order ETAs and overdue_orders in orders_mcp_server.
+
+Checks that parse_wait_minutes reads only numbers with a time unit (or a
+bare number), that each order's due_at is its creation time plus that wait,
+and that both storage backends list late orders, most overdue first, without
+sorting every open order.
+
+Usage:
+    uv run test_orders_overdue.py
+"""
+
+import contextlib
+import io
+from datetime import datetime, timedelta
+
+import fire
+
+from test_helpers import scratch_dir, scratch_store
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import orders_mcp_server
+    from orders_mcp_server import parse_wait_minutes
+
+WAITS = {
+    "15 minutes": 15,
+    "1h 30m": 90,
+    "1 hour": 60,
+    "1.5 hours": 90,
+    "20-25 mins": 25,
+    "20 to 25 minutes": 25,
+    "about 45 min": 45,
+    "25": 25,
+    "20-25": 25,
+    "2 pizzas, 10 min": 10,
+    "ready by 7:30": None,
+    "2 pizzas": None,
+    "soon": None,
+    "": None,
+    None: None,
+}
+
+
+def at(order: dict, minutes: float) -> str:
+    """The ISO timestamp `minutes` after an order was created."""
+    return (datetime.fromisoformat(order["created_at"]) + timedelta(minutes=minutes)).isoformat(timespec="seconds")
+
+
+def test_parse_wait_minutes():
+    for text, minutes in WAITS.items():
+        assert parse_wait_minutes(text) == minutes, (text, parse_wait_minutes(text))
+
+
+def check_overdue_in_due_order(storage: str):
+    with scratch_store(storage) as store:
+        waits = ["1h 30m", "ready by 7:30", "20-25 mins", "0 minutes", "2 pizzas, 10 min"]
+        orders = [store.create_order(f"guest{i}", "dish", wait) for i, wait in enumerate(waits, start=1)]
+        for order, wait in zip(orders, waits):
+            assert order["eta_minutes"] == parse_wait_minutes(wait)
+            expected = at(order, order["eta_minutes"]) if order["eta_minutes"] is not None else None
+            assert order["due_at"] == expected
+
+        first = orders[0]
+        ids = lambda late: [order["order_id"] for order in late]
+        # Not yet late: nothing due before the earliest ETA
+        assert ids(store.overdue(at(first, -1))) == []
+        assert ids(store.overdue(at(first, 15))) == [4, 5]
+        assert ids(store.overdue(at(first, 120))) == [4, 5, 3, 1]
+        assert ids(store.overdue(at(first, 120), limit=2)) == [4, 5]
+        # An order without a parseable ETA is never overdue
+        assert 2 not in ids(store.overdue(at(first, 10_000)))
+
+        store.update_status(4, "COOKING")
+        store.update_status(5, "SERVED")
+        assert ids(store.overdue(at(first, 120))) == [4, 3, 1]
+        store.create_order("guest6", "dish", "5 min")
+        assert ids(store.overdue(at(first, 120))) == [4, 6, 3, 1]
+
+
+def test_overdue_in_due_order():
+    for storage in ("json", "sqlite"):
+        check_overdue_in_due_order(storage)
+
+
+def test_json_index_survives_reload():
+    with scratch_dir(), contextlib.redirect_stdout(io.StringIO()):
+        writer, reader = (orders_mcp_server.create_store("json", "orders.db", "orders.json", "orders_archive")
+                          for _ in range(2))
+        first = writer.create_order("ann", "dish", "30 min")
+        assert reader.overdue(at(first, 60)) and reader.overdue(at(first, 60))[0]["order_id"] == 1
+        # Another writer's changes rebuild the reader's due_at index
+        writer.create_order("bob", "dish", "10 min")
+        writer.update_status(1, "SERVED")
+        assert [order["order_id"] for order in reader.overdue(at(first, 60))] == [2]
+
+
+def test_sqlite_range_scans_due_at():
+    with scratch_store("sqlite") as store:
+        statements = []
+        store.conn.set_trace_callback(statements.append)
+        store.overdue(datetime.now().isoformat(timespec="seconds"), limit=5)
+        store.conn.set_trace_callback(None)
+        query = next(sql for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+        plan = " ".join(row[3] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert "idx_orders_due_at" in plan and "TEMP B-TREE" not in plan, plan
+
+
+def test_overdue_orders_tool():
+    with scratch_store("json") as store:
+        store.create_order("ann", "dish", "0 minutes")
+        store.create_order("bob", "dish", "1 hour")
+        default, orders_mcp_server.STORE = orders_mcp_server.STORE, store
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = orders_mcp_server.overdue_orders()
+        finally:
+            orders_mcp_server.STORE = default
+        assert [order["name"] for order in result["orders"]] == ["ann"]
+        assert result["orders"][0]["minutes_late"] == 0 and result["count"] == 1
+
+
+def main():
+    print("🧪 Testing order ETAs and overdue_orders...\n")
+    test_parse_wait_minutes()
+    print("   ✅ Wait times count only numbers with a unit, or a bare number")
+    for storage in ("json", "sqlite"):
+        check_overdue_in_due_order(storage)
+        print(f"   ✅ {storage}: late orders come out most overdue first, not-yet-late ones stay out")
+    test_json_index_survives_reload()
+    print("   ✅ json: the due_at index follows other writers")
+    test_sqlite_range_scans_due_at()
+    print("   ✅ sqlite: overdue range-scans idx_orders_due_at with no sort")
+    test_overdue_orders_tool()
+    print("   ✅ overdue_orders reports how late each order is")
+    print("\n✅ Order ETAs work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for list_orders paging, projection and sorting in orders_mcp_server.
+
+Checks on both storage backends that every sort order pages through all
+outstanding orders exactly once, that a cursor keeps its place when orders
+before it are served or new ones arrive, that fields projects each order
+down (always keeping order_id), and that bad arguments are reported.
+
+Usage:
+    uv run test_orders_paging.py
+"""
+
+import fire
+
+from test_helpers import scratch_orders_server
+
+STATUSES = ["READY", "RECEIVED", "COOKING", "RECEIVED", "READY", "COOKING", "RECEIVED"]
+
+
+def ids(page: dict) -> list:
+    return [order["order_id"] for order in page["orders"]]
+
+
+def walk(server, limit: int, **sort) -> list:
+    """Every page of list_orders, as lists of order IDs."""
+    pages, cursor = [], None
+    while True:
+        page = server.list_orders(limit=limit, cursor=cursor, **sort)
+        pages.append(ids(page))
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def check_sorting_and_paging(storage: str):
+    with scratch_orders_server(storage) as server:
+        server.save_orders([{"name": f"guest{i}", "order_details": "soup", "estimated_wait_time": "5 min",
+                             "status": status} for i, status in enumerate(STATUSES, start=1)])
+        by_created = [1, 2, 3, 4, 5, 6, 7]
+        by_status = [2, 4, 7, 3, 6, 1, 5]
+
+        assert ids(server.list_orders()) == by_created
+        assert ids(server.list_orders(descending=True)) == by_created[::-1]
+        assert ids(server.list_orders(sort_by="status")) == by_status
+        assert ids(server.list_orders(sort_by="status", descending=True)) == by_status[::-1]
+        for sort in ({}, {"descending": True}, {"sort_by": "status"}, {"sort_by": "status", "descending": True}):
+            expected = ids(server.list_orders(**sort))
+            for limit in (1, 2, 3, 7, 8):
+                pages = walk(server, limit, **sort)
+                assert sum(pages, []) == expected, (sort, limit, pages)
+                assert all(len(page) == limit for page in pages[:-1]) and pages[-1]
+
+        first = server.list_orders(limit=3)
+        assert (first["count"], first["total_outstanding"]) == (3, 7)
+        assert server.list_orders(limit=7)["next_cursor"] is None
+
+        # The cursor is a position, not an offset: serving earlier orders skips nothing
+        server.set_order_statuses([[1, "SERVED"], [4, "SERVED"]])
+        server.save_order("late", "tea", "5 min")
+        rest = server.list_orders(cursor=first["next_cursor"])
+        assert ids(rest) == [5, 6, 7, 8] and rest["total_outstanding"] == 6
+        # Moving an order past the cursor in status order shows it again, once
+        page = server.list_orders(sort_by="status", limit=2)
+        assert ids(page) == [2, 7]
+        server.set_order_status(2, "READY")
+        assert ids(server.list_orders(sort_by="status", cursor=page["next_cursor"])) == [8, 3, 6, 2, 5]
+
+
+def test_sorting_and_paging():
+    for storage in ("json", "sqlite"):
+        check_sorting_and_paging(storage)
+
+
+def check_projection_and_errors(storage: str):
+    with scratch_orders_server(storage) as server:
+        server.save_order("Ann", "soup", "5 min")
+        server.save_order("Bob", "tea", "2 min", status="READY")
+
+        page = server.list_orders(fields=["name", "status"])
+        assert page["orders"] == [{"order_id": 1, "name": "Ann", "status": "RECEIVED"},
+                                  {"order_id": 2, "name": "Bob", "status": "READY"}]
+        assert list(server.list_orders(fields=["status", "order_id"])["orders"][0]) == ["order_id", "status"]
+        assert set(server.list_orders()["orders"][0]) == set(server.ORDER_FIELDS)
+        assert page["seq"] == server.STORE.current_seq() == 2
+
+        assert not server.list_orders(fields=["name", "secret"])["success"]
+        assert not server.list_orders(sort_by="name")["success"]
+        assert not server.list_orders(limit=0)["success"]
+        assert not server.list_orders(cursor="not a cursor")["success"]
+        cursor = server.list_orders(limit=1)["next_cursor"]
+        assert not server.list_orders(cursor=cursor, descending=True)["success"]
+        assert not server.list_orders(cursor=cursor, sort_by="status")["success"]
+        assert ids(server.list_orders(cursor=cursor)) == [2]
+
+
+def test_projection_and_errors():
+    for storage in ("json", "sqlite"):
+        check_projection_and_errors(storage)
+
+
+def main():
+    print("🧪 Testing list_orders paging...\n")
+    for storage in ("json", "sqlite"):
+        check_sorting_and_paging(storage)
+        print(f"   ✅ {storage}: every sort pages through each order once, cursors survive changes")
+        check_projection_and_errors(storage)
+        print(f"   ✅ {storage}: fields projects orders, bad arguments are reported")
+    print("\n✅ list_orders paging works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+# ]
+# ///
+"""Test for the orders change feed and watch_orders in orders_mcp_server.
+
+Checks on both storage backends that every create and status change gets
+the next sequence number, that changes_since and watch_orders return only
+what came after since_seq, that watch_orders wakes up on a change rather
+than waiting out its timeout, and that a reader whose position fell out of
+the retained log is told to re-read. For JSON storage it also follows the
+change log from a second store while the writer compacts it.
+
+Usage:
+    uv run test_orders_watch.py
+"""
+
+import asyncio
+import contextlib
+import io
+import threading
+import time
+
+import fire
+
+from test_helpers import scratch_dir, scratch_orders_server
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import orders_mcp_server
+
+
+def summary(changes) -> list:
+    return [(change["seq"], change["order_id"], change["old_status"], change["status"]) for change in changes]
+
+
+def check_change_feed(storage: str):
+    with scratch_orders_server(storage) as server:
+        store = server.STORE
+        assert store.current_seq() == 0 and store.changes_since(0) == ([], False)
+        server.save_orders([{"name": "ann", "order_details": "soup", "estimated_wait_time": "5 min"},
+                            {"name": "bob", "order_details": "tea", "estimated_wait_time": "2 min"}])
+        server.set_order_status(1, "COOKING")
+        server.set_order_statuses([[2, "READY"], [1, "SERVED"], [9, "READY"]])
+
+        changes, truncated = store.changes_since(0)
+        assert not truncated
+        assert summary(changes) == [(1, 1, None, "RECEIVED"), (2, 2, None, "RECEIVED"), (3, 1, "RECEIVED", "COOKING"),
+                                    (4, 2, "RECEIVED", "READY"), (5, 1, "COOKING", "SERVED")]
+        assert changes[-1]["order"]["status"] == "SERVED" and changes[0]["order"]["name"] == "ann"
+        assert summary(store.changes_since(3)[0]) == summary(changes[3:])
+        assert store.current_seq() == 5
+
+        result = asyncio.run(server.watch_orders(since_seq=2, timeout=0))
+        assert (result["count"], result["seq"], result["truncated"]) == (3, 5, False)
+        # Nothing new: returns at the timeout with the current seq
+        result = asyncio.run(server.watch_orders(since_seq=5, timeout=0.1))
+        assert (result["changes"], result["seq"]) == ([], 5)
+
+        # A change wakes the watcher long before its timeout
+        later = threading.Timer(0.2, server.save_order, ("cat", "pie", "10 min"))
+        later.start()
+        started = time.monotonic()
+        result = asyncio.run(server.watch_orders(since_seq=5, timeout=10))
+        later.join()
+        assert time.monotonic() - started < 5
+        assert summary(result["changes"]) == [(6, 3, None, "RECEIVED")] and result["seq"] == 6
+
+
+def test_change_feed():
+    for storage in ("json", "sqlite"):
+        check_change_feed(storage)
+
+
+def check_truncated(storage: str):
+    retained = orders_mcp_server.CHANGE_LOG_SIZE
+    orders_mcp_server.CHANGE_LOG_SIZE = 4
+    try:
+        with scratch_orders_server(storage) as server:
+            for i in range(10):
+                server.save_order(f"guest{i}", "soup", "5 min")
+            changes, truncated = server.STORE.changes_since(0)
+            assert truncated and changes[-1]["seq"] == 10
+            assert [change["seq"] for change in changes] == list(range(changes[0]["seq"], 11))
+            assert not server.STORE.changes_since(8)[1]
+            assert asyncio.run(server.watch_orders(since_seq=0, timeout=0))["truncated"]
+    finally:
+        orders_mcp_server.CHANGE_LOG_SIZE = retained
+
+
+def test_truncated_feed():
+    for storage in ("json", "sqlite"):
+        check_truncated(storage)
+
+
+def test_json_reader_follows_compaction():
+    retained = orders_mcp_server.CHANGE_LOG_SIZE
+    orders_mcp_server.CHANGE_LOG_SIZE = 4
+    try:
+        with scratch_dir(), contextlib.redirect_stdout(io.StringIO()):
+            writer, reader = (orders_mcp_server.JsonOrderStore("orders.json", "orders_archive") for _ in range(2))
+            for i in range(1, 61):
+                writer.create_order(f"guest{i}", "soup", "5 min")
+                if i % 8:
+                    continue
+                # Two compactions since the last read: the log may be back on the inode it was
+                # read from, but the reader must not resume at its old offset
+                changes, truncated = reader.changes_since(i - 8)
+                seqs = [change["seq"] for change in changes]
+                assert truncated and seqs == list(range(seqs[0], i + 1)), (i, seqs)
+    finally:
+        orders_mcp_server.CHANGE_LOG_SIZE = retained
+
+
+def main():
+    print("🧪 Testing the orders change feed...\n")
+    for storage in ("json", "sqlite"):
+        check_change_feed(storage)
+        print(f"   ✅ {storage}: changes come in seq order and watch_orders wakes on the next one")
+        check_truncated(storage)
+        print(f"   ✅ {storage}: readers behind the retained log are told to re-read")
+    test_json_reader_follows_compaction()
+    print("   ✅ json: other stores follow the change log across compactions")
+    print("\n✅ Orders change feed works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
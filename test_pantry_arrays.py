@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for the NumPy arrays behind pantry_mcp_server's inventory.
+
+Runs the pantry in a scratch directory and checks that the arrays hold one
+slot per food seen, so sparse and large IDs stay small in memory, that invalid
+IDs are rejected, that whole quantities stay ints in responses, and that
+quantities round-trip through pantry.json.
+
+Usage:
+    uv run test_pantry_arrays.py
+"""
+
+import fire
+
+from test_helpers import scratch_pantry, write
+
+FOODS = {"2": {"id": 2, "name": "Eggs"}, "7": {"id": 7, "name": "Butter"}, "40": {"id": 40, "name": "Cream"}}
+
+
+def test_sparse_ids_and_growth():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"40": 2.5, "7": 0, "2": 12}}) as pantry:
+        # Listings come out in ID order whatever the slot order, empty items included
+        listed = pantry.list_pantry()["items"]
+        assert [(item["food_id"], item["quantity"]) for item in listed] == [(2, 12), (7, 0), (40, 2.5)]
+        assert isinstance(listed[0]["quantity"], int)
+
+        # A stray large ID takes one slot, not an array the size of the ID
+        assert pantry.add_ingredients({str(pantry.MAX_FOOD_ID): 3, "5000": 1, "3": 2})["success"]
+        assert len(pantry.QUANTITIES) < 16
+        assert len(pantry.IN_PANTRY) == len(pantry.VERSIONS) == len(pantry.RESERVED) == len(pantry.QUANTITIES)
+        assert pantry.check_pantry(food_id=5000)["name"] == "Unknown(5000)"
+        # Growing the arrays kept every earlier quantity and version
+        batch = pantry.check_pantry(food_ids=[40, 2, 1])["items"]
+        assert [(item["food_id"], item["quantity"], item["available"]) for item in batch] == [
+            (40, 2.5, True), (2, 12, True), (1, 0, False)]
+        listed = pantry.list_pantry()["items"]
+        assert [item["food_id"] for item in listed] == [2, 3, 7, 40, 5000, pantry.MAX_FOOD_ID]
+        low = pantry.get_low_stock_items(threshold=2)["low_stock_items"]
+        assert [item["food_id"] for item in low] == [7, 5000, 3]
+
+
+def test_invalid_ids_are_rejected():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"2": 12}}) as pantry:
+        size = len(pantry.QUANTITIES)
+        for ingredients in ({"-1": 1}, {str(pantry.MAX_FOOD_ID + 1): 1}, {"2": 1, "02": 1}, {"two": 1}):
+            assert not pantry.add_ingredients(ingredients)["success"], ingredients
+            assert not pantry.take_ingredients(ingredients)["success"], ingredients
+        assert pantry.check_pantry(food_ids=[2, -3])["success"] is False
+        assert len(pantry.QUANTITIES) == size
+        assert pantry.check_pantry(food_id=2)["quantity"] == 12
+
+
+def test_versions_and_reload():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"2": 12, "7": 4}}) as pantry:
+        before = pantry.check_pantry(food_ids=[2, 7])["items"]
+        assert pantry.take_ingredients({"2": 0.5})["success"]
+        after = pantry.check_pantry(food_ids=[2, 7])["items"]
+        assert after[0]["version"] > before[0]["version"] and after[1]["version"] == before[1]["version"]
+        assert after[0]["quantity"] == 11.5
+
+        # Another process rewrites pantry.json: the arrays are rebuilt from it
+        write("pantry.json", {"2": 1, "40": 6}, mtime_ns=1)
+        listed = pantry.list_pantry()["items"]
+        assert [(item["food_id"], item["quantity"]) for item in listed] == [(2, 1), (40, 6)]
+        slot = pantry._FOOD_SLOTS[7]
+        assert not pantry.IN_PANTRY[slot] and pantry.QUANTITIES[slot] == 0
+
+
+def main():
+    print("🧪 Testing the pantry arrays...\n")
+    test_sparse_ids_and_growth()
+    print("   ✅ Sparse and large food IDs take one array slot each, listed in ID order")
+    test_invalid_ids_are_rejected()
+    print("   ✅ Invalid or repeated food IDs are rejected without growing the arrays")
+    test_versions_and_reload()
+    print("   ✅ Versions bump per item and the arrays reload from pantry.json")
+    print("\n✅ Pantry arrays work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
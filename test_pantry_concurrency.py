@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Stress test for concurrent pantry_mcp_server processes.
+
+Starts several processes against one pantry, the way the chef and supplier
+each spawn their own pantry_mcp_server.py, and checks that no restock is lost
+and no stock is taken twice. Prints the throughput.
+
+Usage:
+    uv run test_pantry_concurrency.py --processes=8 --rounds=100
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import fire
+
+RESTOCK_ID = "1"
+CONTESTED_ID = "2"
+
+
+def worker(workdir: str, rounds: int, results):
+    """Restock one item and race the other workers to take another, one unit at a time."""
+    os.chdir(workdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Imported here so the pantry loads from the scratch directory
+        import pantry_mcp_server
+        taken = 0
+        for _ in range(rounds):
+            pantry_mcp_server.add_ingredients({RESTOCK_ID: 1})
+            if pantry_mcp_server.take_ingredients({CONTESTED_ID: 1})["success"]:
+                taken += 1
+        pantry_mcp_server.flush_pantry()
+    results.put(taken)
+
+
+def run_stress(processes: int = 8, rounds: int = 100) -> dict:
+    """Run the workers in a scratch directory and verify the resulting pantry."""
+    with tempfile.TemporaryDirectory(prefix="pantry-stress-") as workdir:
+        stock = processes * rounds // 2
+        with open(os.path.join(workdir, "pantry.json"), "w") as f:
+            json.dump({RESTOCK_ID: 0, CONTESTED_ID: stock}, f)
+
+        results = multiprocessing.Queue()
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=worker, args=(workdir, rounds, results))
+            for _ in range(processes)
+        ]
+        for p in workers:
+            p.start()
+        taken = sum(results.get() for _ in workers)
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - start
+        assert all(p.exitcode == 0 for p in workers), "a worker process failed"
+
+        with open(os.path.join(workdir, "pantry.json")) as f:
+            pantry = json.load(f)
+
+        # Every restock landed, and the contested item was handed out exactly once per unit
+        assert pantry[RESTOCK_ID] == processes * rounds, f"lost restocks: {pantry[RESTOCK_ID]}"
+        assert taken == stock, f"{taken} takes succeeded for {stock} units"
+        assert pantry[CONTESTED_ID] == 0, f"contested stock ended at {pantry[CONTESTED_ID]}"
+
+        operations = processes * rounds * 2
+        return {
+            "processes": processes,
+            "operations": operations,
+            "seconds": round(elapsed, 3),
+            "ops_per_second": round(operations / elapsed, 1),
+        }
+
+
+def test_concurrent_pantry_processes():
+    run_stress(processes=4, rounds=20)
+
+
+def main(processes: int = 8, rounds: int = 100):
+    print("🧪 Stress testing concurrent pantry processes...\n")
+    result = run_stress(processes, rounds)
+    print(f"   ✅ {result['operations']} restocks/takes from {processes} processes in "
+          f"{result['seconds']}s ({result['ops_per_second']} ops/s), no lost restocks or double takes")
+    print("\n✅ Concurrent pantry processes are safe!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for the pantry's group commit when pantry.json cannot be written.
+
+Makes the checkpoint fail and checks that the journal and pantry.json are left
+as they were and the changes stay pending, then that the next flush commits
+them exactly once, and that takes by the sole writer wait for the group
+commit instead of the commit lock.
+
+Usage:
+    uv run test_pantry_flush.py
+"""
+
+import json
+import os
+
+import fire
+
+from test_helpers import scratch_pantry
+
+
+def read_json(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_failed_checkpoint_keeps_changes_pending():
+    # Flush by hand only
+    with scratch_pantry({"food.json": {"foods": {}}, "pantry.json": {"1": 5}}, flush_interval=3600) as pantry:
+        pantry.add_ingredients({"1": 3, "2": 4})
+
+        write = pantry._write_json_atomic
+
+        def failing_write(path, data, indent=None):
+            if path == pantry.PANTRY_FILE:
+                raise OSError("disk full")
+            write(path, data, indent)
+
+        pantry._write_json_atomic = failing_write
+        try:
+            pantry.flush_pantry()
+            raise AssertionError("flush_pantry should raise when pantry.json cannot be written")
+        except OSError:
+            pass
+        finally:
+            pantry._write_json_atomic = write
+
+        assert read_json("pantry.json") == {"1": 5}
+        assert os.path.getsize(pantry.PANTRY_JOURNAL) == 0
+        assert pantry.PENDING_DELTAS == {"1": 3, "2": 4}
+        assert pantry._COMMITTED_INVENTORY == {"1": 5}
+
+        assert pantry.flush_pantry() == 2
+        assert read_json("pantry.json") == {"1": 8, "2": 4}
+        assert read_json("pantry.versions.json") == {"1": 1, "2": 1}
+        assert os.path.getsize(pantry.PANTRY_JOURNAL) == 0
+        assert pantry.PENDING_DELTAS == {}
+
+
+def test_sole_writer_takes_skip_commit_lock():
+    with scratch_pantry({"food.json": {"foods": {}}, "pantry.json": {"1": 5, "2": 4}}, flush_interval=3600) as pantry:
+        pantry.SOLE_WRITER = True
+        reservation = pantry.reserve_ingredients({"2": 4})
+        commit_locked = pantry._commit_locked
+
+        def no_commit_lock():
+            raise AssertionError("a sole-writer take should only lock its items")
+
+        pantry._commit_locked = no_commit_lock
+        try:
+            assert pantry.take_ingredients({"1": 2})["success"]
+            assert not pantry.take_ingredients({"1": 4})["success"]
+            assert pantry.commit_reservation(reservation["reservation_id"])["success"]
+        finally:
+            pantry._commit_locked = commit_locked
+
+        # Acknowledged from memory, written by the next group commit
+        assert read_json("pantry.json") == {"1": 5, "2": 4}
+        assert pantry.PENDING_DELTAS == {"1": -2, "2": -4}
+        assert pantry.flush_pantry() == 2
+        assert read_json("pantry.json") == {"1": 3, "2": 0}
+
+
+def main():
+    print("🧪 Testing the pantry group commit...\n")
+    test_failed_checkpoint_keeps_changes_pending()
+    print("   ✅ A failed checkpoint loses nothing and the next flush commits once")
+    test_sole_writer_takes_skip_commit_lock()
+    print("   ✅ Sole-writer takes lock only their items and wait for the group commit")
+    print("\n✅ Pantry group commit works!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)
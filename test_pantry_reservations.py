@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fastmcp",
+#     "fire",
+#     "numpy",
+# ]
+# ///
+"""Test for ingredient reservations in pantry_mcp_server.
+
+Runs the pantry in a scratch directory and walks reservations through
+reserve -> commit, reserve -> release and reserve -> TTL expiry, checking
+that held stock is off limits to other takes until it is freed.
+
+Usage:
+    uv run test_pantry_reservations.py
+"""
+
+import json
+import time
+
+import fire
+
+from test_helpers import scratch_pantry
+
+FOODS = {"1": {"id": 1, "name": "Flour"}, "2": {"id": 2, "name": "Eggs"}}
+
+
+def on_disk() -> dict:
+    with open("pantry.json") as f:
+        return json.load(f)
+
+
+def test_reserve_then_commit():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"1": 10, "2": 6}}) as pantry:
+        reservation = pantry.reserve_ingredients({"1": 4, "2": 6})
+        assert reservation["success"], reservation
+
+        # Held stock stays on hand but nobody else can take or reserve it
+        item = pantry.check_pantry(food_id=2)
+        assert (item["quantity"], item["reserved"], item["available"]) == (6, 6, False)
+        assert pantry.take_ingredients({"2": 1})["missing"][0]["available"] == 0
+        assert not pantry.reserve_ingredients({"1": 7})["success"]
+        assert pantry.take_ingredients({"1": 6})["success"]
+
+        result = pantry.commit_reservation(reservation["reservation_id"])
+        assert result["updated_inventory"] == {"1": 0, "2": 0}
+        assert on_disk() == {"1": 0, "2": 0}
+        assert pantry.check_pantry(food_id=1)["reserved"] == 0
+        # A reservation is consumed by its commit
+        assert not pantry.commit_reservation(reservation["reservation_id"])["success"]
+        assert not pantry.release_reservation(reservation["reservation_id"])["success"]
+
+
+def test_reserve_then_release():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"1": 10}}) as pantry:
+        reservation = pantry.reserve_ingredients({"1": 8})
+        assert not pantry.take_ingredients({"1": 3})["success"]
+
+        released = pantry.release_reservation(reservation["reservation_id"])
+        assert released["released"] == {"1": 8}
+        item = pantry.check_pantry(food_id=1)
+        assert (item["quantity"], item["reserved"]) == (10, 0)
+        assert pantry.take_ingredients({"1": 10})["success"]
+        assert not pantry.commit_reservation(reservation["reservation_id"])["success"]
+
+
+def test_reservation_expires_after_ttl():
+    with scratch_pantry({"food.json": {"foods": FOODS}, "pantry.json": {"1": 5}}) as pantry:
+        short = pantry.reserve_ingredients({"1": 3}, ttl_seconds=0.05)
+        held = pantry.reserve_ingredients({"1": 2}, ttl_seconds=60)
+        assert not pantry.take_ingredients({"1": 1})["success"]
+
+        time.sleep(0.1)
+        # Expiry is lazy: the next call frees the lapsed reservation's stock
+        assert pantry.check_pantry(food_id=1)["reserved"] == 2
+        assert short["reservation_id"] not in pantry.RESERVATIONS
+        assert not pantry.commit_reservation(short["reservation_id"])["success"]
+        assert pantry.take_ingredients({"1": 3})["success"]
+        assert pantry.commit_reservation(held["reservation_id"])["success"]
+        assert on_disk() == {"1": 0}
+
+
+def main():
+    print("🧪 Testing pantry reservations...\n")
+    test_reserve_then_commit()
+    print("   ✅ Reserved stock is held from other takes, then taken by commit")
+    test_reserve_then_release()
+    print("   ✅ Released stock goes back to the free pool")
+    test_reservation_expires_after_ttl()
+    print("   ✅ Reservations past their TTL are freed on the next call")
+    print("\n✅ Pantry reservations work!")
+
+
+if __name__ == "__main__":
+    fire.Fire(main)